@@ -0,0 +1,328 @@
+"""
+Stateless bearer tokens for the backend.
+
+Provides:
+- TokenSigner: HMAC-SHA256 signed, self-contained tokens (no server lookup)
+- RevocationList: revoked token ids evicted by a time-bucketed expiry wheel
+  (one process only)
+- SqliteRevocationList: the same interface backed by a SQLite file, so a
+  logout on one worker is seen by every worker on the host
+- load_revocation_list(): RevocationList, or SqliteRevocationList when
+  EDUTRACK_REVOCATION_DB is set
+"""
+
+from typing import Any, Dict, Optional, Set
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger("auth_tokens")
+
+DEFAULT_TOKEN_TTL_SECONDS = 12 * 60 * 60
+TOKEN_SECRET_ENV = "EDUTRACK_TOKEN_SECRET"
+REVOCATION_DB_ENV = "EDUTRACK_REVOCATION_DB"
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+class RevocationList:
+    """
+    Revoked token ids, kept only until the token would have expired anyway.
+
+    Entries are filed into buckets of `bucket_seconds` by expiry time; each
+    call drains buckets whose window has fully passed, so every entry is
+    inserted and evicted exactly once (amortized O(1)).
+    """
+
+    def __init__(self, bucket_seconds: int = 60):
+        self.bucket_seconds = max(1, int(bucket_seconds))
+        self._lock = threading.Lock()
+        self._buckets: Dict[int, Set[str]] = {}
+        self._revoked: Dict[str, int] = {}
+        self._cursor: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def revoke(self, jti: str, expires_at: float, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        if expires_at <= now:
+            return
+        bucket = int(expires_at // self.bucket_seconds)
+        with self._lock:
+            self._evict_locked(now)
+            previous = self._revoked.get(jti)
+            if previous is not None:
+                self._buckets.get(previous, set()).discard(jti)
+            self._revoked[jti] = bucket
+            self._buckets.setdefault(bucket, set()).add(jti)
+
+    def is_revoked(self, jti: str, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        with self._lock:
+            self._evict_locked(now)
+            return jti in self._revoked
+
+    def _evict_locked(self, now: float) -> None:
+        current = int(now // self.bucket_seconds)
+        if self._cursor is None:
+            self._cursor = current
+            return
+        if current <= self._cursor:
+            return
+
+        # Walk the wheel slot by slot; after a long idle gap, visit only the
+        # occupied buckets instead of every empty slot in between.
+        if current - self._cursor > len(self._buckets):
+            expired = [b for b in self._buckets if b < current]
+        else:
+            expired = range(self._cursor, current)
+        for bucket in expired:
+            for jti in self._buckets.pop(bucket, ()):
+                self._revoked.pop(jti, None)
+        self._cursor = current
+
+
+class SqliteRevocationList:
+    """
+    Revoked token ids in a SQLite file that every worker on a host shares.
+
+    The file is the source of truth; each process verifies against an
+    in-memory RevocationList that pulls rows added since its last read at
+    most every `refresh_seconds`, so verification does not touch disk per
+    request and a logout on another worker takes effect within that
+    window (immediately on the worker that handled it). The file is opened
+    on first use and created owner-only. Expired rows are deleted at most
+    every `prune_seconds`, `prune_batch` rows at a time.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        refresh_seconds: float = 1.0,
+        prune_seconds: float = 300.0,
+        prune_batch: int = 500,
+    ):
+        self.path = path
+        self.refresh_seconds = refresh_seconds
+        self.prune_seconds = prune_seconds
+        self.prune_batch = prune_batch
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._cache = RevocationList()
+        self._last_seq = 0
+        self._refreshed_at: Optional[float] = None
+        self._pruned_at = 0.0
+        self._schema_ready = False
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if not os.path.exists(self.path):
+                os.close(os.open(self.path, os.O_CREAT | os.O_WRONLY, 0o600))
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=5.0)
+            if not self._schema_ready:
+                with conn:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS revocations ("
+                        "seq INTEGER PRIMARY KEY AUTOINCREMENT, jti TEXT NOT NULL, expires_at REAL NOT NULL)"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS revocations_expiry ON revocations (expires_at)")
+                self._schema_ready = True
+        return conn
+
+    def __len__(self) -> int:
+        self._refresh(time.monotonic(), force=True)
+        return len(self._cache)
+
+    def _refresh(self, now_mono: float, force: bool = False) -> None:
+        with self._lock:
+            if not force and self._refreshed_at is not None and now_mono - self._refreshed_at < self.refresh_seconds:
+                return
+            # AUTOINCREMENT never reuses a seq, so "seq > last" sees every new row.
+            rows = self._connection().execute(
+                "SELECT seq, jti, expires_at FROM revocations WHERE seq > ? ORDER BY seq", (self._last_seq,)
+            ).fetchall()
+            for seq, jti, expires_at in rows:
+                self._cache.revoke(jti, expires_at)
+                self._last_seq = seq
+            self._refreshed_at = now_mono
+
+    def _prune(self, now: float) -> None:
+        if now - self._pruned_at < self.prune_seconds:
+            return
+        self._pruned_at = now
+        with self._connection() as conn:
+            conn.execute(
+                "DELETE FROM revocations WHERE seq IN "
+                "(SELECT seq FROM revocations WHERE expires_at <= ? LIMIT ?)",
+                (now, self.prune_batch),
+            )
+
+    def revoke(self, jti: str, expires_at: float, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        if expires_at <= now:
+            return
+        with self._connection() as conn:
+            conn.execute("INSERT INTO revocations (jti, expires_at) VALUES (?, ?)", (jti, expires_at))
+        self._cache.revoke(jti, expires_at, now=now)
+        self._prune(now)
+
+    def is_revoked(self, jti: str, now: Optional[float] = None) -> bool:
+        self._refresh(time.monotonic())
+        return self._cache.is_revoked(jti, now=now)
+
+
+def load_revocation_list() -> Any:
+    """
+    A per-process RevocationList, or a SqliteRevocationList on the file
+    named by EDUTRACK_REVOCATION_DB (opt-in; there is no default path).
+    """
+    path = os.getenv(REVOCATION_DB_ENV)
+    if not path:
+        return RevocationList()
+    return SqliteRevocationList(path, refresh_seconds=float(os.getenv("EDUTRACK_REVOCATION_REFRESH_SECONDS", "1")))
+
+
+class TokenSigner:
+    """
+    Issues `<payload>.<signature>` tokens where payload is base64url JSON
+    carrying the user, role, issue/expiry times and a random token id.
+    Any process sharing the secret verifies them without a token table.
+    """
+
+    def __init__(
+        self,
+        secret: Optional[bytes] = None,
+        ttl_seconds: int = DEFAULT_TOKEN_TTL_SECONDS,
+        revocations: Optional[Any] = None,
+    ):
+        if secret is None:
+            env_secret = os.getenv(TOKEN_SECRET_ENV)
+            if env_secret:
+                secret = env_secret.encode("utf-8")
+            else:
+                logger.warning(
+                    "%s is not set; using a per-process secret. Tokens will not verify across workers.",
+                    TOKEN_SECRET_ENV,
+                )
+                secret = secrets.token_bytes(32)
+        self._secret = secret
+        self.ttl_seconds = int(ttl_seconds)
+        self.revocations = revocations if revocations is not None else RevocationList()
+
+    def _sign(self, payload_b64: bytes) -> str:
+        return _b64encode(hmac.new(self._secret, payload_b64, hashlib.sha256).digest())
+
+    def issue(
+        self,
+        email: str,
+        role: str,
+        now: Optional[float] = None,
+        scope: Optional[str] = None,
+        ttl_seconds: Optional[int] = None,
+    ) -> str:
+        """`scope` marks a single-purpose token (e.g. "events"); only verify(scope=...) accepts it."""
+        issued_at = int(time.time() if now is None else now)
+        claims = {
+            "sub": email,
+            "role": role,
+            "iat": issued_at,
+            "exp": issued_at + (self.ttl_seconds if ttl_seconds is None else int(ttl_seconds)),
+            "jti": secrets.token_hex(8),
+        }
+        if scope is not None:
+            claims["scope"] = scope
+        payload_b64 = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+        return f"{payload_b64}.{self._sign(payload_b64.encode('ascii'))}"
+
+    def decode(self, token: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Return the token claims, or None if forged, malformed, expired or revoked."""
+        payload_b64, sep, signature = token.partition(".")
+        if not sep or not payload_b64 or not signature:
+            return None
+        try:
+            expected = self._sign(payload_b64.encode("ascii"))
+        except UnicodeEncodeError:
+            return None
+        if not hmac.compare_digest(expected, signature):
+            return None
+        try:
+            claims = json.loads(_b64decode(payload_b64))
+        except Exception:
+            return None
+        if not isinstance(claims, dict):
+            return None
+
+        now = time.time() if now is None else now
+        if float(claims.get("exp", 0)) <= now:
+            return None
+        if self.revocations.is_revoked(str(claims.get("jti", "")), now=now):
+            return None
+        return claims
+
+    def verify(self, token: str, now: Optional[float] = None, scope: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """Session tokens verify with scope=None; scoped tokens only with their own scope."""
+        claims = self.decode(token, now=now)
+        if claims is None or claims.get("scope") != scope:
+            return None
+        return {"email": str(claims.get("sub", "")), "role": str(claims.get("role", ""))}
+
+    def revoke(self, token: str, now: Optional[float] = None) -> bool:
+        claims = self.decode(token, now=now)
+        if claims is None:
+            return False
+        self.revocations.revoke(str(claims["jti"]), float(claims["exp"]), now=now)
+        return True
+
+
+if __name__ == "__main__":
+    signer = TokenSigner(secret=b"benchmark-secret")
+    rounds = 50_000
+
+    start = time.perf_counter()
+    tokens = [signer.issue(f"user{i}@edutrack.test", "reviewer") for i in range(rounds)]
+    issue_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for token in tokens:
+        signer.verify(token)
+    verify_elapsed = time.perf_counter() - start
+
+    wheel = RevocationList(bucket_seconds=60)
+    base = time.time()
+    start = time.perf_counter()
+    for i in range(rounds):
+        # Simulated clock: one revocation per second of wall time.
+        wheel.revoke(f"jti{i}", base + i + DEFAULT_TOKEN_TTL_SECONDS, now=base + i)
+    revoke_elapsed = time.perf_counter() - start
+    wheel.is_revoked("probe", now=base + rounds + DEFAULT_TOKEN_TTL_SECONDS + 60)
+
+    print(f"issue : {rounds / issue_elapsed:,.0f} tokens/s")
+    print(f"verify: {rounds / verify_elapsed:,.0f} tokens/s")
+    print(f"revoke: {rounds / revoke_elapsed:,.0f} ops/s, {len(wheel)} entries left after expiry")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        shared = SqliteRevocationList(os.path.join(tmp, "revocations.db"))
+        for i in range(1000):
+            shared.revoke(f"jti{i}", base + DEFAULT_TOKEN_TTL_SECONDS)
+        start = time.perf_counter()
+        for i in range(rounds):
+            shared.is_revoked(f"jti{i}")
+        lookup_elapsed = time.perf_counter() - start
+    print(f"shared revocation lookup: {rounds / lookup_elapsed:,.0f} ops/s")
@@ -0,0 +1,144 @@
+"""
+Dynamic micro-batching for model calls.
+
+Provides:
+- MicroBatcher: gathers concurrent requests for up to `max_items` items
+  or `max_wait_ms`, whichever comes first, runs them as one vectorized
+  `fn(items)` call on its own thread and hands each caller its slice
+
+Callers on sync threads block on submit()/submit_many(); async code awaits
+asyncio.wrap_future(batcher.enqueue(items)). With max_items <= 1 batching
+is off and fn runs on the caller's thread.
+"""
+
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger("batching")
+
+# (items, future, enqueued_at)
+_Request = Tuple[List[Any], Future, float]
+
+
+class MicroBatcher:
+    """
+    `fn` takes a list of items and returns one result per item, in order.
+    Requests are never split, so a request larger than `max_items` runs as
+    a batch of its own. If `fn` raises, every request in the batch gets
+    the exception.
+
+    `on_batch(items, waits)` is called after each batch with its item
+    count and how long each request waited for the batch to start.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[List[Any]], Sequence[Any]],
+        max_items: int = 16,
+        max_wait_ms: float = 5.0,
+        name: str = "batch",
+        on_batch: Optional[Callable[[int, List[float]], None]] = None,
+    ):
+        self.fn = fn
+        self.max_items = max_items
+        self.max_wait_s = max_wait_ms / 1000.0
+        self.name = name
+        self.on_batch = on_batch
+        self._queue: "queue.SimpleQueue[_Request]" = queue.SimpleQueue()
+        self._carry: Optional[_Request] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_items > 1
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def enqueue(self, items: Sequence[Any]) -> Future:
+        """Future resolving to fn's results for `items`."""
+        future: Future = Future()
+        items = list(items)
+        if not items:
+            future.set_result([])
+        elif not self.enabled:
+            self._call([(items, future, time.perf_counter())])
+        else:
+            self._ensure_started()
+            self._queue.put((items, future, time.perf_counter()))
+        return future
+
+    def submit_many(self, items: Sequence[Any], timeout: Optional[float] = None) -> List[Any]:
+        return self.enqueue(items).result(timeout)
+
+    def submit(self, item: Any, timeout: Optional[float] = None) -> Any:
+        return self.submit_many([item], timeout)[0]
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"microbatch-{self.name}", daemon=True)
+                self._thread.start()
+
+    def _next_batch(self) -> List[_Request]:
+        first = self._carry if self._carry is not None else self._queue.get()
+        self._carry = None
+        pending = [first]
+        count = len(first[0])
+        deadline = time.perf_counter() + self.max_wait_s
+        while count < self.max_items:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if count + len(request[0]) > self.max_items:
+                self._carry = request  # opens the next batch
+                break
+            pending.append(request)
+            count += len(request[0])
+        return pending
+
+    def _call(self, pending: List[_Request]) -> None:
+        started = time.perf_counter()
+        flat = [item for items, _, _ in pending for item in items]
+        try:
+            results = self.fn(flat)
+            if len(results) != len(flat):
+                raise RuntimeError(f"{self.name}: batch of {len(flat)} returned {len(results)} results")
+        except Exception as e:
+            for _, future, _ in pending:
+                future.set_exception(e)
+        else:
+            start = 0
+            for items, future, _ in pending:
+                future.set_result(results[start : start + len(items)])
+                start += len(items)
+        self.batches += 1
+        self.items += len(flat)
+        if self.on_batch is not None:
+            try:
+                self.on_batch(len(flat), [started - enqueued for _, _, enqueued in pending])
+            except Exception as e:
+                logger.debug("%s: on_batch hook failed: %s", self.name, e)
+
+    def _run(self) -> None:
+        while True:
+            self._call(self._next_batch())
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_items": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "queue_depth": self.queue_depth(),
+        }
@@ -0,0 +1,115 @@
+"""
+In-process change feed for submission inserts and updates.
+
+Provides:
+- ChangeFeed: sequence-numbered ring buffer with async subscribers
+- format_sse(event) helper for text/event-stream framing
+"""
+
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+import asyncio
+import json
+import threading
+
+HEARTBEAT_SECONDS = 15.0
+
+
+class ChangeFeed:
+    """
+    Keeps the last `capacity` events in memory. Subscribers resume from any
+    sequence number still in the buffer; older cursors receive a single
+    "reset" event telling the client to refetch its list.
+
+    `publish` is safe to call from worker threads (sync FastAPI routes) as
+    well as from the event loop. It buffers a shallow copy of `data`, so a
+    replayed event shows the record as it was when published, and later
+    in-place edits of the live dict never race serialization of the event.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self._lock = threading.Lock()
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._seq = 0
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._waiters)
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> int:
+        with self._lock:
+            self._seq += 1
+            self._events.append({"seq": self._seq, "type": event_type, "data": dict(data)})
+            waiters = list(self._waiters)
+            seq = self._seq
+
+        for loop, wake in waiters:
+            try:
+                loop.call_soon_threadsafe(wake.set)
+            except RuntimeError:
+                # Loop already closed; the subscriber is going away.
+                continue
+        return seq
+
+    def since(self, seq: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Return buffered events after `seq`, or ([], True) if the cursor is no longer servable."""
+        with self._lock:
+            if seq > self._seq:
+                # Cursor from a previous process; its numbering means nothing here.
+                return [], True
+            if not self._events or seq == self._seq:
+                return [], False
+            oldest = self._events[0]["seq"]
+            if seq < oldest - 1:
+                return [], True
+            # Sequence numbers are dense, so the offset is direct.
+            start = seq - oldest + 1
+            return [self._events[i] for i in range(start, len(self._events))], False
+
+    async def subscribe(
+        self, since: Optional[int] = None, heartbeat: float = HEARTBEAT_SECONDS
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Yield events after `since` (or only new ones when None). Yields None
+        on idle heartbeats so the caller can emit a keepalive and check for
+        client disconnects.
+        """
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+        waiter = (loop, wake)
+        with self._lock:
+            self._waiters.add(waiter)
+            cursor = self._seq if since is None else since
+
+        try:
+            while True:
+                wake.clear()
+                events, gap = self.since(cursor)
+                if gap:
+                    cursor = self._seq
+                    yield {"seq": cursor, "type": "reset", "data": {}}
+                    continue
+                if events:
+                    for event in events:
+                        yield event
+                        cursor = event["seq"]
+                    continue
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+
+def format_sse(event: Optional[Dict[str, Any]]) -> str:
+    if event is None:
+        return ": keepalive\n\n"
+    payload = json.dumps(event["data"], separators=(",", ":"), default=str)
+    return f"id: {event['seq']}\nevent: {event['type']}\ndata: {payload}\n\n"
@@ -0,0 +1,197 @@
+"""
+Ingest-time duplicate detection for uploaded documents.
+
+Provides:
+- DedupIndex: exact matches by SHA-256 of the upload, near-duplicate
+  matches by MinHash signatures over the OCR text with an LSH band index
+- HashingReader: file-object wrapper that digests bytes as they stream past
+- shingle_hashes: word 5-gram hashes of a text
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import re
+import threading
+import zlib
+
+import numpy as np
+
+SHINGLE_WORDS = 5
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16  # 16 bands x 8 rows: candidate pairs start around Jaccard 0.7
+NEAR_DUPLICATE_THRESHOLD = 0.85
+MAX_ENTRIES = 10_000
+_SIGNATURE_CHUNK = 4096  # shingles hashed per step, bounds the (perm x shingle) matrix
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_SHINGLE_BASE = np.uint64(1099511628211)
+
+Match = Tuple[str, float, Dict[str, Any]]  # (key, similarity, payload)
+
+
+class HashingReader:
+    """Passes reads through to `source` while feeding a SHA-256 digest."""
+
+    def __init__(self, source):
+        self._source = source
+        self._hash = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._source.read(size)
+        self._hash.update(chunk)
+        return chunk
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def shingle_hashes(text: str, k: int = SHINGLE_WORDS) -> np.ndarray:
+    """
+    Distinct 64-bit hashes of the word k-grams of `text`. Case, punctuation
+    and whitespace are ignored, so re-scans that only differ in OCR noise
+    around words still share most shingles.
+    """
+    tokens = _TOKEN_RE.findall((text or "").lower())
+    if not tokens:
+        return np.empty(0, dtype=np.uint64)
+    token_hashes = np.fromiter((zlib.crc32(t.encode()) for t in tokens), dtype=np.uint64, count=len(tokens))
+    k = min(k, len(tokens))
+    n = len(tokens) - k + 1
+    shingles = np.zeros(n, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for offset in range(k):
+            shingles = shingles * _SHINGLE_BASE + token_hashes[offset : offset + n]
+    return np.unique(shingles)
+
+
+class DedupIndex:
+    """
+    Remembers the analysis result of each ingested document. Exact lookups
+    are a dict hit on the content digest. Near-duplicate lookups compare
+    MinHash signatures: a document becomes a candidate when all rows of
+    at least one LSH band match, and is accepted when the estimated
+    Jaccard similarity reaches `threshold`. Lookups are scoped (e.g. by
+    document type) so a cached DSS is only reused for the same kind of
+    document.
+
+    At most `max_entries` documents are kept; the least recently added or
+    matched one is evicted from the digest map and its LSH buckets alike.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = NUM_PERMUTATIONS,
+        bands: int = LSH_BANDS,
+        threshold: float = NEAR_DUPLICATE_THRESHOLD,
+        seed: int = 1,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.max_entries = max(1, int(max_entries))
+
+        # h(x) = (a*x + b) mod 2^64, top 32 bits kept (multiply-shift hashing).
+        rng = np.random.default_rng(seed)
+        self._a = (rng.integers(0, 2**63, num_perm, dtype=np.uint64) * 2 + 1).reshape(-1, 1)
+        self._b = rng.integers(0, 2**63, num_perm, dtype=np.uint64).reshape(-1, 1)
+
+        self._lock = threading.Lock()
+        self._exact: Dict[Tuple[str, str], str] = {}
+        self._buckets: Dict[Tuple[str, int, bytes], List[str]] = {}
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._payloads: Dict[str, Dict[str, Any]] = {}
+        # key -> (scope, digest), oldest first; moved to the end on a match.
+        self._entries: "OrderedDict[str, Tuple[str, Optional[str]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of `text`, or None when it has no words."""
+        shingles = shingle_hashes(text)
+        if not shingles.size:
+            return None
+        signature = np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        with np.errstate(over="ignore"):
+            for start in range(0, shingles.size, _SIGNATURE_CHUNK):
+                block = shingles[start : start + _SIGNATURE_CHUNK]
+                hashed = ((self._a * block + self._b) >> np.uint64(32)).astype(np.uint32)
+                np.minimum(signature, hashed.min(axis=1), out=signature)
+        return signature
+
+    def _band_keys(self, scope: str, signature: np.ndarray) -> List[Tuple[str, int, bytes]]:
+        return [
+            (scope, band, signature[band * self.rows : (band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def find_exact(self, scope: str, digest: str) -> Optional[Match]:
+        with self._lock:
+            key = self._exact.get((scope, digest))
+            if key is None:
+                return None
+            self._entries.move_to_end(key)
+            return (key, 1.0, self._payloads[key])
+
+    def find_near(self, scope: str, signature: Optional[np.ndarray]) -> Optional[Match]:
+        """Most similar indexed document at or above the threshold."""
+        if signature is None:
+            return None
+        with self._lock:
+            candidates = dict.fromkeys(
+                key for band_key in self._band_keys(scope, signature) for key in self._buckets.get(band_key, ())
+            )
+            best: Optional[Match] = None
+            for key in candidates:
+                similarity = float(np.count_nonzero(self._signatures[key] == signature)) / self.num_perm
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (key, round(similarity, 3), self._payloads[key])
+            if best is not None:
+                self._entries.move_to_end(best[0])
+            return best
+
+    def add(
+        self,
+        key: str,
+        scope: str,
+        digest: Optional[str],
+        signature: Optional[np.ndarray],
+        payload: Dict[str, Any],
+    ) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove_locked(key)
+            self._payloads[key] = payload
+            self._entries[key] = (scope, digest)
+            if digest:
+                self._exact.setdefault((scope, digest), key)
+            if signature is not None:
+                self._signatures[key] = signature
+                for band_key in self._band_keys(scope, signature):
+                    self._buckets.setdefault(band_key, []).append(key)
+            while len(self._entries) > self.max_entries:
+                self._remove_locked(next(iter(self._entries)))
+
+    def _remove_locked(self, key: str) -> None:
+        scope, digest = self._entries.pop(key)
+        self._payloads.pop(key, None)
+        if digest and self._exact.get((scope, digest)) == key:
+            del self._exact[(scope, digest)]
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band_key in self._band_keys(scope, signature):
+            keys = self._buckets.get(band_key)
+            if keys is None:
+                continue
+            try:
+                keys.remove(key)
+            except ValueError:
+                pass
+            if not keys:
+                del self._buckets[band_key]
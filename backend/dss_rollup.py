@@ -0,0 +1,151 @@
+"""
+Time-bucketed DSS rollups per institution.
+
+Provides:
+- DssRollup: per-institution, per-period (month / year) DSS aggregates kept
+  up to date on every upload and review action
+- period_key: truncates an ISO date to a bucket key
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import threading
+
+GRANULARITIES = {"year": 4, "month": 7}  # ISO prefix length of the bucket key
+PENDING_STATUSES = {"needs_manual_review", "low_confidence"}
+
+
+def period_key(date: str, granularity: str) -> str:
+    """'2026-01-19' → '2026' (year) or '2026-01' (month)."""
+    return str(date or "")[: GRANULARITIES[granularity]]
+
+
+class _Bucket:
+    __slots__ = ("count", "dss_sum", "statuses")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.dss_sum = 0.0
+        self.statuses: Dict[str, int] = {}
+
+    def add(self, dss: float, status: str, sign: int) -> None:
+        self.count += sign
+        self.dss_sum += sign * dss
+        self.statuses[status] = self.statuses.get(status, 0) + sign
+        if not self.statuses[status]:
+            del self.statuses[status]
+
+
+class _Series:
+    """Sorted period keys plus their buckets for one institution and granularity."""
+
+    __slots__ = ("keys", "buckets")
+
+    def __init__(self) -> None:
+        self.keys: List[str] = []
+        self.buckets: Dict[str, _Bucket] = {}
+
+    def bucket(self, key: str) -> _Bucket:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = _Bucket()
+            insort(self.keys, key)
+        return bucket
+
+    def drop_if_empty(self, key: str) -> None:
+        bucket = self.buckets.get(key)
+        if bucket is not None and bucket.count <= 0:
+            del self.buckets[key]
+            self.keys.pop(bisect_left(self.keys, key))
+
+    def range(self, start: Optional[str], end: Optional[str]) -> List[str]:
+        lo = 0 if start is None else bisect_left(self.keys, start)
+        hi = len(self.keys) if end is None else bisect_right(self.keys, end)
+        return self.keys[lo:hi]
+
+
+class DssRollup:
+    """
+    Count, DSS sum and status counts per (institution_id, period). A trend
+    query reads only the buckets inside the requested range, so its cost
+    is O(log buckets + buckets returned) regardless of submission volume.
+    """
+
+    def __init__(self, items: Iterable[Dict[str, Any]] = ()):
+        self._lock = threading.Lock()
+        self._series: Dict[str, Dict[str, _Series]] = {}
+        for item in items:
+            self._apply(item, 1)
+
+    def _apply(self, item: Dict[str, Any], sign: int, status: Optional[str] = None) -> None:
+        institution = str(item.get("institution_id") or "")
+        date = str(item.get("uploaded_at") or "")
+        if not institution or not date:
+            return
+        dss = float(item.get("dss", 0) or 0)
+        status = str(status if status is not None else item.get("status") or "")
+        per_granularity = self._series.setdefault(institution, {g: _Series() for g in GRANULARITIES})
+        for granularity, series in per_granularity.items():
+            key = period_key(date, granularity)
+            series.bucket(key).add(dss, status, sign)
+            if sign < 0:
+                series.drop_if_empty(key)
+
+    def add(self, item: Dict[str, Any]) -> None:
+        with self._lock:
+            self._apply(item, 1)
+
+    def remove(self, item: Dict[str, Any]) -> None:
+        with self._lock:
+            self._apply(item, -1)
+
+    def update_status(self, item: Dict[str, Any], old_status: Optional[str]) -> None:
+        """Moves `item` (already carrying its new status) out of `old_status`."""
+        with self._lock:
+            self._apply(item, -1, status=old_status or "")
+            self._apply(item, 1)
+
+    def trend(
+        self,
+        institution_ids: Sequence[str],
+        granularity: str = "year",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        One row per non-empty period in [start, end] (ISO dates or prefixes,
+        inclusive), merged across `institution_ids`, oldest first.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of {sorted(GRANULARITIES)}")
+        lo = period_key(start, granularity) if start else None
+        hi = period_key(end, granularity) if end else None
+
+        merged: Dict[str, _Bucket] = {}
+        with self._lock:
+            for institution in dict.fromkeys(institution_ids):
+                series = self._series.get(institution, {}).get(granularity)
+                if series is None:
+                    continue
+                for key in series.range(lo, hi):
+                    bucket = series.buckets[key]
+                    total = merged.setdefault(key, _Bucket())
+                    total.count += bucket.count
+                    total.dss_sum += bucket.dss_sum
+                    for status, n in bucket.statuses.items():
+                        total.statuses[status] = total.statuses.get(status, 0) + n
+
+        rows: List[Dict[str, Any]] = []
+        for key in sorted(merged):
+            bucket = merged[key]
+            rows.append(
+                {
+                    granularity: key,
+                    "dss": round(bucket.dss_sum / bucket.count, 1) if bucket.count else 0.0,
+                    "submissions": bucket.count,
+                    "pending_reviews": sum(bucket.statuses.get(s, 0) for s in PENDING_STATUSES),
+                    "approved": bucket.statuses.get("approved", 0),
+                    "rejected": bucket.statuses.get("rejected", 0),
+                }
+            )
+        return rows
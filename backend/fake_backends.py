@@ -0,0 +1,87 @@
+"""
+Deterministic stand-ins for Tesseract OCR and the embedding model.
+
+Used for load testing: output depends only on the input bytes/text, and
+each call sleeps for a configurable latency to mimic the real backend.
+
+Enable from the backend with:
+- EDUTRACK_FAKE_OCR_MS=<ms per page>
+- EDUTRACK_FAKE_EMBED_MS=<ms per encode call>
+"""
+
+from typing import Any, Callable, Dict, List, Sequence
+import hashlib
+import os
+import time
+
+import numpy as np
+
+_FAKE_WORDS = (
+    "fire safety certificate issued by the municipal fire department valid till authority "
+    "signature signed name designation qualification affiliation university session audit"
+).split()
+
+
+def _sleep_ms(ms: float) -> None:
+    if ms > 0:
+        time.sleep(ms / 1000.0)
+
+
+def make_fake_run_ocr(
+    latency_ms: float = 250.0, pages: int = 1, words_per_page: int = 180
+) -> Callable[..., Dict[str, Any]]:
+    """Return a run_ocr-compatible callable producing text seeded by the file's hash."""
+
+    def fake_run_ocr(file_path: str, max_pages: int = 10, as_result: bool = False) -> Any:
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        with open(file_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).digest()
+        rng = np.random.default_rng(int.from_bytes(digest[:8], "little"))
+
+        pages_payload: List[Dict[str, Any]] = []
+        for page_no in range(1, min(pages, max_pages) + 1):
+            _sleep_ms(latency_ms)
+            words = [_FAKE_WORDS[i] for i in rng.integers(0, len(_FAKE_WORDS), words_per_page)]
+            date = f"{rng.integers(2020, 2029)}-{rng.integers(1, 13):02d}-{rng.integers(1, 29):02d}"
+            words[len(words) // 2 : len(words) // 2] = ["Date:", date]
+            pages_payload.append(
+                {
+                    "page_no": page_no,
+                    "text": " ".join(words),
+                    "ocr_conf_mean": round(float(rng.uniform(0.6, 0.97)), 3),
+                }
+            )
+
+        confs = [p["ocr_conf_mean"] for p in pages_payload]
+        payload = {
+            "doc_id": os.path.basename(file_path),
+            "doc_type": "unknown",
+            "pages": pages_payload,
+            "full_text": "\n\n".join(p["text"] for p in pages_payload),
+            "ocr_conf_mean": round(sum(confs) / len(confs), 3) if confs else 0.0,
+        }
+        if as_result:
+            from doc_validator.results import OcrResult
+
+            return OcrResult.from_dict(payload)
+        return payload
+
+    return fake_run_ocr
+
+
+class FakeEmbeddingModel:
+    """SentenceTransformer-compatible `encode` returning hash-seeded unit vectors."""
+
+    def __init__(self, latency_ms: float = 40.0, dim: int = 384):
+        self.latency_ms = latency_ms
+        self.dim = dim
+
+    def encode(self, sentences: Sequence[str], convert_to_numpy: bool = True, **_: Any) -> np.ndarray:
+        _sleep_ms(self.latency_ms)
+        vectors = np.empty((len(sentences), self.dim), dtype=np.float32)
+        for i, text in enumerate(sentences):
+            seed = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+            vec = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+            vectors[i] = vec / np.linalg.norm(vec)
+        return vectors
@@ -1,34 +1,148 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
 import csv
+import re
 import tempfile
 import os
 import sys
+import zipfile
 
-from fastapi import FastAPI, File, Header, HTTPException, UploadFile
+from fastapi import FastAPI, File, Header, HTTPException, Query, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
-PROJECT_ROOT = Path(__file__).resolve().parents[1]
-if str(PROJECT_ROOT) not in sys.path:
-    sys.path.append(str(PROJECT_ROOT))
+BACKEND_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BACKEND_DIR.parent
+for _path in (PROJECT_ROOT, BACKEND_DIR):
+    if str(_path) not in sys.path:
+        sys.path.append(str(_path))
+
+from auth_tokens import DEFAULT_TOKEN_TTL_SECONDS, TokenSigner, load_revocation_list
+from batching import MicroBatcher
+from change_feed import ChangeFeed, format_sse
+from dedup import DedupIndex, HashingReader
+from dss_rollup import GRANULARITIES, DssRollup
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, MetricsRegistry
+from search_index import InstitutionSearchIndex
+from submission_index import SubmissionIndex
+
+# Deterministic fake OCR / embedding backends with fixed latency, for load tests.
+FAKE_OCR_MS = os.getenv("EDUTRACK_FAKE_OCR_MS")
+FAKE_EMBED_MS = os.getenv("EDUTRACK_FAKE_EMBED_MS")
+# Address of backend/model_server.py: workers then share its embedding model and
+# risk scorer instead of each loading their own (and it applies FAKE_EMBED_MS).
+MODEL_SERVER = os.getenv("EDUTRACK_MODEL_SERVER")
 
 try:
     from doc_validator.ocr_engine import run_ocr
-    from doc_validator.predictor import predict_from_ocr
 except Exception:
     run_ocr = None
+
+try:
+    from doc_validator.results import OcrResult
+except Exception:
+    OcrResult = None
+
+try:
+    from doc_validator.predictor import predict_batch_from_ocr, predict_from_ocr
+except Exception:
     predict_from_ocr = None
+    predict_batch_from_ocr = None
+
+if FAKE_OCR_MS is not None:
+    from fake_backends import make_fake_run_ocr
+
+    run_ocr = make_fake_run_ocr(latency_ms=float(FAKE_OCR_MS))
+
+if FAKE_EMBED_MS is not None and predict_from_ocr is not None and not MODEL_SERVER:
+    from doc_validator.predictor import DocumentValidator
+    from fake_backends import FakeEmbeddingModel
+
+    _fake_validator = DocumentValidator(
+        embedding_model=FakeEmbeddingModel(latency_ms=float(FAKE_EMBED_MS)), lean=True
+    )
+    predict_from_ocr = _fake_validator.predict_from_dict
+    predict_batch_from_ocr = _fake_validator.predict_batch
+
+try:
+    from college_aggregator import aggregate_college
+except Exception:
+    aggregate_college = None
+
+try:
+    from doc_validator.rule_engine import get_rules
+except Exception:
+    get_rules = None
 
 try:
-    from risk_engine import predict_risk
+    import columnar_store
 except Exception:
-    predict_risk = None
+    columnar_store = None
+
+try:
+    from risk_engine import predict_risk_batch, prediction_cache_stats
+except Exception:
+    predict_risk_batch = None
+    prediction_cache_stats = None
+
+if MODEL_SERVER:
+    from model_server import ModelServerClient
+
+    MODEL_CLIENT = ModelServerClient(MODEL_SERVER)
+    predict_risk_batch = MODEL_CLIENT.predict_risk_batch
+    prediction_cache_stats = None  # the cache lives in the model server
+    if predict_from_ocr is not None:
+        from doc_validator.predictor import DocumentValidator
+
+        _shared_validator = DocumentValidator(embedding_model=MODEL_CLIENT, lean=True)
+        predict_from_ocr = _shared_validator.predict_from_dict
+        predict_batch_from_ocr = _shared_validator.predict_batch
 
 app = FastAPI(title="EduTrack Backend", version="0.1.0")
 
+METRICS = MetricsRegistry()
+REQUEST_LATENCY = METRICS.histogram(
+    "edutrack_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = METRICS.gauge("edutrack_http_requests_in_flight", "HTTP requests currently being served.")
+STAGE_LATENCY = METRICS.histogram(
+    "edutrack_stage_duration_seconds",
+    "Time spent in pipeline stages (OCR, validation, risk scoring, data loading).",
+    ["stage"],
+)
+CACHE_REQUESTS = METRICS.counter("edutrack_cache_requests_total", "Cache lookups by outcome.", ["cache", "result"])
+CACHE_HIT_RATIO = METRICS.gauge("edutrack_cache_hit_ratio", "Cache hits over total lookups.", ["cache"])
+THREADPOOL_BUSY = METRICS.gauge("edutrack_threadpool_busy_workers", "Sync route workers currently running.")
+THREADPOOL_QUEUE_DEPTH = METRICS.gauge(
+    "edutrack_threadpool_queue_depth", "Sync route calls waiting for a free threadpool worker."
+)
+FEED_SUBSCRIBERS = METRICS.gauge("edutrack_feed_subscribers", "Open submission change-feed streams.")
+RISK_CACHE_ENTRIES = METRICS.gauge("edutrack_risk_cache_entries", "Memoized risk predictions currently held.")
+MICROBATCH_SIZE = METRICS.histogram(
+    "edutrack_microbatch_items",
+    "Items per micro-batched model call.",
+    ["batcher"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+MICROBATCH_WAIT = METRICS.histogram(
+    "edutrack_microbatch_wait_seconds", "Time a request waited for its micro-batch to start.", ["batcher"]
+)
+MICROBATCH_QUEUE_DEPTH = METRICS.gauge(
+    "edutrack_microbatch_queue_depth", "Requests waiting for the next micro-batch.", ["batcher"]
+)
+
+app.add_middleware(
+    MetricsMiddleware,
+    latency=REQUEST_LATENCY,
+    in_flight=REQUESTS_IN_FLIGHT,
+    skip_prefixes=("/metrics", "/events/"),
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173", "http://127.0.0.1:5173"],
@@ -135,7 +249,107 @@ INSTITUTION_PROFILES: Dict[str, Dict[str, float]] = {
     },
 }
 
-TOKENS: Dict[str, Dict[str, str]] = {}
+SUBMISSION_INDEX = SubmissionIndex(SUBMISSIONS)
+DSS_ROLLUP = DssRollup(SUBMISSIONS)
+DEDUP_INDEX = DedupIndex(
+    threshold=float(os.getenv("EDUTRACK_DEDUP_THRESHOLD", "0.85")),
+    max_entries=int(os.getenv("EDUTRACK_DEDUP_MAX_ENTRIES", "10000")),
+)
+
+REVIEWER_QUEUE_MAX_LIMIT = 200
+
+SUBMISSION_FEED = ChangeFeed(capacity=int(os.getenv("EDUTRACK_FEED_CAPACITY", "1000")))
+
+UPLOAD_COPY_CHUNK = 1 << 20
+BATCH_MAX_DOCUMENTS = int(os.getenv("EDUTRACK_BATCH_MAX_DOCUMENTS", "50"))
+BATCH_MAX_DOCUMENT_BYTES = int(os.getenv("EDUTRACK_BATCH_MAX_DOCUMENT_MB", "25")) << 20
+# OCR/validation jobs running at once across all batch requests.
+BATCH_SEMAPHORE = asyncio.Semaphore(int(os.getenv("EDUTRACK_BATCH_CONCURRENCY", "4")))
+DOC_TYPE_ALIASES = {
+    "fire": "fire_safety_certificate",
+    "noc": "fire_safety_certificate",
+    "affiliation": "affiliation_letter",
+    "faculty": "faculty_list",
+    "staff": "faculty_list",
+    "audit": "financial_statement",
+    "financial": "financial_statement",
+    "balance": "financial_statement",
+}
+
+# Query-string tokens for EventSource: single-purpose and valid only long
+# enough to open (or reopen) the stream, since URLs end up in access logs.
+STREAM_TOKEN_SCOPE = "events"
+STREAM_TOKEN_TTL_SECONDS = int(os.getenv("EDUTRACK_STREAM_TOKEN_TTL", "60"))
+
+TOKEN_SIGNER = TokenSigner(
+    ttl_seconds=int(os.getenv("EDUTRACK_TOKEN_TTL", str(DEFAULT_TOKEN_TTL_SECONDS))),
+    revocations=load_revocation_list(),
+)
+
+# Loaded rank list, reused until the file's path/mtime/size changes. "table"
+# holds a memory-mapped Arrow table when a columnar rank list is present,
+# otherwise "rows" holds the parsed CSV.
+_RANK_LIST_CACHE: Dict[str, Any] = {"key": None, "rows": [], "table": None, "source": None, "search": None}
+RANK_LIST_BASENAME = "college_rank_list"
+SEARCH_MAX_LIMIT = 50
+RANK_LIST_FIELDS = [
+    ("Rank", "rank"),
+    ("College Name", "institution"),
+    ("Avg_Doc_DSS", "avg_dss_score"),
+    ("Risk_Score", "risk_score"),
+    ("Rank_Score", "rank_score"),
+    ("Top_Risk_Driver", "top_risk_driver"),
+    ("Top_Risk_Share", "top_risk_share"),
+]
+
+
+def _record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def _cache_hit_ratio(cache: str) -> float:
+    hits = CACHE_REQUESTS.labels(cache, "hit").value
+    misses = CACHE_REQUESTS.labels(cache, "miss").value
+    return hits / (hits + misses) if hits + misses else 0.0
+
+
+def _threadpool_statistics():
+    import anyio.to_thread
+
+    return anyio.to_thread.current_default_thread_limiter().statistics()
+
+
+CACHE_HIT_RATIO.labels("rank_list").set_function(lambda: _cache_hit_ratio("rank_list"))
+CACHE_HIT_RATIO.labels("dedup").set_function(lambda: _cache_hit_ratio("dedup"))
+THREADPOOL_BUSY.set_function(lambda: _threadpool_statistics().borrowed_tokens)
+THREADPOOL_QUEUE_DEPTH.set_function(lambda: _threadpool_statistics().tasks_waiting)
+FEED_SUBSCRIBERS.set_function(SUBMISSION_FEED.subscriber_count)
+if prediction_cache_stats is not None:
+    CACHE_HIT_RATIO.labels("risk_prediction").set_function(lambda: prediction_cache_stats()["hit_ratio"])
+    RISK_CACHE_ENTRIES.set_function(lambda: prediction_cache_stats()["size"])
+
+# Concurrent validation / risk calls are gathered for up to MICROBATCH_MAX_ITEMS
+# items or MICROBATCH_MAX_WAIT_MS and run as one call; MAX_ITEMS=1 turns it off.
+MICROBATCH_MAX_ITEMS = int(os.getenv("EDUTRACK_MICROBATCH_MAX_ITEMS", "16"))
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("EDUTRACK_MICROBATCH_MAX_WAIT_MS", "5"))
+
+
+def _make_batcher(name: str, fn) -> Optional[MicroBatcher]:
+    if fn is None:
+        return None
+
+    def observe(items: int, waits: List[float]) -> None:
+        MICROBATCH_SIZE.labels(name).observe(items)
+        for wait in waits:
+            MICROBATCH_WAIT.labels(name).observe(wait)
+
+    batcher = MicroBatcher(fn, MICROBATCH_MAX_ITEMS, MICROBATCH_MAX_WAIT_MS, name=name, on_batch=observe)
+    MICROBATCH_QUEUE_DEPTH.labels(name).set_function(batcher.queue_depth)
+    return batcher
+
+
+VALIDATION_BATCHER = _make_batcher("validation", predict_batch_from_ocr)
+RISK_BATCHER = _make_batcher("risk", predict_risk_batch)
 
 
 class LoginPayload(BaseModel):
@@ -149,10 +363,7 @@ class ReviewActionPayload(BaseModel):
 
 
 def _issue_token(email: str, role: str) -> str:
-    raw = f"{email}:{role}:{datetime.utcnow().isoformat()}"
-    token = hashlib.sha256(raw.encode("utf-8")).hexdigest()
-    TOKENS[token] = {"email": email, "role": role}
-    return token
+    return TOKEN_SIGNER.issue(email, role)
 
 
 def _read_bearer(authorization: Optional[str]) -> Optional[str]:
@@ -164,13 +375,29 @@ def _read_bearer(authorization: Optional[str]) -> Optional[str]:
     return authorization[len(prefix) :].strip()
 
 
+def _require_stream_auth(authorization: Optional[str], token: Optional[str]) -> Dict[str, str]:
+    """Session bearer header, or a short-lived "events" token in the query string (EventSource)."""
+    if authorization or not token:
+        return _require_auth(authorization)
+    user = TOKEN_SIGNER.verify(token, scope=STREAM_TOKEN_SCOPE)
+    if user is None:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return user
+
+
 def _require_auth(authorization: Optional[str]) -> Dict[str, str]:
     token = _read_bearer(authorization)
     if token == "local-dev-token":
         return {"email": "local.dev@edutrack.test", "role": "institution"}
-    if not token or token not in TOKENS:
+    user = TOKEN_SIGNER.verify(token) if token else None
+    if user is None:
         raise HTTPException(status_code=401, detail="Unauthorized")
-    return TOKENS[token]
+    return user
+
+
+def _visible_institution_ids(institution_id: str) -> List[str]:
+    # Demo uploads are filed under "demo" / "inst_demo" and shown to every institution.
+    return [institution_id, "inst_demo", "demo"]
 
 
 def _fallback_risk_score(avg_dss: float, missing_docs: int) -> float:
@@ -180,29 +407,49 @@ def _fallback_risk_score(avg_dss: float, missing_docs: int) -> float:
     return round(max(0.0, min(100.0, base + penalty)), 2)
 
 
-def _compute_institution_risk_score(institution_name: str, avg_dss: float, missing_docs: int) -> float:
-    if predict_risk is None:
-        return _fallback_risk_score(avg_dss, missing_docs)
+RISK_DRIVER_COUNT = 3
 
-    profile = INSTITUTION_PROFILES.get(institution_name)
-    if not profile:
-        return _fallback_risk_score(avg_dss, missing_docs)
 
-    payload = {
-        **profile,
-        "Avg_Doc_DSS": avg_dss,
-        "Missing_Doc_Count": missing_docs,
-    }
+def _compute_institution_risks(institutions: List[Tuple[str, float, int]]) -> List[Dict[str, Any]]:
+    """
+    Risk score and top model-attributed drivers for each (name, avg_dss,
+    missing_docs), scored in one predict_risk_batch call.
+    """
+    results: List[Dict[str, Any]] = [
+        {"risk_score": _fallback_risk_score(avg_dss, missing_docs), "risk_drivers": []}
+        for _, avg_dss, missing_docs in institutions
+    ]
+    if predict_risk_batch is None:
+        return results
+
+    positions: List[int] = []
+    payloads: List[Dict[str, Any]] = []
+    for idx, (name, avg_dss, missing_docs) in enumerate(institutions):
+        profile = INSTITUTION_PROFILES.get(name)
+        if profile:
+            positions.append(idx)
+            payloads.append({**profile, "Avg_Doc_DSS": avg_dss, "Missing_Doc_Count": missing_docs})
+    if not payloads:
+        return results
 
     try:
-        result = predict_risk(payload)
-        score = result.get("risk_score") if isinstance(result, dict) else None
-        if isinstance(score, (int, float)):
-            return round(float(score), 2)
+        with STAGE_LATENCY.labels("predict_risk").time():
+            predictions = RISK_BATCHER.submit_many(payloads)
     except Exception:
-        pass
+        return results
 
-    return _fallback_risk_score(avg_dss, missing_docs)
+    for idx, prediction in zip(positions, predictions):
+        score = prediction.get("risk_score") if isinstance(prediction, dict) else None
+        if isinstance(score, (int, float)):
+            contributions = prediction.get("feature_contributions") or {}
+            results[idx] = {
+                "risk_score": round(float(score), 2),
+                "risk_drivers": [
+                    {"feature": feature, "share": share}
+                    for feature, share in list(contributions.items())[:RISK_DRIVER_COUNT]
+                ],
+            }
+    return results
 
 
 def _build_institution_rank_list() -> List[Dict[str, Any]]:
@@ -210,13 +457,18 @@ def _build_institution_rank_list() -> List[Dict[str, Any]]:
     for row in SUBMISSIONS:
         grouped.setdefault(row.get("institution", "Unknown"), []).append(row)
 
-    rank_rows: List[Dict[str, Any]] = []
+    summaries: List[Tuple[str, float, int, int]] = []
     for institution, rows in grouped.items():
         dss_values = [float(r.get("dss", 0.0)) for r in rows]
         avg_dss = round(sum(dss_values) / len(dss_values), 2) if dss_values else 0.0
         missing_docs = sum(1 for r in rows if r.get("status") in {"needs_manual_review", "low_confidence"})
+        summaries.append((institution, avg_dss, missing_docs, len(rows)))
 
-        risk_score = _compute_institution_risk_score(institution, avg_dss, missing_docs)
+    risks = _compute_institution_risks([(name, dss, missing) for name, dss, missing, _ in summaries])
+
+    rank_rows: List[Dict[str, Any]] = []
+    for (institution, avg_dss, _, count), risk in zip(summaries, risks):
+        risk_score = risk["risk_score"]
         rank_score = round((avg_dss + risk_score) / 2.0, 2)  # user-requested formula
 
         rank_rows.append(
@@ -224,8 +476,9 @@ def _build_institution_rank_list() -> List[Dict[str, Any]]:
                 "institution": institution,
                 "avg_dss_score": avg_dss,
                 "risk_score": risk_score,
+                "risk_drivers": risk["risk_drivers"],
                 "rank_score": rank_score,
-                "submission_count": len(rows),
+                "submission_count": count,
             }
         )
 
@@ -236,11 +489,115 @@ def _build_institution_rank_list() -> List[Dict[str, Any]]:
     return rank_rows
 
 
-def _load_rank_list_from_csv() -> List[Dict[str, Any]]:
-    csv_path = PROJECT_ROOT / "college_rank_list.csv"
-    if not csv_path.exists():
+def _rank_list_path() -> Optional[Path]:
+    candidates = [".csv"]
+    if columnar_store is not None and columnar_store.HAVE_PYARROW:
+        candidates = [".arrow", ".parquet"] + candidates
+    for suffix in candidates:
+        path = PROJECT_ROOT / f"{RANK_LIST_BASENAME}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+def _load_rank_list() -> Dict[str, Any]:
+    """
+    The cache entry for the current rank-list file: a memory-mapped Arrow
+    table for .arrow/.parquet (no per-row parsing), or parsed CSV rows.
+    """
+    path = _rank_list_path()
+    if path is None:
+        return {"rows": [], "table": None, "source": None, "search": None}
+
+    stat = path.stat()
+    cache_key = (str(path), stat.st_mtime_ns, stat.st_size)
+    if _RANK_LIST_CACHE["key"] == cache_key:
+        _record_cache_lookup("rank_list", hit=True)
+        return _RANK_LIST_CACHE
+
+    _record_cache_lookup("rank_list", hit=False)
+    table, rows = None, []
+    if path.suffix == ".csv":
+        with STAGE_LATENCY.labels("load_rank_list_csv").time():
+            rows = _parse_rank_list_csv(path)
+    else:
+        with STAGE_LATENCY.labels("load_rank_list_columnar").time():
+            table = _open_rank_list_table(path)
+    with STAGE_LATENCY.labels("build_search_index").time():
+        names = table.column("College Name").to_pylist() if table is not None else [r["institution"] for r in rows]
+        search = InstitutionSearchIndex(names)
+    _RANK_LIST_CACHE.update(
+        {"key": cache_key, "rows": rows, "table": table, "source": path.name, "search": search}
+    )
+    return _RANK_LIST_CACHE
+
+
+def _open_rank_list_table(path: Path) -> Any:
+    header = columnar_store.read_header(path)
+    if "College Name" not in header:
+        raise ValueError(f"{path.name} has no 'College Name' column")
+    table = columnar_store.read_table(path, [name for name, _ in RANK_LIST_FIELDS if name in header])
+    if "Rank" in table.column_names and table.num_rows > 1:
+        ranks = table.column("Rank").to_numpy()
+        if (ranks[1:] < ranks[:-1]).any():
+            table = table.sort_by("Rank")
+    return table
+
+
+def _rank_list_drivers(driver: Any, share: Any) -> List[Dict[str, Any]]:
+    """risk_drivers for a stored rank-list row: score_csv keeps only the top driver."""
+    driver = str(driver or "").strip()
+    if not driver:
         return []
+    try:
+        share = round(float(share), 4) if share not in (None, "") else None
+    except (TypeError, ValueError):
+        share = None
+    return [{"feature": driver, "share": share}]
+
+
+def _rank_list_table_rows(table: Any) -> List[Dict[str, Any]]:
+    """Converts a (sliced) rank-list table to the CSV parser's row dicts."""
+    n = table.num_rows
+    columns = {
+        key: table.column(name).to_pylist() if name in table.column_names else [None] * n
+        for name, key in RANK_LIST_FIELDS
+    }
+    return [
+        {
+            "rank": int(rank or 0),
+            "institution": str(name or "").strip(),
+            "avg_dss_score": round(float(dss or 0), 2),
+            "risk_score": round(float(risk or 0), 2),
+            "risk_drivers": _rank_list_drivers(driver, share),
+            "rank_score": round(float(rank_score or 0), 2),
+            "submission_count": None,
+        }
+        for rank, name, dss, risk, rank_score, driver, share in zip(
+            columns["rank"],
+            columns["institution"],
+            columns["avg_dss_score"],
+            columns["risk_score"],
+            columns["rank_score"],
+            columns["top_risk_driver"],
+            columns["top_risk_share"],
+        )
+    ]
 
+
+def _rank_list_page(offset: int, limit: Optional[int]) -> Tuple[int, List[Dict[str, Any]], Optional[str]]:
+    """(total, rows[offset:offset + limit], source file). Columnar files only materialize the page."""
+    entry = _load_rank_list()
+    table = entry["table"]
+    if table is not None:
+        page = table.slice(offset, limit) if limit is not None else table.slice(offset)
+        return table.num_rows, _rank_list_table_rows(page), entry["source"]
+    rows = entry["rows"]
+    end = offset + limit if limit is not None else None
+    return len(rows), rows[offset:end], entry["source"]
+
+
+def _parse_rank_list_csv(csv_path: Path) -> List[Dict[str, Any]]:
     rows: List[Dict[str, Any]] = []
     with csv_path.open("r", encoding="utf-8", newline="") as f:
         reader = csv.DictReader(f)
@@ -252,6 +609,7 @@ def _load_rank_list_from_csv() -> List[Dict[str, Any]]:
                         "institution": str(raw.get("College Name", "")).strip(),
                         "avg_dss_score": round(float(raw.get("Avg_Doc_DSS", 0) or 0), 2),
                         "risk_score": round(float(raw.get("Risk_Score", 0) or 0), 2),
+                        "risk_drivers": _rank_list_drivers(raw.get("Top_Risk_Driver"), raw.get("Top_Risk_Share")),
                         "rank_score": round(float(raw.get("Rank_Score", 0) or 0), 2),
                         "submission_count": None,
                     }
@@ -268,6 +626,12 @@ def health() -> Dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    # Async so scrape-time gauges can read the event loop's threadpool limiter.
+    return PlainTextResponse(METRICS.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.post("/auth/login")
 def login(payload: LoginPayload) -> Dict[str, Any]:
     for user in USERS:
@@ -276,29 +640,71 @@ def login(payload: LoginPayload) -> Dict[str, Any]:
             return {
                 "token": token,
                 "user": {"email": user["email"], "role": user["role"]},
-                "expires_in": int(timedelta(hours=12).total_seconds()),
+                "expires_in": TOKEN_SIGNER.ttl_seconds,
             }
     raise HTTPException(status_code=401, detail="Invalid credentials")
 
 
+@app.post("/auth/logout")
+def logout(authorization: Optional[str] = Header(default=None)) -> Dict[str, Any]:
+    _require_auth(authorization)
+    token = _read_bearer(authorization)
+    revoked = TOKEN_SIGNER.revoke(token) if token else False
+    return {"ok": True, "revoked": revoked}
+
+
 @app.get("/auth/me")
 def me(authorization: Optional[str] = Header(default=None)) -> Dict[str, Any]:
     user = _require_auth(authorization)
     return {"user": user}
 
 
+def _split_csv_param(values: Optional[List[str]]) -> Optional[List[str]]:
+    if not values:
+        return None
+    parts = [p.strip() for v in values for p in v.split(",")]
+    return [p for p in parts if p] or None
+
+
 @app.get("/reviewer/queue")
-def reviewer_queue(authorization: Optional[str] = Header(default=None)) -> List[Dict[str, Any]]:
+def reviewer_queue(
+    status: Optional[List[str]] = Query(default=None),
+    doc_type: Optional[List[str]] = Query(default=None),
+    min_dss: Optional[float] = Query(default=None, ge=0, le=100),
+    max_dss: Optional[float] = Query(default=None, ge=0, le=100),
+    order: str = Query(default="desc", pattern="^(asc|desc)$"),
+    limit: int = Query(default=50, ge=1, le=REVIEWER_QUEUE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    authorization: Optional[str] = Header(default=None),
+) -> Dict[str, Any]:
     _require_auth(authorization)
-    return SUBMISSIONS
+    try:
+        page = SUBMISSION_INDEX.query(
+            statuses=_split_csv_param(status),
+            doc_types=_split_csv_param(doc_type),
+            min_dss=min_dss,
+            max_dss=max_dss,
+            descending=order == "desc",
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    return {
+        **page,
+        "total": len(SUBMISSION_INDEX),
+        "status_counts": SUBMISSION_INDEX.status_counts(),
+        "avg_dss": SUBMISSION_INDEX.avg_dss(),
+    }
 
 
 @app.get("/reviewer/document/{submission_id}")
 def reviewer_document(submission_id: str, authorization: Optional[str] = Header(default=None)) -> Dict[str, Any]:
     _require_auth(authorization)
-    for item in SUBMISSIONS:
-        if item["id"] == submission_id:
-            return item
+    item = SUBMISSION_INDEX.get(submission_id)
+    if item is not None:
+        return item
     raise HTTPException(status_code=404, detail="Submission not found")
 
 
@@ -309,87 +715,366 @@ def review_action(
     authorization: Optional[str] = Header(default=None),
 ) -> Dict[str, Any]:
     _require_auth(authorization)
-    for item in SUBMISSIONS:
-        if item["id"] == submission_id:
-            item["status"] = payload.action
-            item["review_note"] = payload.notes or ""
-            return {"ok": True, "submission": item}
+    item = SUBMISSION_INDEX.get(submission_id)
+    if item is not None:
+        old_status = item.get("status")
+        item["status"] = payload.action
+        item["review_note"] = payload.notes or ""
+        SUBMISSION_INDEX.update_status(submission_id, old_status)
+        DSS_ROLLUP.update_status(item, old_status)
+        SUBMISSION_FEED.publish("submission.updated", item)
+        return {"ok": True, "submission": item}
     raise HTTPException(status_code=404, detail="Submission not found")
 
 
-@app.post("/upload-analyze")
-async def upload_analyze(
-    file: UploadFile = File(...),
-    authorization: Optional[str] = Header(default=None),
-) -> Dict[str, Any]:
-    _require_auth(authorization)
+def _analyze_file(path: str, doc_type: str, digest: Optional[str] = None) -> Dict[str, Any]:
+    """
+    OCR + validation for one file on disk. Blocking; run it off the event
+    loop. A byte-identical earlier upload of the same doc type skips OCR
+    entirely; a near-duplicate of one skips validation. Either way the
+    cached DSS, flags and fields are reused and "duplicate" names the match.
+    "fallback" stays True unless predict_from_ocr produced the result.
+    """
+    analysis: Dict[str, Any] = {
+        "dss": 70,
+        "flags": [],
+        "fields": {},
+        "digest": digest,
+        "signature": None,
+        "duplicate": None,
+        "fallback": True,
+    }
 
-    file_suffix = Path(file.filename or "upload.bin").suffix or ".bin"
+    if digest:
+        match = DEDUP_INDEX.find_exact(doc_type, digest)
+        if match is not None:
+            analysis["duplicate"] = ("exact",) + match
+            return analysis
 
     # Use your existing root/doc_validator pipeline when available.
-    dss_score = 70
-    flags: List[str] = []
-    extracted_fields: Dict[str, Any] = {}
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=file_suffix) as tmp:
-        tmp_path = tmp.name
-        content = await file.read()
-        tmp.write(content)
-
     try:
         if run_ocr and predict_from_ocr:
-            ocr_output = run_ocr(tmp_path)
-            if isinstance(ocr_output, dict):
-                ocr_output["doc_type"] = "uploaded_document"
-
-            prediction = predict_from_ocr(ocr_output)
+            with STAGE_LATENCY.labels("run_ocr").time():
+                ocr_output = run_ocr(path, as_result=True)
+            if isinstance(ocr_output, OcrResult):
+                ocr_output.doc_type = doc_type
+
+                with STAGE_LATENCY.labels("dedup_signature").time():
+                    analysis["signature"] = DEDUP_INDEX.signature(ocr_output.full_text or "")
+                    match = DEDUP_INDEX.find_near(doc_type, analysis["signature"])
+                if match is not None:
+                    analysis["duplicate"] = ("near",) + match
+                    return analysis
+
+            # The validator is lean: it empties the OcrResult's text once scored.
+            with STAGE_LATENCY.labels("predict_from_ocr").time():
+                if VALIDATION_BATCHER is not None and isinstance(ocr_output, OcrResult):
+                    prediction = VALIDATION_BATCHER.submit(ocr_output)
+                else:
+                    prediction = predict_from_ocr(ocr_output)
             if isinstance(prediction, dict):
-                dss_score = int(prediction.get("dss_score", dss_score))
-                flags = list(prediction.get("dss_flags", []))
-                extracted_fields = prediction.get("fields", {}) or {}
+                analysis["dss"] = int(prediction.get("dss_score", analysis["dss"]))
+                analysis["flags"] = list(prediction.get("dss_flags", []))
+                analysis["fields"] = prediction.get("fields", {}) or {}
+                analysis["fallback"] = False
         else:
-            flags.append("Predictor module unavailable; using fallback DSS")
+            analysis["flags"].append("Predictor module unavailable; using fallback DSS")
     except Exception as exc:
-        flags.append(f"Pipeline fallback: {str(exc)}")
-    finally:
-        try:
-            os.remove(tmp_path)
-        except Exception:
-            pass
+        analysis["flags"].append(f"Pipeline fallback: {str(exc)}")
+    return analysis
+
 
+def _record_submission(file_name: Optional[str], doc_type: str, analysis: Dict[str, Any]) -> Dict[str, Any]:
     submission_id = f"SUB-{100 + len(SUBMISSIONS) + 1}"
     today = datetime.utcnow().date().isoformat()
 
+    dss_score, flags, extracted_fields = analysis["dss"], list(analysis["flags"]), dict(analysis["fields"])
+    duplicate = analysis.get("duplicate")
+    _record_cache_lookup("dedup", duplicate is not None)
+    if duplicate is not None:
+        kind, original_id, similarity, cached = duplicate
+        dss_score, flags, extracted_fields = cached["dss"], list(cached["flags"]), dict(cached["fields"])
+        if kind == "exact":
+            flags.append(f"Duplicate of {original_id} (identical file)")
+        else:
+            flags.append(f"Near-duplicate of {original_id} (similarity {similarity:.2f})")
+
     new_item = {
         "id": submission_id,
         "institution": "Demo Institute",
         "institution_id": "demo",
-        "doc_type": "uploaded_document",
+        "doc_type": doc_type,
         "dss": max(0, min(100, dss_score)),
         "status": "parsed" if not flags else "needs_manual_review",
         "uploaded_at": today,
         "flags": flags,
         "extracted_fields": extracted_fields,
     }
+    if duplicate is not None:
+        new_item["duplicate_of"] = duplicate[1]
+        new_item["duplicate_similarity"] = duplicate[2]
+    elif not analysis.get("fallback"):
+        # Only analysed originals are indexed, so every match points at the
+        # first upload and a transient OCR/predictor failure is never reused.
+        DEDUP_INDEX.add(
+            submission_id,
+            doc_type,
+            analysis.get("digest"),
+            analysis.get("signature"),
+            {"dss": dss_score, "flags": flags, "fields": extracted_fields},
+        )
     SUBMISSIONS.insert(0, new_item)
+    SUBMISSION_INDEX.add(new_item)
+    DSS_ROLLUP.add(new_item)
+    SUBMISSION_FEED.publish("submission.created", new_item)
 
     return {
         "submission_id": submission_id,
-        "file_name": file.filename,
+        "file_name": file_name,
+        "doc_type": doc_type,
         "dss": new_item["dss"],
         "compliance": "Compliant" if new_item["dss"] >= 75 else "Needs Correction",
         "fields": new_item["extracted_fields"],
         "flags": new_item["flags"],
+        "duplicate_of": new_item.get("duplicate_of"),
+    }
+
+
+def _spool_to_temp(source, suffix: str, max_bytes: Optional[int] = None) -> Tuple[str, str]:
+    """
+    Copies a file object to a temp file in UPLOAD_COPY_CHUNK pieces; returns
+    its path and the SHA-256 of the bytes copied.
+    """
+    source = HashingReader(source)
+    written = 0
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        try:
+            while True:
+                chunk = source.read(UPLOAD_COPY_CHUNK)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if max_bytes is not None and written > max_bytes:
+                    raise ValueError(f"Document exceeds {max_bytes} bytes")
+                tmp.write(chunk)
+        except Exception:
+            tmp.close()
+            _remove_quietly(tmp.name)
+            raise
+    return tmp.name, source.hexdigest()
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except Exception:
+        pass
+
+
+def _infer_doc_type(file_name: str) -> str:
+    """Maps a file name like 'fire_noc_2026.pdf' to a known document type."""
+    stem = Path(file_name).stem.lower()
+    rules = get_rules() if get_rules else None
+    known = set(rules.doc_types) | set(rules.mandatory_docs) if rules else set()
+    for doc_type in sorted(known, key=len, reverse=True):
+        if doc_type in stem:
+            return doc_type
+    tokens = set(re.findall(r"[a-z]+", stem))
+    for alias, doc_type in DOC_TYPE_ALIASES.items():
+        if alias in tokens:
+            return doc_type
+    return "uploaded_document"
+
+
+def _is_zip_upload(upload: UploadFile) -> bool:
+    if (upload.filename or "").lower().endswith(".zip"):
+        return True
+    if upload.content_type in ("application/zip", "application/x-zip-compressed"):
+        return True
+    is_zip = zipfile.is_zipfile(upload.file)
+    upload.file.seek(0)
+    return is_zip
+
+
+def _iter_zip_members(archive: zipfile.ZipFile):
+    for info in archive.infolist():
+        name = info.filename
+        if info.is_dir() or name.startswith("__MACOSX/") or Path(name).name.startswith("."):
+            continue
+        yield info
+
+
+def _expand_uploads(files: List[UploadFile]) -> List[Dict[str, Any]]:
+    """
+    Turns the uploaded parts into one temp file per document. Zip archives
+    are read member by member from the spooled upload, each member streamed
+    to its own temp file, so an archive is never held in memory whole.
+    """
+    documents: List[Dict[str, Any]] = []
+
+    def _add(file_name: str, source, declared_size: Optional[int] = None) -> None:
+        if len(documents) >= BATCH_MAX_DOCUMENTS:
+            raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_DOCUMENTS} documents per batch")
+        entry: Dict[str, Any] = {"file_name": file_name, "doc_type": _infer_doc_type(file_name), "path": None}
+        try:
+            if declared_size is not None and declared_size > BATCH_MAX_DOCUMENT_BYTES:
+                raise ValueError(f"Document exceeds {BATCH_MAX_DOCUMENT_BYTES} bytes")
+            suffix = Path(file_name).suffix or ".bin"
+            entry["path"], entry["digest"] = _spool_to_temp(source, suffix, max_bytes=BATCH_MAX_DOCUMENT_BYTES)
+        except ValueError as exc:
+            entry["error"] = str(exc)
+        documents.append(entry)
+
+    try:
+        for upload in files:
+            file_name = upload.filename or "upload.bin"
+            if not _is_zip_upload(upload):
+                _add(file_name, upload.file)
+                continue
+            try:
+                archive = zipfile.ZipFile(upload.file)
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail=f"Invalid zip archive: {file_name}")
+            with archive:
+                for info in _iter_zip_members(archive):
+                    # Declared sizes can lie; _spool_to_temp enforces the cap on bytes actually read.
+                    with archive.open(info) as member:
+                        _add(info.filename, member, declared_size=info.file_size)
+    except BaseException:
+        for entry in documents:
+            if entry["path"]:
+                _remove_quietly(entry["path"])
+        raise
+    return documents
+
+
+@app.post("/upload-analyze")
+async def upload_analyze(
+    file: UploadFile = File(...),
+    authorization: Optional[str] = Header(default=None),
+) -> Dict[str, Any]:
+    _require_auth(authorization)
+
+    file_suffix = Path(file.filename or "upload.bin").suffix or ".bin"
+    tmp_path, digest = await run_in_threadpool(_spool_to_temp, file.file, file_suffix)
+    try:
+        analysis = await run_in_threadpool(_analyze_file, tmp_path, "uploaded_document", digest)
+    finally:
+        _remove_quietly(tmp_path)
+
+    return _record_submission(file.filename, "uploaded_document", analysis)
+
+
+@app.post("/upload-analyze/batch")
+async def upload_analyze_batch(
+    files: List[UploadFile] = File(...),
+    authorization: Optional[str] = Header(default=None),
+) -> Dict[str, Any]:
+    """
+    Analyzes a compliance pack in one request: any number of files and/or
+    zip archives. Documents go through OCR and validation concurrently
+    (BATCH_CONCURRENCY at a time); the response carries each document's
+    result plus the aggregate_college score over the best DSS per type.
+    """
+    _require_auth(authorization)
+
+    documents = await run_in_threadpool(_expand_uploads, files)
+    if not documents:
+        raise HTTPException(status_code=400, detail="No documents in upload")
+
+    # Repeats of a file within the batch wait for its first copy, then hit the dedup index.
+    first_copy: Dict[Tuple[str, str], int] = {}
+    for position, entry in enumerate(documents):
+        if entry.get("digest"):
+            entry["first_copy"] = first_copy.setdefault((entry["doc_type"], entry["digest"]), position)
+    tasks: List[asyncio.Future] = []
+
+    async def _process(position: int, entry: Dict[str, Any]) -> Dict[str, Any]:
+        if entry.get("error"):
+            return {"file_name": entry["file_name"], "doc_type": entry["doc_type"], "error": entry["error"]}
+        try:
+            if entry["first_copy"] != position:
+                await asyncio.wait([tasks[entry["first_copy"]]])
+            async with BATCH_SEMAPHORE:
+                analysis = await run_in_threadpool(_analyze_file, entry["path"], entry["doc_type"], entry["digest"])
+        finally:
+            _remove_quietly(entry["path"])
+        return _record_submission(entry["file_name"], entry["doc_type"], analysis)
+
+    with STAGE_LATENCY.labels("analyze_batch").time():
+        tasks.extend(asyncio.ensure_future(_process(position, entry)) for position, entry in enumerate(documents))
+        results = await asyncio.gather(*tasks)
+
+    best: Dict[str, Dict[str, Any]] = {}
+    for result in results:
+        if "error" in result:
+            continue
+        current = best.get(result["doc_type"])
+        if current is None or result["dss"] > current["dss_score"]:
+            best[result["doc_type"]] = {"dss_score": result["dss"]}
+
+    college = aggregate_college(best) if aggregate_college else None
+    return {
+        "documents": results,
+        "processed": sum(1 for r in results if "error" not in r),
+        "failed": sum(1 for r in results if "error" in r),
+        "college": college,
     }
 
 
+@app.post("/events/token")
+def events_token(authorization: Optional[str] = Header(default=None)) -> Dict[str, Any]:
+    user = _require_auth(authorization)
+    token = TOKEN_SIGNER.issue(
+        user["email"], user["role"], scope=STREAM_TOKEN_SCOPE, ttl_seconds=STREAM_TOKEN_TTL_SECONDS
+    )
+    return {"token": token, "expires_in": STREAM_TOKEN_TTL_SECONDS}
+
+
+@app.get("/events/submissions")
+async def submission_events(
+    request: Request,
+    since: Optional[int] = Query(default=None, ge=0),
+    institution_id: Optional[str] = None,
+    token: Optional[str] = None,
+    authorization: Optional[str] = Header(default=None),
+    last_event_id: Optional[str] = Header(default=None),
+) -> StreamingResponse:
+    # EventSource cannot send headers, so it passes a stream token from
+    # /events/token instead; session tokens never appear in URLs or logs.
+    _require_stream_auth(authorization, token)
+
+    resume_from = since
+    if last_event_id and last_event_id.isdigit():
+        # The browser's own reconnects carry a newer position than the URL.
+        resume_from = max(resume_from or 0, int(last_event_id))
+    visible_ids = set(_visible_institution_ids(institution_id)) if institution_id else None
+
+    async def stream():
+        yield "retry: 3000\n\n"
+        async for event in SUBMISSION_FEED.subscribe(since=resume_from):
+            if event is None and await request.is_disconnected():
+                break
+            if event is not None and visible_ids is not None and event["type"] != "reset":
+                if event["data"].get("institution_id") not in visible_ids:
+                    continue
+            yield format_sse(event)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/institutions/{institution_id}/submissions")
 def institution_submissions(
     institution_id: str,
     authorization: Optional[str] = Header(default=None),
 ) -> List[Dict[str, Any]]:
     _require_auth(authorization)
-    return [s for s in SUBMISSIONS if s.get("institution_id") in {institution_id, "inst_demo", "demo"}]
+    visible = set(_visible_institution_ids(institution_id))
+    return [s for s in SUBMISSIONS if s.get("institution_id") in visible]
 
 
 @app.get("/institutions/{institution_id}/overview")
@@ -398,7 +1083,8 @@ def institution_overview(
     authorization: Optional[str] = Header(default=None),
 ) -> Dict[str, Any]:
     _require_auth(authorization)
-    rows = [s for s in SUBMISSIONS if s.get("institution_id") in {institution_id, "inst_demo", "demo"}]
+    visible = set(_visible_institution_ids(institution_id))
+    rows = [s for s in SUBMISSIONS if s.get("institution_id") in visible]
     avg_dss = round(sum(float(r.get("dss", 0)) for r in rows) / len(rows), 1) if rows else 0.0
     pending = sum(1 for r in rows if r.get("status") in {"needs_manual_review", "low_confidence"})
     compliance = max(0, min(100, round(avg_dss - pending * 2, 1)))
@@ -414,32 +1100,66 @@ def institution_overview(
 @app.get("/institutions/{institution_id}/dss-trend")
 def institution_dss_trend(
     institution_id: str,
+    granularity: str = Query(default="year"),
+    start: Optional[str] = Query(default=None, description="ISO date or prefix, inclusive"),
+    end: Optional[str] = Query(default=None, description="ISO date or prefix, inclusive"),
     authorization: Optional[str] = Header(default=None),
 ) -> List[Dict[str, Any]]:
     _require_auth(authorization)
-    return [
-        {"year": "2022", "dss": 62},
-        {"year": "2023", "dss": 68},
-        {"year": "2024", "dss": 71},
-        {"year": "2025", "dss": 74},
-        {"year": "2026", "dss": 79},
-    ]
+    if granularity not in GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"granularity must be one of {sorted(GRANULARITIES)}")
+    return DSS_ROLLUP.trend(_visible_institution_ids(institution_id), granularity, start, end)
 
 
 @app.get("/institutions/rank-list")
-def institutions_rank_list(authorization: Optional[str] = Header(default=None)) -> Dict[str, Any]:
+def institutions_rank_list(
+    authorization: Optional[str] = Header(default=None),
+    offset: int = Query(default=0, ge=0),
+    limit: Optional[int] = Query(default=None, ge=1),
+) -> Dict[str, Any]:
     _require_auth(authorization)
-    csv_rows = _load_rank_list_from_csv()
-    if csv_rows:
+    total, items, source = _rank_list_page(offset, limit)
+    if total:
         return {
-            "count": len(csv_rows),
-            "source": "college_rank_list.csv",
-            "items": csv_rows,
+            "count": total,
+            "source": source,
+            "items": items,
         }
 
     rows = _build_institution_rank_list()
+    end = offset + limit if limit is not None else None
     return {
         "count": len(rows),
         "source": "computed_from_submissions",
-        "items": rows,
+        "items": rows[offset:end],
+    }
+
+
+@app.get("/institutions/search")
+def institutions_search(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=10, ge=1, le=SEARCH_MAX_LIMIT),
+    authorization: Optional[str] = Header(default=None),
+) -> Dict[str, Any]:
+    _require_auth(authorization)
+    entry = _load_rank_list()
+    if entry["search"] is not None and len(entry["search"]):
+        hits = entry["search"].search(q, limit)
+        ids = [doc_id for doc_id, _ in hits]
+        if entry["table"] is not None:
+            rows = _rank_list_table_rows(entry["table"].take(ids))
+        else:
+            rows = [entry["rows"][doc_id] for doc_id in ids]
+        source = entry["source"]
+    else:
+        computed = _build_institution_rank_list()
+        hits = InstitutionSearchIndex(r["institution"] for r in computed).search(q, limit)
+        rows = [computed[doc_id] for doc_id, _ in hits]
+        source = "computed_from_submissions"
+
+    return {
+        "query": q,
+        "count": len(rows),
+        "source": source,
+        "items": [{**row, "score": score} for row, (_, score) in zip(rows, hits)],
     }
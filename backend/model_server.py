@@ -0,0 +1,299 @@
+"""
+Shared model host for backend workers.
+
+Provides:
+- ModelServer: one process holding the embedding model and the risk
+  scorer; concurrent requests from all workers that arrive within
+  `window_ms` are coalesced into a single encode / predict_risk_batch call
+- ModelServerClient: blocking client with a SentenceTransformer-style
+  encode() and predict_risk_batch(), injected by backend/main.py when
+  EDUTRACK_MODEL_SERVER is set
+- parse_address: "unix:/path" or a filesystem path → Unix socket,
+  "host:port" → TCP (used where AF_UNIX is unavailable)
+
+Run it next to the workers:
+    python backend/model_server.py --address /tmp/edutrack-models.sock
+    EDUTRACK_MODEL_SERVER=/tmp/edutrack-models.sock uvicorn main:app --workers 4
+
+Frames are an 8-byte header (JSON length, body length) followed by a
+JSON header and a binary body; embeddings travel as raw float32 bytes.
+Nothing is unpickled, so a TCP listener is only a resource risk, and it
+binds to localhost by default.
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BACKEND_DIR.parent
+for _path in (PROJECT_ROOT, BACKEND_DIR):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+from batching import MicroBatcher  # noqa: E402
+
+logger = logging.getLogger("model_server")
+
+DEFAULT_WINDOW_MS = float(os.getenv("EDUTRACK_MODEL_SERVER_WINDOW_MS", "5"))
+DEFAULT_MAX_BATCH = int(os.getenv("EDUTRACK_MODEL_SERVER_MAX_BATCH", "64"))
+DEFAULT_TCP_ADDRESS = "127.0.0.1:8765"
+CLIENT_TIMEOUT_SECONDS = 30.0
+
+_FRAME = struct.Struct("!II")
+
+Address = Union[str, Tuple[str, int]]
+
+
+def default_address() -> str:
+    if hasattr(socket, "AF_UNIX"):
+        return os.path.join(tempfile.gettempdir(), "edutrack-models.sock")
+    return DEFAULT_TCP_ADDRESS
+
+
+def parse_address(address: str) -> Address:
+    """Unix socket path (str) or (host, port) for TCP."""
+    if address.startswith("unix:"):
+        return address[len("unix:") :]
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and "/" not in address and "\\" not in address:
+        return (host or "127.0.0.1", int(port))
+    return address
+
+
+def _encode_frame(header: Dict[str, Any], body: bytes = b"") -> bytes:
+    head = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    return _FRAME.pack(len(head), len(body)) + head + body
+
+
+class ModelServer:
+    """
+    Hosts `encode_fn(texts) -> float32 array` and `risk_fn(metrics_list)`
+    (defaults: the configured embedding backend and
+    risk_engine.predict_risk_batch, loaded on first use of each).
+    """
+
+    def __init__(
+        self,
+        address: Optional[str] = None,
+        window_ms: float = DEFAULT_WINDOW_MS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        encode_fn: Optional[Callable[[List[str]], np.ndarray]] = None,
+        risk_fn: Optional[Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]] = None,
+    ):
+        self.address = parse_address(address or default_address())
+        self._encode_fn = encode_fn
+        self._risk_fn = risk_fn
+        self._load_lock = threading.Lock()
+        # One MicroBatcher (and model thread) per model: calls never overlap,
+        # batching does the parallel work.
+        self._batchers: Dict[str, MicroBatcher] = {
+            "encode": MicroBatcher(self._encode, max_batch, window_ms, name="encode"),
+            "risk": MicroBatcher(self._risk, max_batch, window_ms, name="risk"),
+        }
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        if self._encode_fn is None:
+            with self._load_lock:
+                if self._encode_fn is None:
+                    self._encode_fn = _load_encoder()
+        return np.asarray(self._encode_fn(texts), dtype=np.float32)
+
+    def _risk(self, metrics_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if self._risk_fn is None:
+            with self._load_lock:
+                if self._risk_fn is None:
+                    from risk_engine import predict_risk_batch
+
+                    self._risk_fn = predict_risk_batch
+        return self._risk_fn(metrics_list)
+
+    async def _handle_request(self, header: Dict[str, Any]) -> bytes:
+        op = header.get("op")
+        if op == "encode":
+            texts = list(header.get("texts") or [])
+            if not texts:
+                return _encode_frame({"ok": True, "shape": [0, 0]})
+            vectors = await asyncio.wrap_future(self._batchers["encode"].enqueue(texts))
+            vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+            return _encode_frame({"ok": True, "shape": list(vectors.shape)}, vectors.tobytes())
+        if op == "risk":
+            metrics = list(header.get("metrics") or [])
+            results = await asyncio.wrap_future(self._batchers["risk"].enqueue(metrics))
+            return _encode_frame({"ok": True, "results": list(results)})
+        if op == "stats":
+            return _encode_frame({"ok": True, "stats": {name: b.stats() for name, b in self._batchers.items()}})
+        if op == "ping":
+            return _encode_frame({"ok": True})
+        return _encode_frame({"ok": False, "error": f"unknown op {op!r}"})
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head_len, body_len = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+                    header = json.loads(await reader.readexactly(head_len))
+                    if body_len:
+                        await reader.readexactly(body_len)
+                except asyncio.IncompleteReadError:
+                    return
+                try:
+                    response = await self._handle_request(header)
+                except Exception as e:
+                    response = _encode_frame({"ok": False, "error": str(e)})
+                writer.write(response)
+                await writer.drain()
+        except (ConnectionError, json.JSONDecodeError) as e:
+            logger.debug("Closing model server connection: %s", e)
+        finally:
+            writer.close()
+
+    async def serve(self, ready: Optional[threading.Event] = None) -> None:
+        if isinstance(self.address, tuple):
+            server = await asyncio.start_server(self._serve_connection, *self.address)
+        else:
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+            server = await asyncio.start_unix_server(self._serve_connection, path=self.address)
+            os.chmod(self.address, 0o600)
+        logger.info("Model server listening on %s", self.address)
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if not isinstance(self.address, tuple) and os.path.exists(self.address):
+                os.unlink(self.address)
+
+
+def _load_encoder() -> Callable[[List[str]], np.ndarray]:
+    fake_embed_ms = os.getenv("EDUTRACK_FAKE_EMBED_MS")
+    if fake_embed_ms is not None:
+        from fake_backends import FakeEmbeddingModel
+
+        model = FakeEmbeddingModel(latency_ms=float(fake_embed_ms))
+    else:
+        from doc_validator.embeddings import load_embedding_backend
+
+        model = load_embedding_backend()
+    return lambda texts: model.encode(texts, convert_to_numpy=True)
+
+
+class ModelServerClient:
+    """
+    Blocking client, safe to share across threads (one connection per
+    thread, reconnected once on failure). Errors surface as exceptions;
+    callers already fall back when encode / predict_risk_batch raise.
+    """
+
+    def __init__(self, address: Optional[str] = None, timeout: float = CLIENT_TIMEOUT_SECONDS):
+        self.address = parse_address(address or default_address())
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self) -> socket.socket:
+        if isinstance(self.address, tuple):
+            sock = socket.create_connection(self.address, timeout=self.timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.address)
+        return sock
+
+    @staticmethod
+    def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+        buf = bytearray(size)
+        view = memoryview(buf)
+        received = 0
+        while received < size:
+            n = sock.recv_into(view[received:])
+            if n == 0:
+                raise ConnectionError("model server closed the connection")
+            received += n
+        return bytes(buf)
+
+    def _round_trip(self, header: Dict[str, Any]) -> Tuple[Dict[str, Any], bytes]:
+        frame = _encode_frame(header)
+        for attempt in range(2):
+            sock = getattr(self._local, "sock", None)
+            try:
+                if sock is None:
+                    sock = self._local.sock = self._connect()
+                sock.sendall(frame)
+                head_len, body_len = _FRAME.unpack(self._recv_exactly(sock, _FRAME.size))
+                response = json.loads(self._recv_exactly(sock, head_len))
+                body = self._recv_exactly(sock, body_len) if body_len else b""
+                break
+            except OSError:
+                self.close()
+                if attempt:
+                    raise
+        if not response.get("ok"):
+            raise RuntimeError(f"model server error: {response.get('error')}")
+        return response, body
+
+    def encode(self, sentences: Union[str, Sequence[str]], convert_to_numpy: bool = True, **_: Any) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        response, body = self._round_trip({"op": "encode", "texts": texts})
+        vectors = np.frombuffer(body, dtype=np.float32).reshape(response["shape"])
+        return vectors[0] if single else vectors
+
+    def predict_risk_batch(self, metrics_list: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        response, _ = self._round_trip({"op": "risk", "metrics": list(metrics_list)})
+        return response["results"]
+
+    def stats(self) -> Dict[str, Any]:
+        return self._round_trip({"op": "stats"})[0]["stats"]
+
+    def ping(self) -> bool:
+        try:
+            self._round_trip({"op": "ping"})
+            return True
+        except Exception:
+            return False
+
+    def close(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        self._local.sock = None
+        if sock is not None:
+            sock.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Host the embedding model and risk scorer for backend workers.")
+    parser.add_argument("--address", default=os.getenv("EDUTRACK_MODEL_SERVER") or default_address())
+    parser.add_argument("--window-ms", type=float, default=DEFAULT_WINDOW_MS, help="how long to gather a batch")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="items per model call")
+    parser.add_argument("--preload", action="store_true", help="load both models before accepting requests")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    server = ModelServer(args.address, window_ms=args.window_ms, max_batch=args.max_batch)
+    if args.preload:
+        start = time.perf_counter()
+        server._encode(["warm-up"])
+        server._risk([])
+        logger.info("Models loaded in %.1fs", time.perf_counter() - start)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+In-memory full-text and fuzzy search over institution names.
+
+Provides:
+- InstitutionSearchIndex: token → posting list inverted index, plus a
+  trigram index over the token vocabulary for typo-tolerant matching
+- tokenize / trigrams helpers
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+import heapq
+import math
+import re
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+PREFIX_SIMILARITY = 0.9
+MIN_FUZZY_SIMILARITY = 0.45
+MAX_FUZZY_EXPANSIONS = 8
+PHRASE_BONUS = 1.0
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def trigrams(token: str) -> Set[str]:
+    # Padded like pg_trgm so short tokens and word starts still produce grams.
+    padded = f"  {token} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class InstitutionSearchIndex:
+    """
+    Ranks names for a free-text query. Each query token is matched
+    against the vocabulary exactly, by prefix (for type-ahead) and by
+    trigram similarity (for typos). A name's score is the sum over query
+    tokens of the best matching token's idf times its similarity; names
+    matching more query tokens always rank first, and a name that starts
+    with the query phrase gets PHRASE_BONUS.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names: List[str] = [str(n or "").strip() for n in names]
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for doc_id, name in enumerate(self.names):
+            for token in dict.fromkeys(tokenize(name)):
+                postings[token].append(doc_id)
+
+        self._postings: Dict[str, np.ndarray] = {t: np.asarray(p, dtype=np.int32) for t, p in postings.items()}
+        self._name_lengths = np.array([len(n) for n in self.names], dtype=np.int32)
+        # Normalized names in sorted order: names starting with a phrase form one bisect range.
+        normalized = [" ".join(tokenize(n)) for n in self.names]
+        self._phrase_order = np.argsort(np.array(normalized, dtype=object), kind="stable").astype(np.int32)
+        self._phrase_keys: List[str] = [normalized[i] for i in self._phrase_order]
+        self._vocab: List[str] = sorted(self._postings)
+        n_docs = max(1, len(self.names))
+        self._idf: Dict[str, float] = {t: math.log(1.0 + n_docs / len(p)) for t, p in self._postings.items()}
+
+        grams: Dict[str, List[int]] = defaultdict(list)
+        self._token_grams: List[int] = []
+        for token_id, token in enumerate(self._vocab):
+            token_grams = trigrams(token)
+            self._token_grams.append(len(token_grams))
+            for gram in token_grams:
+                grams[gram].append(token_id)
+        self._grams: Dict[str, List[int]] = dict(grams)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _expand(self, term: str) -> Dict[str, float]:
+        """Vocabulary tokens matching `term`, with similarity in (0, 1]."""
+        matches: Dict[str, float] = {}
+        if term in self._postings:
+            matches[term] = 1.0
+
+        # Prefix matches: contiguous range of the sorted vocabulary.
+        if len(term) >= 2:
+            pos = bisect_left(self._vocab, term)
+            while pos < len(self._vocab) and self._vocab[pos].startswith(term):
+                token = self._vocab[pos]
+                if token != term:
+                    matches[token] = max(matches.get(token, 0.0), PREFIX_SIMILARITY)
+                pos += 1
+
+        if term in self._postings or len(term) < 3:
+            return matches
+
+        # Dice coefficient over shared trigrams.
+        query_grams = trigrams(term)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for token_id in self._grams.get(gram, ()):
+                shared[token_id] += 1
+        scored = []
+        for token_id, count in shared.items():
+            similarity = 2.0 * count / (len(query_grams) + self._token_grams[token_id])
+            if similarity >= MIN_FUZZY_SIMILARITY:
+                scored.append((similarity, self._vocab[token_id]))
+        for similarity, token in heapq.nlargest(MAX_FUZZY_EXPANSIONS, scored):
+            matches[token] = max(matches.get(token, 0.0), similarity)
+        return matches
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, float]]:
+        """Top `limit` (doc_id, score) pairs, best first."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+
+        n_docs = len(self.names)
+        scores = np.zeros(n_docs, dtype=np.float64)
+        matched = np.zeros(n_docs, dtype=np.int32)
+        best = np.empty(n_docs, dtype=np.float64)
+        for term in terms:
+            expansions = self._expand(term)
+            if not expansions:
+                continue
+            best.fill(0.0)
+            for token, similarity in expansions.items():
+                docs = self._postings[token]
+                best[docs] = np.maximum(best[docs], self._idf[token] * similarity)
+            scores += best
+            matched += best > 0
+
+        phrase = " ".join(tokenize(query))
+        lo = bisect_left(self._phrase_keys, phrase)
+        hi = bisect_left(self._phrase_keys, phrase + "\uffff", lo)
+        if hi > lo:
+            scores[self._phrase_order[lo:hi]] += PHRASE_BONUS
+
+        candidates = np.flatnonzero(matched)
+        if not candidates.size:
+            return []
+        # matched dominates score (a score never reaches 1000).
+        rank_key = matched[candidates] * 1000.0 + scores[candidates]
+        if candidates.size > limit:
+            # Keep everything tied with the limit-th key so tie-breaks stay exact.
+            cutoff = np.partition(rank_key, candidates.size - limit)[candidates.size - limit]
+            keep = rank_key >= cutoff
+            candidates, rank_key = candidates[keep], rank_key[keep]
+        order = np.lexsort((candidates, self._name_lengths[candidates], -rank_key))[:limit]
+        return [(int(doc_id), round(float(scores[doc_id]), 4)) for doc_id in candidates[order]]
@@ -0,0 +1,244 @@
+"""
+Sorted in-memory indexes over reviewer submissions.
+
+Provides:
+- SubmissionIndex: (uploaded_at, id) ordered key lists per status / doc_type,
+  and per DSS point (0-100)
+- encode_cursor / decode_cursor helpers for keyset pagination
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import base64
+import heapq
+import json
+import math
+import re
+import threading
+
+# (uploaded_at, numeric id suffix, id): "SUB-1000" sorts after "SUB-999"
+# on the same day, matching the newest-first order of the submission list.
+SortKey = Tuple[str, int, str]
+
+_ID_NUMBER = re.compile(r"(\d+)$")
+
+
+def _id_number(submission_id: str) -> int:
+    match = _ID_NUMBER.search(submission_id)
+    return int(match.group(1)) if match else -1
+
+
+def _sort_key(item: Dict[str, Any]) -> SortKey:
+    submission_id = str(item.get("id") or "")
+    return (str(item.get("uploaded_at") or ""), _id_number(submission_id), submission_id)
+
+
+def _dss(item: Dict[str, Any]) -> float:
+    return float(item.get("dss", 0) or 0)
+
+
+def _dss_bucket(item: Dict[str, Any]) -> int:
+    return int(math.floor(_dss(item)))
+
+
+def encode_cursor(key: SortKey) -> str:
+    raw = json.dumps([key[0], key[2]], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        value = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as exc:
+        raise ValueError("Malformed cursor") from exc
+    if not isinstance(value, list) or len(value) != 2:
+        raise ValueError("Malformed cursor")
+    return (str(value[0]), _id_number(str(value[1])), str(value[1]))
+
+
+def _walk(keys: List[SortKey], after: Optional[SortKey], descending: bool) -> Iterator[SortKey]:
+    # Keyset seek: O(log n) to the first key past the cursor, then sequential.
+    if descending:
+        pos = len(keys) if after is None else bisect_left(keys, after)
+        for i in range(pos - 1, -1, -1):
+            yield keys[i]
+    else:
+        pos = 0 if after is None else bisect_right(keys, after)
+        for i in range(pos, len(keys)):
+            yield keys[i]
+
+
+class SubmissionIndex:
+    """
+    Keeps every submission reachable by id and ordered by (uploaded_at, id),
+    both globally and per status / doc_type, so a filtered page costs
+    O(log n + page size) instead of a scan of the whole queue.
+
+    Each whole DSS point has its own key list too. When a DSS range holds
+    fewer items than the matching status / doc_type lists, its (at most
+    101) lists are merged from the cursor instead, so a selective score
+    filter also costs O(log n + page size) per page.
+    """
+
+    def __init__(self, items: Iterable[Dict[str, Any]] = ()):
+        self._lock = threading.Lock()
+        self._items: Dict[str, Dict[str, Any]] = {}
+        self._keys: Dict[str, SortKey] = {}
+        self._all: List[SortKey] = []
+        self._by_status: Dict[str, List[SortKey]] = {}
+        self._by_doc_type: Dict[str, List[SortKey]] = {}
+        self._by_dss: Dict[int, List[SortKey]] = {}
+        self._dss_sum = 0.0
+        self._bulk_load(items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, submission_id: str) -> Optional[Dict[str, Any]]:
+        return self._items.get(submission_id)
+
+    def add(self, item: Dict[str, Any]) -> None:
+        submission_id = str(item.get("id") or "")
+        with self._lock:
+            if submission_id in self._items:
+                self._remove_locked(submission_id)
+            key = _sort_key(item)
+            self._items[submission_id] = item
+            self._keys[submission_id] = key
+            insort(self._all, key)
+            insort(self._by_status.setdefault(str(item.get("status")), []), key)
+            insort(self._by_doc_type.setdefault(str(item.get("doc_type")), []), key)
+            insort(self._by_dss.setdefault(_dss_bucket(item), []), key)
+            self._dss_sum += _dss(item)
+
+    def update_status(self, submission_id: str, old_status: Optional[str]) -> None:
+        """Re-file an item after its "status" field was changed in place."""
+        with self._lock:
+            item = self._items.get(submission_id)
+            if item is None:
+                return
+            new_status = str(item.get("status"))
+            if str(old_status) == new_status:
+                return
+            key = self._keys[submission_id]
+            self._discard(self._by_status, str(old_status), key)
+            insort(self._by_status.setdefault(new_status, []), key)
+
+    def status_counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {status: len(keys) for status, keys in self._by_status.items() if keys}
+
+    def avg_dss(self) -> float:
+        with self._lock:
+            return round(self._dss_sum / len(self._items), 2) if self._items else 0.0
+
+    def query(
+        self,
+        statuses: Optional[Sequence[str]] = None,
+        doc_types: Optional[Sequence[str]] = None,
+        min_dss: Optional[float] = None,
+        max_dss: Optional[float] = None,
+        descending: bool = True,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        after = decode_cursor(cursor) if cursor else None
+
+        with self._lock:
+            status_lists = [self._by_status.get(s, []) for s in statuses] if statuses else None
+            doc_lists = [self._by_doc_type.get(d, []) for d in doc_types] if doc_types else None
+
+            # Drive the scan from the most selective index; the others become
+            # cheap residual checks on the candidate item.
+            drivers: List[List[SortKey]] = [self._all]
+            if status_lists is not None and doc_lists is not None:
+                status_size = sum(len(k) for k in status_lists)
+                doc_size = sum(len(k) for k in doc_lists)
+                drivers = status_lists if status_size <= doc_size else doc_lists
+            elif status_lists is not None:
+                drivers = status_lists
+            elif doc_lists is not None:
+                drivers = doc_lists
+
+            if min_dss is not None or max_dss is not None:
+                # Edge buckets may hold scores just outside the range; the
+                # residual check below drops them.
+                dss_lists = [
+                    keys
+                    for bucket, keys in self._by_dss.items()
+                    if (min_dss is None or bucket >= int(min_dss)) and (max_dss is None or bucket <= max_dss) and keys
+                ]
+                if sum(len(keys) for keys in dss_lists) < sum(len(keys) for keys in drivers):
+                    drivers = dss_lists
+
+            walkers = [_walk(keys, after, descending) for keys in drivers]
+            if not walkers:
+                candidates: Iterable[SortKey] = iter(())
+            elif len(walkers) == 1:
+                candidates = walkers[0]
+            else:
+                candidates = heapq.merge(*walkers, reverse=descending)
+
+            status_set = set(statuses) if statuses else None
+            doc_set = set(doc_types) if doc_types else None
+
+            page: List[Dict[str, Any]] = []
+            last_key: Optional[SortKey] = None
+            has_more = False
+            for key in candidates:
+                item = self._items[key[2]]
+                if status_set is not None and str(item.get("status")) not in status_set:
+                    continue
+                if doc_set is not None and str(item.get("doc_type")) not in doc_set:
+                    continue
+                dss = _dss(item)
+                if min_dss is not None and dss < min_dss:
+                    continue
+                if max_dss is not None and dss > max_dss:
+                    continue
+                if len(page) >= limit:
+                    has_more = True
+                    break
+                page.append(item)
+                last_key = key
+
+        return {
+            "items": page,
+            "next_cursor": encode_cursor(last_key) if has_more and last_key else None,
+        }
+
+    def _bulk_load(self, items: Iterable[Dict[str, Any]]) -> None:
+        # Sort once instead of paying an insort memmove per item.
+        for item in items:
+            submission_id = str(item.get("id") or "")
+            key = _sort_key(item)
+            self._items[submission_id] = item
+            self._keys[submission_id] = key
+            self._dss_sum += _dss(item)
+        for submission_id, key in self._keys.items():
+            item = self._items[submission_id]
+            self._all.append(key)
+            self._by_dss.setdefault(_dss_bucket(item), []).append(key)
+            self._by_status.setdefault(str(item.get("status")), []).append(key)
+            self._by_doc_type.setdefault(str(item.get("doc_type")), []).append(key)
+        for keys in [self._all, *self._by_status.values(), *self._by_doc_type.values(), *self._by_dss.values()]:
+            keys.sort()
+
+    def _remove_locked(self, submission_id: str) -> None:
+        item = self._items.pop(submission_id)
+        key = self._keys.pop(submission_id)
+        self._discard({"": self._all}, "", key)
+        self._discard(self._by_status, str(item.get("status")), key)
+        self._discard(self._by_doc_type, str(item.get("doc_type")), key)
+        self._discard(self._by_dss, _dss_bucket(item), key)
+        self._dss_sum -= _dss(item)
+
+    @staticmethod
+    def _discard(index: Dict[Any, List[SortKey]], bucket: Any, key: SortKey) -> None:
+        keys = index.get(bucket)
+        if not keys:
+            return
+        pos = bisect_left(keys, key)
+        if pos < len(keys) and keys[pos] == key:
+            del keys[pos]
@@ -0,0 +1,142 @@
+"""
+Parity check and benchmark: embedding backends for semantic similarity.
+
+Each backend in doc_validator/embeddings.py runs in its own subprocess
+(so peak RSS is per backend) and embeds the same seeded synthetic
+documents and per-doc-type templates, one document per encode() call as
+DocumentValidator does. Against the reference backend it reports the
+largest and mean |difference| in document/template cosine similarity and
+how often the best-matching template changes, plus model load time,
+docs/sec and peak RSS. Exits non-zero when a candidate exceeds
+--tolerance; backends whose packages are missing are skipped.
+
+Usage (from the repo root):
+    python -m benchmarks.check_embedding_parity
+    python -m benchmarks.check_embedding_parity --backends sentence-transformers onnx --max-seq 128
+    EDUTRACK_ONNX_MODEL_DIR=/models/minilm python -m benchmarks.check_embedding_parity --docs 500
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+import numpy as np  # noqa: E402
+
+from benchmarks import synthetic  # noqa: E402
+from doc_validator import embeddings  # noqa: E402
+
+REFERENCE = "sentence-transformers"
+
+
+def _corpus(docs: int, seed: int) -> Tuple[List[str], List[str]]:
+    rng = random.Random(seed)
+    templates = [" ".join(phrases) for phrases in synthetic._DOC_PHRASES.values()]
+    doc_types = synthetic.DOC_TYPES
+    documents = [
+        synthetic.make_document_text(doc_types[i % len(doc_types)], rng, n_words=rng.randint(80, 400))
+        for i in range(docs)
+    ]
+    return documents, templates
+
+
+def _worker(backend: str, out: str, docs: int, seed: int, max_seq: Optional[int]) -> None:
+    documents, templates = _corpus(docs, seed)
+    start = time.perf_counter()
+    model = embeddings.load_embedding_backend(backend, max_seq_length=max_seq)
+    load_s = time.perf_counter() - start
+
+    template_vectors = model.encode(templates, convert_to_numpy=True)
+    model.encode([documents[0]], convert_to_numpy=True)  # warm-up
+    start = time.perf_counter()
+    doc_vectors = np.vstack([model.encode([text], convert_to_numpy=True) for text in documents])
+    encode_s = time.perf_counter() - start
+
+    np.savez(out, documents=doc_vectors, templates=template_vectors)
+    stats = {
+        "load_s": round(load_s, 3),
+        "docs_per_s": round(len(documents) / encode_s, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+    Path(out).with_suffix(".json").write_text(json.dumps(stats))
+
+
+def _run_backend(backend: str, workdir: Path, args: argparse.Namespace) -> Optional[Dict[str, Any]]:
+    if not embeddings.backend_available(backend):
+        print(f"[embeddings] {backend}: SKIP (packages not installed)")
+        return None
+    out = workdir / f"{backend}.npz"
+    cmd = [sys.executable, "-m", "benchmarks.check_embedding_parity", "--worker", backend, "--out", str(out)]
+    cmd += ["--docs", str(args.docs), "--seed", str(args.seed)]
+    if args.max_seq:
+        cmd += ["--max-seq", str(args.max_seq)]
+    proc = subprocess.run(cmd, cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        last_line = (proc.stderr.strip().splitlines() or ["no output"])[-1]
+        print(f"[embeddings] {backend}: SKIP (failed to run: {last_line})")
+        return None
+    vectors = np.load(out)
+    stats = json.loads(out.with_suffix(".json").read_text())
+    # Backends return unit vectors, so the dot product is the cosine similarity.
+    stats["similarity"] = vectors["documents"] @ vectors["templates"].T
+    return stats
+
+
+def check(args: argparse.Namespace) -> bool:
+    ok = True
+    with tempfile.TemporaryDirectory(prefix="edutrack-embeddings-") as tmp:
+        results = {name: _run_backend(name, Path(tmp), args) for name in [args.reference] + args.backends}
+    reference = results.pop(args.reference)
+    for name, stats in [(args.reference, reference)] + list(results.items()):
+        if stats is not None:
+            print(
+                f"[embeddings] {name}: load={stats['load_s']}s {stats['docs_per_s']} docs/s "
+                f"peak_rss={stats['peak_rss_mb']} MB"
+            )
+    if reference is None:
+        print(f"[parity] reference backend {args.reference} unavailable; nothing to compare")
+        return True
+
+    for name, stats in results.items():
+        if name == args.reference or stats is None:
+            continue
+        diff = np.abs(stats["similarity"] - reference["similarity"])
+        changed = float((stats["similarity"].argmax(axis=1) != reference["similarity"].argmax(axis=1)).mean())
+        passed = float(diff.max()) <= args.tolerance
+        ok &= passed
+        print(
+            f"[parity] {name} vs {args.reference}: max|diff|={diff.max():.4f} mean|diff|={diff.mean():.4f} "
+            f"best_template_changed={changed:.1%} {'OK' if passed else 'FAIL'}"
+        )
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reference", default=REFERENCE)
+    parser.add_argument("--backends", nargs="+", default=[b for b in embeddings.EMBEDDING_BACKENDS if b != REFERENCE])
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--max-seq", type=int, help="tokens per document (default EDUTRACK_EMBEDDING_MAX_SEQ)")
+    parser.add_argument("--tolerance", type=float, default=0.02, help="largest allowed cosine similarity difference")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.worker:
+        _worker(args.worker, args.out, args.docs, args.seed, args.max_seq)
+        return 0
+    return 0 if check(args) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
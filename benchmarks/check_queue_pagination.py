@@ -0,0 +1,116 @@
+"""
+Pagination check: SubmissionIndex.query vs a brute-force filter and sort.
+
+Builds a seeded queue (bulk load, then live adds and status changes),
+pages through it with next_cursor under status / doc_type / DSS filters
+in both orders, and asserts every walk returns exactly the brute-force
+result. Then times a page of a selective DSS-only filter against a full
+page so a per-page cost that grows with the range shows up. Exits
+non-zero on mismatch.
+
+Usage (from the repo root):
+    python -m benchmarks.check_queue_pagination
+    python -m benchmarks.check_queue_pagination --items 100000 --queries 100
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import argparse
+import random
+import sys
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+for _path in (PROJECT_ROOT, PROJECT_ROOT / "backend"):
+    if str(_path) not in sys.path:
+        sys.path.append(str(_path))
+
+from benchmarks import synthetic  # noqa: E402
+from submission_index import SubmissionIndex  # noqa: E402
+
+
+def _expected(items: List[Dict[str, Any]], query: Dict[str, Any]) -> List[str]:
+    statuses, doc_types = query["statuses"], query["doc_types"]
+    min_dss, max_dss = query["min_dss"], query["max_dss"]
+    rows = [
+        item
+        for item in items
+        if (not statuses or item["status"] in statuses)
+        and (not doc_types or item["doc_type"] in doc_types)
+        and (min_dss is None or item["dss"] >= min_dss)
+        and (max_dss is None or item["dss"] <= max_dss)
+    ]
+    rows.sort(key=lambda item: (item["uploaded_at"], int(item["id"].split("-")[1])), reverse=query["descending"])
+    return [item["id"] for item in rows]
+
+
+def _walk(index: SubmissionIndex, query: Dict[str, Any], limit: int) -> List[str]:
+    ids: List[str] = []
+    cursor = None
+    while True:
+        page = index.query(limit=limit, cursor=cursor, **query)
+        ids.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return ids
+
+
+def _page_ms(index: SubmissionIndex, query: Dict[str, Any], repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        index.query(limit=50, **query)
+    return (time.perf_counter() - start) * 1000.0 / repeat
+
+
+def check(n_items: int, n_queries: int, seed: int) -> bool:
+    rng = random.Random(seed)
+    # Ids cross a digit boundary (SUB-95 .. SUB-1xxx) on shared upload days.
+    items = synthetic.make_submissions(n_items, seed=seed, id_offset=95)
+    for item in items:
+        item["uploaded_at"] = f"2026-01-{rng.randint(1, 3):02d}"
+    loaded = n_items // 2
+    index = SubmissionIndex(items[:loaded])
+    for item in items[loaded:]:
+        index.add(item)
+    for item in rng.sample(items, n_items // 20):
+        old_status = item["status"]
+        item["status"] = rng.choice(synthetic.STATUSES)
+        index.update_status(item["id"], old_status)
+
+    ok = True
+    for _ in range(n_queries):
+        min_dss = rng.choice([None, 20, 55, 99])
+        query = {
+            "statuses": rng.choice([None, [synthetic.STATUSES[0]], synthetic.STATUSES[:2]]),
+            "doc_types": rng.choice([None, [synthetic.DOC_TYPES[0]]]),
+            "min_dss": min_dss,
+            "max_dss": rng.choice([None, 25, 60, 100] if min_dss is None else [None, min_dss, min_dss + 5]),
+            "descending": rng.random() < 0.5,
+        }
+        got = _walk(index, query, limit=rng.choice([1, 7, 50]))
+        if got != _expected(items, query):
+            ok = False
+            print(f"[pagination] FAIL {query}")
+    print(f"[pagination] {n_queries} cursor walks over {n_items} items: {'OK' if ok else 'FAIL'}")
+
+    narrow = {"min_dss": 99, "max_dss": 99}
+    wide = {"min_dss": 20, "max_dss": 100}
+    narrow_ms, wide_ms, unfiltered_ms = _page_ms(index, narrow), _page_ms(index, wide), _page_ms(index, {})
+    print(
+        f"[pagination] page of 50: dss 99-99 {narrow_ms:.3f}ms, dss 20-100 {wide_ms:.3f}ms, "
+        f"unfiltered {unfiltered_ms:.3f}ms"
+    )
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args(argv)
+    return 0 if check(args.items, args.queries, args.seed) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Parity check: CompactRiskModel vs sklearn IsolationForest.
+
+Trains on seeded synthetic data (full and subsampled forests), exports
+the compact artifact and asserts decision_function agrees to 1e-9 and
+labels agree exactly. Exits non-zero on mismatch.
+
+Usage (from the repo root):
+    python -m benchmarks.check_risk_parity
+    python -m benchmarks.check_risk_parity --rows 20000 --tolerance 1e-12
+"""
+
+from pathlib import Path
+from typing import List, Optional
+import argparse
+import sys
+import tempfile
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+import joblib  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import risk_engine  # noqa: E402
+from benchmarks import synthetic  # noqa: E402
+
+CONFIGS = [
+    {"n_estimators": 200, "max_samples": "auto"},
+    {"n_estimators": 50, "max_samples": 0.5},
+]
+
+
+def check(rows: int, tolerance: float, seed: int) -> bool:
+    ok = True
+    with tempfile.TemporaryDirectory(prefix="edutrack-parity-") as tmp:
+        workdir = Path(tmp)
+        risk_engine.MODEL_PATH = str(workdir / "risk_model.pkl")
+        risk_engine.SCALER_PATH = str(workdir / "scaler.pkl")
+        risk_engine.COMPACT_MODEL_PATH = str(workdir / "risk_model.npz")
+
+        csv_path = workdir / "college_data.csv"
+        synthetic.make_college_dataset(rows, seed=seed).to_csv(csv_path, index=False)
+        # Score unseen rows too, including outliers well beyond the training range.
+        holdout = synthetic.make_college_dataset(rows // 4, seed=seed + 1, anomaly_rate=0.3)
+        holdout.loc[::50, "Total_Faculty"] = 1
+
+        for config in CONFIGS:
+            risk_engine.train_model(str(csv_path), **config)
+            model = joblib.load(risk_engine.MODEL_PATH)
+            scaler = joblib.load(risk_engine.SCALER_PATH)
+            compact = risk_engine.CompactRiskModel.load()
+
+            for name, frame in (("train", pd.read_csv(csv_path)), ("holdout", holdout)):
+                X = risk_engine._derive_features(frame)
+                X_scaled = scaler.transform(X)
+                expected = model.decision_function(X_scaled)
+                expected_labels = model.predict(X_scaled)
+                decision, labels = compact.score(X.to_numpy(dtype=np.float64))
+
+                max_diff = float(np.abs(decision - expected).max())
+                mismatched = int((labels != expected_labels).sum())
+                passed = max_diff <= tolerance and mismatched == 0
+                ok &= passed
+                print(
+                    f"[parity] {config} {name}: rows={len(X)} max|diff|={max_diff:.3e} "
+                    f"label_mismatches={mismatched} {'OK' if passed else 'FAIL'}"
+                )
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--tolerance", type=float, default=1e-9)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args(argv)
+    return 0 if check(args.rows, args.tolerance, args.seed) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
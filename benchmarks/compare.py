@@ -0,0 +1,73 @@
+"""
+Diff two benchmark result files written by run_benchmarks.py.
+
+Usage:
+    python -m benchmarks.compare benchmarks/results/<old>.json benchmarks/results/<new>.json
+    python -m benchmarks.compare old.json new.json --threshold 0.15
+
+Exits non-zero when any shared case slowed down by more than the threshold.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import argparse
+import json
+import sys
+
+
+def _cases(results: Dict[str, Any]) -> Iterator[Tuple[str, float]]:
+    for bench, by_scale in results.items():
+        if not isinstance(by_scale, dict) or "skipped" in by_scale:
+            continue
+        for scale, cases in by_scale.items():
+            for case, timing in cases.items():
+                median = timing.get("median_s") if isinstance(timing, dict) else None
+                if isinstance(median, (int, float)):
+                    yield f"{bench}/{scale}/{case}", float(median)
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float) -> Tuple[List[str], List[str]]:
+    before = dict(_cases(old.get("results", {})))
+    after = dict(_cases(new.get("results", {})))
+
+    lines = [f"{'case':<48} {'old (s)':>11} {'new (s)':>11} {'change':>9}"]
+    regressions: List[str] = []
+    for key in sorted(before.keys() & after.keys()):
+        old_s, new_s = before[key], after[key]
+        change = (new_s - old_s) / old_s if old_s > 0 else 0.0
+        marker = ""
+        if change > threshold:
+            marker = "  REGRESSION"
+            regressions.append(key)
+        elif change < -threshold:
+            marker = "  faster"
+        lines.append(f"{key:<48} {old_s:>11.6f} {new_s:>11.6f} {change:>+8.1%}{marker}")
+
+    for key in sorted(before.keys() - after.keys()):
+        lines.append(f"{key:<48} only in old")
+    for key in sorted(after.keys() - before.keys()):
+        lines.append(f"{key:<48} only in new")
+    return lines, regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    old = json.loads(Path(args.old).read_text(encoding="utf-8"))
+    new = json.loads(Path(args.new).read_text(encoding="utf-8"))
+    print(f"old: {old.get('revision', {}).get('commit')}  new: {new.get('revision', {}).get('commit')}")
+
+    lines, regressions = compare(old, new, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
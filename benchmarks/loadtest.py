@@ -0,0 +1,339 @@
+"""
+Closed-loop load test for the FastAPI backend.
+
+Starts backend/main.py under uvicorn with deterministic fake OCR and
+embedding backends (or targets --url), then drives a weighted mix of
+login, reviewer-queue, rank-list and upload-analyze requests at
+increasing concurrency. Reports throughput and p50/p95/p99 latency per
+level and the concurrency at which throughput stops scaling.
+
+Usage (from the repo root):
+    python -m benchmarks.loadtest
+    python -m benchmarks.loadtest --concurrency 1 4 16 64 --duration 15 --ocr-ms 400 --workers 2
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --mix queue=1 rank_list=1
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = PROJECT_ROOT / "backend"
+
+DEFAULT_MIX = {"login": 1, "queue": 5, "rank_list": 3, "upload": 1}
+DEFAULT_CONCURRENCY = [1, 2, 4, 8, 16, 32, 64]
+REVIEWER = {"email": "reviewer.ramesh@aicte-review.test", "password": "test123"}
+
+# Throughput gain below this between levels, with p95 growing, marks saturation.
+SATURATION_GAIN = 0.10
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile.
+    idx = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[idx]
+
+
+def _summary(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "p50_ms": round(_percentile(ordered, 50) * 1000.0, 2),
+        "p95_ms": round(_percentile(ordered, 95) * 1000.0, 2),
+        "p99_ms": round(_percentile(ordered, 99) * 1000.0, 2),
+        "max_ms": round((ordered[-1] if ordered else 0.0) * 1000.0, 2),
+    }
+
+
+def _multipart(field: str, filename: str, content: bytes, content_type: str) -> Tuple[bytes, str]:
+    boundary = f"edutrack{random.getrandbits(64):016x}"
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode("utf-8")
+    tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+    return head + content + tail, f"multipart/form-data; boundary={boundary}"
+
+
+class _Client:
+    """One keep-alive connection per simulated reviewer."""
+
+    def __init__(self, base_url: str, timeout: float):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.token: Optional[str] = None
+        self._conn: Optional[http.client.HTTPConnection] = None
+
+    def request(self, method: str, path: str, body: Optional[bytes] = None, headers: Optional[Dict[str, str]] = None):
+        headers = dict(headers or {})
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        for attempt in (0, 1):
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self._conn.request(method, path, body=body, headers=headers)
+                resp = self._conn.getresponse()
+                data = resp.read()
+                return resp.status, data
+            except (http.client.HTTPException, OSError):
+                self._conn.close()
+                self._conn = None
+                if attempt:
+                    raise
+        raise RuntimeError("unreachable")
+
+    def login(self) -> int:
+        body = json.dumps(REVIEWER).encode("utf-8")
+        status, data = self.request("POST", "/auth/login", body, {"Content-Type": "application/json"})
+        if status == 200:
+            self.token = json.loads(data)["token"]
+        return status
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+
+
+def _operations(upload_bytes: int) -> Dict[str, Callable[[_Client, random.Random], int]]:
+    def op_login(client: _Client, rng: random.Random) -> int:
+        return client.login()
+
+    def op_queue(client: _Client, rng: random.Random) -> int:
+        status = rng.choice(["needs_manual_review", "low_confidence", "parsed"])
+        return client.request("GET", f"/reviewer/queue?limit=50&status={status}")[0]
+
+    def op_rank_list(client: _Client, rng: random.Random) -> int:
+        return client.request("GET", "/institutions/rank-list")[0]
+
+    def op_upload(client: _Client, rng: random.Random) -> int:
+        # Random bytes so uploads are never byte-identical.
+        content = rng.randbytes(upload_bytes)
+        body, content_type = _multipart("file", "document.png", content, "image/png")
+        return client.request("POST", "/upload-analyze", body, {"Content-Type": content_type})[0]
+
+    return {"login": op_login, "queue": op_queue, "rank_list": op_rank_list, "upload": op_upload}
+
+
+def run_level(
+    base_url: str,
+    concurrency: int,
+    duration: float,
+    mix: Dict[str, float],
+    upload_bytes: int,
+    timeout: float,
+) -> Dict[str, Any]:
+    ops = _operations(upload_bytes)
+    names = [n for n in mix if mix[n] > 0]
+    weights = [mix[n] for n in names]
+
+    lock = threading.Lock()
+    latencies: Dict[str, List[float]] = {n: [] for n in names}
+    errors: Dict[str, int] = {n: 0 for n in names}
+    ready = threading.Barrier(concurrency + 1)
+    go = threading.Event()
+    deadline = [0.0]
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        client = _Client(base_url, timeout)
+        local: Dict[str, List[float]] = {n: [] for n in names}
+        local_errors: Dict[str, int] = {n: 0 for n in names}
+        try:
+            client.login()
+        finally:
+            ready.wait()
+        go.wait()
+        try:
+            while time.perf_counter() < deadline[0]:
+                name = rng.choices(names, weights)[0]
+                started = time.perf_counter()
+                try:
+                    status = ops[name](client, rng)
+                except Exception:
+                    status = 0
+                elapsed = time.perf_counter() - started
+                if 200 <= status < 300:
+                    local[name].append(elapsed)
+                else:
+                    local_errors[name] += 1
+                    if status == 401:
+                        client.login()
+        finally:
+            client.close()
+            with lock:
+                for n in names:
+                    latencies[n].extend(local[n])
+                    errors[n] += local_errors[n]
+
+    threads = [threading.Thread(target=worker, args=(1000 + i,), daemon=True) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    ready.wait()
+    started = time.perf_counter()
+    deadline[0] = started + duration
+    go.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    all_latencies = [v for n in names for v in latencies[n]]
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 2),
+        "requests": len(all_latencies),
+        "errors": sum(errors.values()),
+        "throughput_rps": round(len(all_latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        **_summary(all_latencies),
+        "by_operation": {n: {**_summary(latencies[n]), "errors": errors[n]} for n in names},
+    }
+
+
+def find_saturation(levels: List[Dict[str, Any]]) -> Optional[int]:
+    """First concurrency whose throughput gain over the previous level is below SATURATION_GAIN."""
+    for prev, cur in zip(levels, levels[1:]):
+        if prev["throughput_rps"] <= 0:
+            continue
+        gain = (cur["throughput_rps"] - prev["throughput_rps"]) / prev["throughput_rps"]
+        if gain < SATURATION_GAIN and cur["p95_ms"] > prev["p95_ms"]:
+            return prev["concurrency"]
+    return None
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(args: argparse.Namespace, templates_dir: str) -> Tuple[subprocess.Popen, str]:
+    port = args.port or _free_port()
+    env = dict(os.environ)
+    env.update(
+        {
+            "EDUTRACK_FAKE_OCR_MS": str(args.ocr_ms),
+            "EDUTRACK_FAKE_EMBED_MS": str(args.embed_ms),
+            "EDUTRACK_TEMPLATES_DIR": templates_dir,
+            "EDUTRACK_TOKEN_SECRET": env.get("EDUTRACK_TOKEN_SECRET", "loadtest-secret"),
+        }
+    )
+    cmd = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(args.workers), "--log-level", "warning",
+    ]
+    proc = subprocess.Popen(cmd, cwd=str(BACKEND_DIR), env=env)
+    base_url = f"http://127.0.0.1:{port}"
+
+    deadline = time.time() + args.startup_timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Backend exited during startup with code {proc.returncode}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                conn.close()
+                return proc, base_url
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("Backend did not become healthy in time")
+
+
+def _parse_mix(items: Optional[List[str]]) -> Dict[str, float]:
+    if not items:
+        return dict(DEFAULT_MIX)
+    mix: Dict[str, float] = {}
+    for item in items:
+        name, _, weight = item.partition("=")
+        if name not in DEFAULT_MIX:
+            raise SystemExit(f"Unknown operation in --mix: {name} (choose from {', '.join(DEFAULT_MIX)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Target an already running backend instead of starting one")
+    parser.add_argument("--port", type=int, help="Port for the spawned backend (default: free port)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level")
+    parser.add_argument("--mix", nargs="+", help="Operation weights, e.g. queue=5 upload=1")
+    parser.add_argument("--ocr-ms", type=float, default=250.0, help="Fake OCR latency per page")
+    parser.add_argument("--embed-ms", type=float, default=40.0, help="Fake embedding latency per encode")
+    parser.add_argument("--upload-bytes", type=int, default=64 * 1024)
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout")
+    parser.add_argument("--startup-timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="Write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    mix = _parse_mix(args.mix)
+    proc: Optional[subprocess.Popen] = None
+    with tempfile.TemporaryDirectory(prefix="edutrack-load-") as templates_dir:
+        # A template for the uploaded doc type, so the fake embedding model is exercised.
+        Path(templates_dir, "uploaded_document.txt").write_text(
+            "Fire safety certificate issued by the municipal fire department.", encoding="utf-8"
+        )
+        try:
+            if args.url:
+                base_url = args.url.rstrip("/")
+            else:
+                proc, base_url = start_server(args, templates_dir)
+
+            levels = []
+            print(f"{'conc':>5} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+            for concurrency in args.concurrency:
+                level = run_level(base_url, concurrency, args.duration, mix, args.upload_bytes, args.timeout)
+                levels.append(level)
+                print(
+                    f"{concurrency:>5} {level['throughput_rps']:>9.1f} {level['p50_ms']:>9.1f} "
+                    f"{level['p95_ms']:>9.1f} {level['p99_ms']:>9.1f} {level['errors']:>7}",
+                    flush=True,
+                )
+        finally:
+            if proc is not None:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+
+    saturation = find_saturation(levels)
+    print(f"\nsaturation concurrency: {saturation if saturation is not None else 'not reached'}")
+
+    if args.output:
+        report = {
+            "target": args.url or "spawned",
+            "workers": args.workers,
+            "mix": mix,
+            "fake_ocr_ms": args.ocr_ms,
+            "fake_embed_ms": args.embed_ms,
+            "levels": levels,
+            "saturation_concurrency": saturation,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
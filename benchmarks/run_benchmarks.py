@@ -0,0 +1,395 @@
+"""
+Reproducible benchmark runner.
+
+Measures OCR, document validation, risk scoring/training, college
+aggregation, token signing and the FastAPI routes at 1x/10x/100x scale
+on seeded synthetic data, and writes one JSON file per run so results
+can be diffed between commits with benchmarks/compare.py.
+
+Usage (from the repo root):
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --scales 1 10 --only predict_from_ocr predict_risk
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import argparse
+import csv
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = PROJECT_ROOT / "backend"
+for _path in (PROJECT_ROOT, BACKEND_DIR):
+    if str(_path) not in sys.path:
+        sys.path.append(str(_path))
+
+from benchmarks import synthetic  # noqa: E402
+
+RESULTS_DIR = PROJECT_ROOT / "benchmarks" / "results"
+DEFAULT_SCALES = [1, 10, 100]
+SEED = 1234
+
+
+class Skip(Exception):
+    """Raised by a benchmark whose optional dependency is unavailable."""
+
+
+def _timed(fn: Callable[[], Any], n_ops: int, repeat: int) -> Dict[str, Any]:
+    durations: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    median = statistics.median(durations)
+    return {
+        "ops": n_ops,
+        "repeat": repeat,
+        "best_s": round(min(durations), 6),
+        "median_s": round(median, 6),
+        "per_op_ms": round(median / n_ops * 1000.0, 4) if n_ops else None,
+        "ops_per_s": round(n_ops / median, 2) if median > 0 else None,
+    }
+
+
+def _retained(build: Callable[[], List[Any]]) -> Dict[str, Any]:
+    """Bytes still allocated after `build` returns, i.e. held by what it returned."""
+    tracemalloc.start()
+    try:
+        kept = build()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    n = len(kept)
+    return {
+        "docs": n,
+        "retained_kb": round(current / 1024.0, 1),
+        "retained_kb_per_doc": round(current / 1024.0 / n, 3) if n else None,
+        "peak_kb": round(peak / 1024.0, 1),
+    }
+
+
+# ----------------------------------
+# Benchmarks: fn(scale, workdir) -> {case: timing}
+# ----------------------------------
+
+
+def bench_run_ocr(scale: int, workdir: Path) -> Dict[str, Any]:
+    try:
+        import PIL  # noqa: F401
+        from doc_validator import ocr_engine
+    except Exception as exc:
+        raise Skip(f"OCR dependencies unavailable: {exc}")
+    tesseract = shutil.which("tesseract")
+    if not tesseract:
+        raise Skip("tesseract binary not on PATH")
+    ocr_engine.pytesseract.pytesseract.tesseract_cmd = tesseract
+
+    rng = random.Random(SEED)
+    paths = []
+    for i in range(scale):
+        text = synthetic.make_document_text("fire_safety_certificate", rng, 120)
+        paths.append(synthetic.render_document_image(text, str(workdir / f"ocr_{i}.png")))
+    return {"image_pages": _timed(lambda: [ocr_engine.run_ocr(p) for p in paths], len(paths), 1)}
+
+
+def bench_predict_from_ocr(scale: int, workdir: Path) -> Dict[str, Any]:
+    from doc_validator.predictor import DocumentValidator
+
+    rng = random.Random(SEED)
+    payloads = [
+        synthetic.make_ocr_payload(synthetic.DOC_TYPES[i % len(synthetic.DOC_TYPES)], rng)
+        for i in range(20 * scale)
+    ]
+    validator = DocumentValidator(use_semantic=False)
+    return {"rules_only": _timed(lambda: [validator.predict_from_dict(p) for p in payloads], len(payloads), 3)}
+
+
+def bench_result_memory(scale: int, workdir: Path) -> Dict[str, Any]:
+    """Memory held per validated document: result dicts vs slotted results vs lean mode."""
+    from doc_validator.predictor import DocumentValidator
+    from doc_validator.results import OcrResult
+
+    rng = random.Random(SEED)
+    # Payloads are decoded inside the measurement, so OCR kept alive by a result counts.
+    encoded = [
+        json.dumps(synthetic.make_ocr_payload(synthetic.DOC_TYPES[i % len(synthetic.DOC_TYPES)], rng))
+        for i in range(50 * scale)
+    ]
+    plain = DocumentValidator(use_semantic=False)
+    debug = DocumentValidator(use_semantic=False, debug=True)
+    lean = DocumentValidator(use_semantic=False, lean=True)
+
+    def typed(validator: Any) -> Callable[[], List[Any]]:
+        return lambda: [validator.validate(OcrResult.from_dict(json.loads(e))) for e in encoded]
+
+    def typed_with_ocr(validator: Any) -> Callable[[], List[Any]]:
+        # Caller keeps the OcrResult too (e.g. for review); lean mode empties its text.
+        def build() -> List[Any]:
+            kept = []
+            for e in encoded:
+                ocr = OcrResult.from_dict(json.loads(e))
+                kept.append((ocr, validator.validate(ocr)))
+            return kept
+
+        return build
+
+    return {
+        "dict_debug": _retained(lambda: [debug.predict_from_dict(json.loads(e)) for e in encoded]),
+        "dict": _retained(lambda: [plain.predict_from_dict(json.loads(e)) for e in encoded]),
+        "typed": _retained(typed(plain)),
+        "typed_with_ocr": _retained(typed_with_ocr(plain)),
+        "typed_lean_with_ocr": _retained(typed_with_ocr(lean)),
+    }
+
+
+def _train_risk_model(n_rows: int, workdir: Path):
+    try:
+        import risk_engine
+    except Exception as exc:
+        raise Skip(f"risk_engine dependencies unavailable: {exc}")
+    csv_path = workdir / f"college_data_{n_rows}.csv"
+    synthetic.make_college_dataset(n_rows, seed=SEED).to_csv(csv_path, index=False)
+    risk_engine.MODEL_PATH = str(workdir / "risk_model.pkl")
+    risk_engine.SCALER_PATH = str(workdir / "scaler.pkl")
+    risk_engine.COMPACT_MODEL_PATH = str(workdir / "risk_model.npz")
+    return risk_engine, csv_path
+
+
+def bench_train_model(scale: int, workdir: Path) -> Dict[str, Any]:
+    risk_engine, csv_path = _train_risk_model(1000 * scale, workdir)
+    return {"fit": _timed(lambda: risk_engine.train_model(str(csv_path)), 1000 * scale, 1)}
+
+
+def bench_predict_risk(scale: int, workdir: Path) -> Dict[str, Any]:
+    risk_engine, csv_path = _train_risk_model(2000, workdir)
+    risk_engine.train_model(str(csv_path))
+    rows = synthetic.make_college_dataset(5 * scale, seed=SEED + 1).to_dict("records")
+    batch = synthetic.make_college_dataset(200 * scale, seed=SEED + 2).to_dict("records")
+
+    def cold(fn: Callable[[], Any]) -> Callable[[], Any]:
+        def run() -> Any:
+            risk_engine.clear_prediction_cache()
+            return fn()
+
+        return run
+
+    return {
+        "single_calls": _timed(cold(lambda: [risk_engine.predict_risk(r) for r in rows]), len(rows), 3),
+        "batch_explained": _timed(cold(lambda: risk_engine.predict_risk_batch(batch)), len(batch), 3),
+        "batch_cached": _timed(lambda: risk_engine.predict_risk_batch(batch), len(batch), 3),
+    }
+
+
+def bench_aggregate_college(scale: int, workdir: Path) -> Dict[str, Any]:
+    from college_aggregator import aggregate_college
+
+    rng = random.Random(SEED)
+    bundles = []
+    for _ in range(1000 * scale):
+        docs = rng.sample(["fire_safety_certificate", "affiliation_letter", "faculty_list"], rng.randint(1, 3))
+        bundles.append({d: {"dss_score": rng.randint(30, 100)} for d in docs})
+    return {"bundles": _timed(lambda: [aggregate_college(b) for b in bundles], len(bundles), 3)}
+
+
+def bench_auth_tokens(scale: int, workdir: Path) -> Dict[str, Any]:
+    from auth_tokens import TokenSigner
+
+    signer = TokenSigner(secret=b"benchmark-secret")
+    n = 1000 * scale
+    tokens = [signer.issue(f"user{i}@edutrack.test", "reviewer") for i in range(n)]
+    return {
+        "issue": _timed(lambda: [signer.issue("user@edutrack.test", "reviewer") for _ in range(n)], n, 3),
+        "verify": _timed(lambda: [signer.verify(t) for t in tokens], n, 3),
+    }
+
+
+def bench_api(scale: int, workdir: Path) -> Dict[str, Any]:
+    try:
+        from fastapi.testclient import TestClient
+    except Exception as exc:
+        raise Skip(f"fastapi TestClient unavailable: {exc}")
+    import main
+    from dss_rollup import DssRollup
+    from submission_index import SubmissionIndex
+
+    submissions = synthetic.make_submissions(1000 * scale, seed=SEED)
+    main.SUBMISSIONS[:] = submissions
+    main.SUBMISSION_INDEX = SubmissionIndex(main.SUBMISSIONS)
+    main.DSS_ROLLUP = DssRollup(main.SUBMISSIONS)
+
+    rank_dir = workdir / f"rank_{scale}"
+    rank_dir.mkdir(exist_ok=True)
+    rank_rows = synthetic.make_rank_list(1000 * scale, seed=SEED)
+    with (rank_dir / "college_rank_list.csv").open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rank_rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rank_rows)
+    main.PROJECT_ROOT = rank_dir
+    main._RANK_LIST_CACHE.update({"key": None, "rows": []})
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    client = TestClient(main.app)
+    token = client.post(
+        "/auth/login", json={"email": "reviewer.ramesh@aicte-review.test", "password": "test123"}
+    ).json()["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    n = 20
+
+    def cold_rank_list() -> None:
+        main._RANK_LIST_CACHE.update({"key": None, "rows": []})
+        client.get("/institutions/rank-list", headers=headers)
+
+    upload = ("doc.png", b"\x89PNG\r\n\x1a\n" + b"0" * 2048, "image/png")
+    cases: Dict[str, Any] = {}
+    if main.columnar_store is not None and main.columnar_store.HAVE_PYARROW:
+        arrow_dir = workdir / f"rank_{scale}_arrow"
+        arrow_dir.mkdir(exist_ok=True)
+        main.columnar_store.convert(
+            rank_dir / "college_rank_list.csv",
+            arrow_dir / "college_rank_list.arrow",
+            types=main.columnar_store.RANK_LIST_TYPES,
+        )
+        main.PROJECT_ROOT = arrow_dir
+        cases["rank_list_cold_arrow"] = _timed(cold_rank_list, 1, 3)
+        cases["rank_list_page_arrow"] = _timed(
+            lambda: [client.get("/institutions/rank-list?limit=50&offset=100", headers=headers) for _ in range(n)],
+            n,
+            3,
+        )
+        main.PROJECT_ROOT = rank_dir
+        main._RANK_LIST_CACHE.update({"key": None, "rows": []})
+
+    return {
+        **cases,
+        "health": _timed(lambda: [client.get("/health") for _ in range(n)], n, 3),
+        "login": _timed(
+            lambda: [
+                client.post("/auth/login", json={"email": "superadmin@edutrack.test", "password": "admin123"})
+                for _ in range(n)
+            ],
+            n,
+            3,
+        ),
+        "reviewer_queue_page": _timed(
+            lambda: [client.get("/reviewer/queue?limit=50&status=needs_manual_review", headers=headers) for _ in range(n)],
+            n,
+            3,
+        ),
+        "rank_list_warm": _timed(lambda: [client.get("/institutions/rank-list", headers=headers) for _ in range(n)], n, 3),
+        "rank_list_cold": _timed(cold_rank_list, 1, 3),
+        "dss_trend_monthly": _timed(
+            lambda: [client.get("/institutions/inst_1/dss-trend?granularity=month", headers=headers) for _ in range(n)],
+            n,
+            3,
+        ),
+        "institution_overview": _timed(
+            lambda: [client.get("/institutions/inst_1/overview", headers=headers) for _ in range(n)], n, 3
+        ),
+        "upload_analyze": _timed(
+            lambda: [client.post("/upload-analyze", files={"file": upload}, headers=headers) for _ in range(n)],
+            n,
+            1,
+        ),
+    }
+
+
+BENCHMARKS: Dict[str, Callable[[int, Path], Dict[str, Any]]] = {
+    "run_ocr": bench_run_ocr,
+    "predict_from_ocr": bench_predict_from_ocr,
+    "result_memory": bench_result_memory,
+    "train_model": bench_train_model,
+    "predict_risk": bench_predict_risk,
+    "aggregate_college": bench_aggregate_college,
+    "auth_tokens": bench_auth_tokens,
+    "api": bench_api,
+}
+
+
+def _git_revision() -> Dict[str, Any]:
+    def _git(*args: str) -> Optional[str]:
+        try:
+            out = subprocess.run(["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+            return out.stdout.strip()
+        except Exception:
+            return None
+
+    return {"commit": _git("rev-parse", "HEAD"), "dirty": bool(_git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def _environment() -> Dict[str, Any]:
+    versions: Dict[str, Optional[str]] = {}
+    for module in ("numpy", "pandas", "sklearn", "fastapi", "pytesseract", "sentence_transformers"):
+        try:
+            versions[module] = getattr(__import__(module), "__version__", "unknown")
+        except Exception:
+            versions[module] = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "packages": versions,
+    }
+
+
+def run(names: List[str], scales: List[int]) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="edutrack-bench-") as tmp:
+        workdir = Path(tmp)
+        for name in names:
+            results[name] = {}
+            for scale in scales:
+                label = f"{scale}x"
+                print(f"[bench] {name} @ {label} ...", flush=True)
+                try:
+                    results[name][label] = BENCHMARKS[name](scale, workdir)
+                except Skip as exc:
+                    results[name] = {"skipped": str(exc)}
+                    print(f"[bench] {name} skipped: {exc}")
+                    break
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Run a subset of benchmarks")
+    parser.add_argument("--output", help="Result path (default: benchmarks/results/<commit>.json)")
+    args = parser.parse_args(argv)
+
+    started = time.time()
+    names = args.only or list(BENCHMARKS)
+    revision = _git_revision()
+    report = {
+        "revision": revision,
+        "environment": _environment(),
+        "seed": SEED,
+        "scales": args.scales,
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(started)),
+        "results": run(names, args.scales),
+    }
+    report["wall_s"] = round(time.time() - started, 2)
+
+    if args.output:
+        output = Path(args.output)
+    else:
+        suffix = "-dirty" if revision["dirty"] else ""
+        output = RESULTS_DIR / f"{(revision['commit'] or 'unknown')[:12]}{suffix}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"[bench] wrote {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Startup benchmark: import cost of the backend and pipeline modules.
+
+Imports each target in a fresh interpreter under `python -X importtime`
+(--repeat times) and reports the median cumulative import time, process
+wall time, the top-level packages that cost the most, and which heavy
+dependencies (pandas, scikit-learn, torch, OCR bindings, ...) were loaded
+just by importing. Exits non-zero when a target's median import time
+exceeds --budget-ms or it pulls in a heavy dependency.
+
+Usage (from the repo root):
+    python -m benchmarks.startup
+    python -m benchmarks.startup --budget-ms 400 --repeat 10 --top 15
+    python -m benchmarks.startup --targets backend:main risk_engine --output startup.json
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# "<dir>:<module>" imports <module> with <dir> as the working directory.
+DEFAULT_TARGETS = ["backend:main", "risk_engine", "doc_validator.predictor"]
+DEFAULT_BUDGET_MS = 750.0
+HEAVY_MODULES = [
+    "pandas",
+    "sklearn",
+    "scipy",
+    "joblib",
+    "torch",
+    "sentence_transformers",
+    "transformers",
+    "onnxruntime",
+    "tokenizers",
+    "pytesseract",
+    "pdf2image",
+    "PIL",
+    "pyarrow",
+]
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """(module, self_us, cumulative_us, depth) for each `-X importtime` line."""
+    entries = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us), len(indent)))
+    return entries
+
+
+def _import_once(target: str) -> Dict[str, Any]:
+    directory, _, module = target.rpartition(":")
+    cwd = PROJECT_ROOT / directory if directory else PROJECT_ROOT
+    # Heavy modules are read from sys.modules: importtime also lists failed imports.
+    code = f"import {module}, sys; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    wall_s = time.perf_counter() - start
+    entries = _parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        last_line = (proc.stderr.strip().splitlines() or ["no output"])[-1]
+        raise RuntimeError(f"import {module} failed: {last_line}")
+
+    cumulative_us = next((cum for name, _, cum, _ in entries if name == module), 0)
+    by_package: Dict[str, int] = {}
+    for name, self_us, _, _ in entries:
+        package = name.partition(".")[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+    heavy = proc.stdout.strip().splitlines()[-1] if proc.stdout.strip() else ""
+    return {
+        "import_ms": cumulative_us / 1000.0,
+        "wall_ms": wall_s * 1000.0,
+        "by_package": by_package,
+        "heavy": [m for m in heavy.split(",") if m],
+    }
+
+
+def measure(target: str, repeat: int, top: int) -> Dict[str, Any]:
+    runs = [_import_once(target) for _ in range(repeat)]
+    packages = {name for run in runs for name in run["by_package"]}
+    package_ms = {
+        name: statistics.median(run["by_package"].get(name, 0) for run in runs) / 1000.0 for name in packages
+    }
+    return {
+        "target": target,
+        "repeat": repeat,
+        "import_ms": round(statistics.median(run["import_ms"] for run in runs), 1),
+        "wall_ms": round(statistics.median(run["wall_ms"] for run in runs), 1),
+        "top_packages": [
+            {"package": name, "self_ms": round(ms, 1)}
+            for name, ms in sorted(package_ms.items(), key=lambda item: -item[1])[:top]
+        ],
+        "heavy_modules": sorted({m for run in runs for m in run["heavy"]}),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", nargs="+", default=DEFAULT_TARGETS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="most expensive top-level packages to list")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="median import time allowed")
+    parser.add_argument("--output", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    ok = True
+    report = []
+    for target in args.targets:
+        try:
+            result = measure(target, args.repeat, args.top)
+        except RuntimeError as e:
+            print(f"[startup] {target}: FAIL ({e})")
+            ok = False
+            continue
+        passed = result["import_ms"] <= args.budget_ms and not result["heavy_modules"]
+        result["budget_ms"] = args.budget_ms
+        result["passed"] = passed
+        ok &= passed
+        report.append(result)
+
+        print(
+            f"[startup] {target}: import={result['import_ms']:.1f}ms wall={result['wall_ms']:.1f}ms "
+            f"budget={args.budget_ms:.0f}ms heavy={','.join(result['heavy_modules']) or '-'} "
+            f"{'OK' if passed else 'FAIL'}"
+        )
+        for entry in result["top_packages"]:
+            print(f"    {entry['self_ms']:8.1f}ms  {entry['package']}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""
+Synthetic, seeded inputs for the benchmark suite.
+
+Provides:
+- make_document_text / make_ocr_payload: OCR JSON shaped like run_ocr output
+- render_document_image / render_document_pdf: rendered pages with known text (needs Pillow)
+- make_college_dataset: rows shaped like college_data.csv (risk model training input)
+- make_rank_list: rows shaped like college_rank_list.csv
+- make_submissions: reviewer-queue items shaped like backend SUBMISSIONS
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+import random
+
+DOC_TYPES = ["fire_safety_certificate", "faculty_list", "affiliation_letter", "financial_statement", "affidavit"]
+
+_DOC_PHRASES = {
+    "fire_safety_certificate": [
+        "Fire Safety Certificate",
+        "issued by the Fire Department",
+        "valid until",
+        "issuing authority",
+        "municipal fire brigade inspection completed",
+    ],
+    "faculty_list": ["Name", "Designation", "Qualification", "Professor", "Assistant Professor", "Ph.D"],
+    "affiliation_letter": ["Affiliation Letter", "University Grants Commission", "is hereby affiliated", "session"],
+    "financial_statement": ["Balance Sheet", "Income", "Profit", "Auditor", "Revenue", "Expenditure"],
+    "affidavit": ["Affidavit", "sworn", "deponent", "signed before notary"],
+}
+
+_FILLER = (
+    "the institution shall comply with all norms prescribed by the council and maintain records "
+    "for inspection by the competent authority during the academic session"
+).split()
+
+_NAME_PARTS = {
+    "prefix": ["Indian Institute of", "National Institute of", "Government College of", "Institute of", "College of"],
+    "field": ["Technology", "Engineering", "Management", "Science", "Pharmacy", "Architecture"],
+    "place": [
+        "Jammu", "Palakkad", "Tirupati", "Bhilai", "Nagpur", "Surat", "Mysuru", "Kota",
+        "Guntur", "Ranchi", "Dehradun", "Salem", "Warangal", "Agartala", "Silchar", "Hamirpur",
+    ],
+}
+
+STATUSES = ["needs_manual_review", "low_confidence", "parsed", "approved", "rejected"]
+
+
+def _date(rng: random.Random) -> str:
+    return f"{rng.randint(2019, 2028)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+
+def make_document_text(doc_type: str, rng: random.Random, n_words: int = 200) -> str:
+    """Text with the doc type's keywords, one ISO date and a signature line."""
+    words: List[str] = []
+    phrases = _DOC_PHRASES.get(doc_type, ["Document"])
+    while len(words) < n_words:
+        if rng.random() < 0.15:
+            words.extend(rng.choice(phrases).split())
+        else:
+            words.append(rng.choice(_FILLER))
+    insert_at = rng.randint(0, len(words))
+    words[insert_at:insert_at] = ["Date:", _date(rng)]
+    words.extend(["Authorised", "Signatory", "Signature"])
+    return " ".join(words)
+
+
+def make_ocr_payload(
+    doc_type: str,
+    rng: random.Random,
+    n_pages: int = 2,
+    words_per_page: int = 200,
+    doc_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    pages = []
+    for page_no in range(1, n_pages + 1):
+        pages.append(
+            {
+                "page_no": page_no,
+                "text": make_document_text(doc_type, rng, words_per_page),
+                "ocr_conf_mean": round(rng.uniform(0.55, 0.98), 3),
+            }
+        )
+    confs = [p["ocr_conf_mean"] for p in pages]
+    return {
+        "doc_id": doc_id or f"{doc_type}_{rng.randrange(10**8)}.pdf",
+        "doc_type": doc_type,
+        "pages": pages,
+        "full_text": "\n\n".join(p["text"] for p in pages),
+        "ocr_conf_mean": round(sum(confs) / len(confs), 3),
+    }
+
+
+def _wrap(text: str, width: int) -> List[str]:
+    lines: List[str] = []
+    current: List[str] = []
+    for word in text.split():
+        if current and len(" ".join(current + [word])) > width:
+            lines.append(" ".join(current))
+            current = []
+        current.append(word)
+    if current:
+        lines.append(" ".join(current))
+    return lines
+
+
+def _render_page(text: str):
+    from PIL import Image, ImageDraw, ImageFont
+
+    image = Image.new("L", (1240, 1754), color=255)  # A4 at 150 dpi
+    draw = ImageDraw.Draw(image)
+    try:
+        font = ImageFont.load_default(size=22)
+    except TypeError:
+        font = ImageFont.load_default()
+    y = 80
+    for line in _wrap(text, 90):
+        draw.text((80, y), line, fill=0, font=font)
+        y += 32
+        if y > 1680:
+            break
+    return image
+
+
+def render_document_image(text: str, path: str) -> str:
+    _render_page(text).save(path)
+    return path
+
+
+def render_document_pdf(page_texts: Sequence[str], path: str) -> str:
+    images = [_render_page(t).convert("RGB") for t in page_texts]
+    images[0].save(path, save_all=True, append_images=images[1:], resolution=150.0)
+    return path
+
+
+def college_name(i: int, rng: random.Random) -> str:
+    return (
+        f"{rng.choice(_NAME_PARTS['prefix'])} {rng.choice(_NAME_PARTS['field'])} "
+        f"{rng.choice(_NAME_PARTS['place'])} {i}"
+    )
+
+
+def make_college_dataset(n_rows: int, seed: int = 42, anomaly_rate: float = 0.08):
+    """DataFrame with the college_data.csv columns train_model() expects."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    name_rng = random.Random(seed)
+
+    students = rng.integers(300, 6000, n_rows)
+    faculty = np.maximum(5, (students / rng.normal(18, 4, n_rows).clip(8, 35)).astype(int))
+    df = pd.DataFrame(
+        {
+            "College_ID": [f"COL_{i:06d}" for i in range(n_rows)],
+            "College Name": [college_name(i, name_rng) for i in range(n_rows)],
+            "Establishment_Year": rng.integers(1950, 2022, n_rows),
+            "Location": rng.choice(["Urban", "Semi-Urban", "Rural"], n_rows),
+            "Total_Students": students,
+            "Total_Faculty": faculty,
+            "Placement_Rate": rng.normal(68, 12, n_rows).clip(5, 100).round(1),
+            "Fund_Utilization": rng.normal(82, 8, n_rows).clip(20, 100).round(1),
+            "Infrastructure_Area": (students * rng.normal(4, 1, n_rows).clip(1, 9)).round(0),
+            "Rating": rng.normal(3.8, 0.5, n_rows).clip(1, 5).round(1),
+            "Fees": rng.integers(40_000, 400_000, n_rows),
+            "Avg_Doc_DSS": rng.normal(80, 9, n_rows).clip(0, 100).round(2),
+            "Missing_Doc_Count": rng.choice([0, 0, 0, 1, 2], n_rows),
+        }
+    )
+
+    n_bad = int(n_rows * anomaly_rate)
+    if n_bad:
+        bad = rng.choice(n_rows, n_bad, replace=False)
+        df.loc[bad, "Total_Faculty"] = np.maximum(2, df.loc[bad, "Total_Students"] // 90)
+        df.loc[bad, "Placement_Rate"] = rng.uniform(5, 30, n_bad).round(1)
+        df.loc[bad, "Avg_Doc_DSS"] = rng.uniform(20, 55, n_bad).round(2)
+        df.loc[bad, "Missing_Doc_Count"] = rng.integers(2, 4, n_bad)
+    return df
+
+
+def make_rank_list(n_rows: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Rows with the college_rank_list.csv header, ranked by Rank_Score."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n_rows):
+        dss = round(rng.uniform(40, 100), 2)
+        risk = round(rng.uniform(20, 95), 2)
+        rows.append(
+            {
+                "College Name": college_name(i, rng),
+                "Avg_Doc_DSS": dss,
+                "Risk_Score": risk,
+                "Rank_Score": round((dss + risk) / 2, 2),
+            }
+        )
+    rows.sort(key=lambda r: r["Rank_Score"], reverse=True)
+    return [{"Rank": rank, **row} for rank, row in enumerate(rows, start=1)]
+
+
+def make_submissions(n_items: int, seed: int = 42, id_offset: int = 10_000) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    items = []
+    for i in range(n_items):
+        institution = college_name(i % 500, random.Random(i % 500))
+        items.append(
+            {
+                "id": f"SUB-{id_offset + i}",
+                "institution": institution,
+                "institution_id": f"inst_{i % 500}",
+                "doc_type": rng.choice(DOC_TYPES),
+                "dss": rng.randint(20, 100),
+                "status": rng.choice(STATUSES),
+                "uploaded_at": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "flags": [],
+                "extracted_fields": {},
+            }
+        )
+    return items
@@ -1,11 +1,34 @@
 # college_aggregator.py
 
+import logging
+
+try:
+    from doc_validator.rule_engine import get_rules
+except ImportError:
+    get_rules = None
+
+logger = logging.getLogger("college_aggregator")
+
+# Built-in weights, used when the rules cannot be loaded. Kept public for
+# existing importers; doc_validator/rules/_defaults.json is the live source.
 MANDATORY_DOCS = {
     "fire_safety_certificate": 30,
     "affiliation_letter": 40,
     "faculty_list": 30
 }
 
+
+def mandatory_docs():
+    """Mandatory doc type -> weight (%), from doc_validator/rules/_defaults.json."""
+    if get_rules is None:
+        return MANDATORY_DOCS
+    try:
+        return get_rules().mandatory_docs or MANDATORY_DOCS
+    except Exception as e:
+        logger.warning("Validation rules unavailable, using built-in mandatory documents: %s", e)
+        return MANDATORY_DOCS
+
+
 def aggregate_college(doc_outputs: dict):
     """
     doc_outputs = {
@@ -17,7 +40,7 @@ def aggregate_college(doc_outputs: dict):
     score = 0
     flags = []
 
-    for doc, weight in MANDATORY_DOCS.items():
+    for doc, weight in mandatory_docs().items():
         if doc not in doc_outputs:
             flags.append(f"Missing mandatory document: {doc}")
             continue
@@ -0,0 +1,200 @@
+# columnar_store.py
+
+"""
+Columnar storage for rank lists and college metrics.
+
+Provides:
+- Arrow IPC (.arrow / .feather) files, read through a memory map so column
+  buffers are used in place instead of parsed
+- Parquet (.parquet) files with column pruning
+- iter_frames: chunked pandas frames from CSV, Parquet or Arrow input
+- convert: streaming CSV → columnar conversion, and columnar → CSV export
+
+Requires pyarrow (optional); HAVE_PYARROW tells callers whether it is usable.
+"""
+
+import os
+
+from lazy_imports import optional_module
+
+# Imported on first use, so workers that never touch a columnar file skip pyarrow.
+pa = optional_module("pyarrow")
+pa_csv = optional_module("pyarrow.csv")
+pa_ipc = optional_module("pyarrow.ipc")
+pq = optional_module("pyarrow.parquet")
+HAVE_PYARROW = pa is not None
+
+ARROW_SUFFIXES = (".arrow", ".feather", ".ipc")
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+# Column name → Arrow type name, applied when converting from CSV.
+RANK_LIST_TYPES = {
+    "Rank": "int32",
+    "College_ID": "string",
+    "College Name": "string",
+    "Avg_Doc_DSS": "float64",
+    "Risk_Score": "float64",
+    "Status": "string",
+    "Top_Risk_Driver": "string",
+    "Top_Risk_Share": "float64",
+    "Rank_Score": "float64",
+}
+
+COLLEGE_METRICS_TYPES = {
+    "College_ID": "string",
+    "College Name": "string",
+    "Location": "string",
+    "Total_Students": "float32",
+    "Total_Faculty": "float32",
+    "Placement_Rate": "float32",
+    "Fund_Utilization": "float32",
+    "Infrastructure_Area": "float32",
+    "Avg_Doc_DSS": "float32",
+    "Missing_Doc_Count": "float32",
+}
+
+
+def _require_pyarrow():
+    if not HAVE_PYARROW:
+        raise RuntimeError("pyarrow is not installed. Run: pip install pyarrow")
+
+
+def storage_format(path):
+    """'arrow', 'parquet' or 'csv', from the file extension."""
+    suffix = os.path.splitext(str(path))[1].lower()
+    if suffix in ARROW_SUFFIXES:
+        return "arrow"
+    if suffix in PARQUET_SUFFIXES:
+        return "parquet"
+    return "csv"
+
+
+def _arrow_types(types):
+    return {name: pa.type_for_alias(alias) for name, alias in types.items()}
+
+
+# ----------------------------------
+# Readers
+# ----------------------------------
+
+def read_table(path, columns=None):
+    """
+    Loads a columnar file as a pyarrow Table. Arrow IPC files are memory
+    mapped: the returned columns point into the mapping (zero-copy), so
+    only the pages that are touched get read. Parquet honours `columns`
+    at the file level, reading only those column chunks.
+    """
+    _require_pyarrow()
+    fmt = storage_format(path)
+    if fmt == "arrow":
+        source = pa.memory_map(str(path), "r")
+        table = pa_ipc.open_file(source).read_all()
+        return table.select(columns) if columns else table
+    if fmt == "parquet":
+        return pq.read_table(str(path), columns=columns, memory_map=True)
+    raise ValueError(f"Not a columnar file: {path}")
+
+
+def iter_frames(path, columns, chunksize, dtypes=None):
+    """
+    Yields pandas frames of at most `chunksize` rows holding `columns`,
+    whatever the storage format. `dtypes` (column → dtype) is applied to
+    CSV reads and used to cast columnar data.
+    """
+    import pandas as pd
+
+    fmt = storage_format(path)
+    if fmt == "csv":
+        with pd.read_csv(path, usecols=columns, dtype=dtypes, chunksize=chunksize) as reader:
+            yield from reader
+        return
+
+    _require_pyarrow()
+    if fmt == "parquet":
+        batches = pq.ParquetFile(str(path), memory_map=True).iter_batches(batch_size=chunksize, columns=columns)
+    else:
+        table = read_table(path, columns)
+        batches = table.to_batches(max_chunksize=chunksize)
+    for batch in batches:
+        frame = batch.to_pandas()[list(columns)]
+        yield frame.astype(dtypes) if dtypes else frame
+
+
+def read_header(path):
+    """Column names without reading data."""
+    fmt = storage_format(path)
+    if fmt == "csv":
+        import pandas as pd
+
+        return list(pd.read_csv(path, nrows=0).columns)
+    _require_pyarrow()
+    if fmt == "parquet":
+        return list(pq.read_schema(str(path)).names)
+    with pa.memory_map(str(path), "r") as source:
+        return list(pa_ipc.open_file(source).schema.names)
+
+
+# ----------------------------------
+# Writers
+# ----------------------------------
+
+def convert(src_path, dest_path, types=None, block_size=1 << 24):
+    """
+    Streams `src_path` into `dest_path`, choosing formats from the
+    extensions. CSV input is parsed by pyarrow in blocks of `block_size`
+    bytes with `types` (column → Arrow type alias) for the columns
+    present; columnar → CSV writes an export. Returns the row count.
+    """
+    _require_pyarrow()
+    src_fmt, dest_fmt = storage_format(src_path), storage_format(dest_path)
+
+    if src_fmt == "csv":
+        header = read_header(src_path)
+        column_types = _arrow_types({k: v for k, v in (types or {}).items() if k in header})
+        reader = pa_csv.open_csv(
+            str(src_path),
+            read_options=pa_csv.ReadOptions(block_size=block_size),
+            convert_options=pa_csv.ConvertOptions(column_types=column_types),
+        )
+        schema = reader.schema
+        batches = iter(reader)
+    else:
+        table = read_table(src_path)
+        schema = table.schema
+        batches = iter(table.to_batches())
+
+    rows = 0
+    tmp_path = f"{dest_path}.tmp"
+    if dest_fmt == "arrow":
+        with pa.OSFile(tmp_path, "wb") as sink, pa_ipc.new_file(sink, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    elif dest_fmt == "parquet":
+        with pq.ParquetWriter(tmp_path, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    else:
+        with pa_csv.CSVWriter(tmp_path, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    # Readers holding a memory map of the old file keep their pages.
+    os.replace(tmp_path, dest_path)
+    return rows
+
+
+def write_frame(frame, path):
+    """Writes a pandas DataFrame as Arrow IPC or Parquet, by extension."""
+    _require_pyarrow()
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    fmt = storage_format(path)
+    if fmt == "arrow":
+        with pa.OSFile(str(path), "wb") as sink, pa_ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    elif fmt == "parquet":
+        pq.write_table(table, str(path))
+    else:
+        frame.to_csv(path, index=False)
+    return path
@@ -0,0 +1,204 @@
+"""
+Embedding backends for semantic similarity - embeddings.py
+
+Provides:
+- SentenceTransformerBackend: sentence-transformers on PyTorch (the
+  original path), optionally with int8 dynamic quantization of its
+  Linear layers
+- OnnxEmbeddingBackend: ONNX Runtime on CPU with a `tokenizers` fast
+  tokenizer; never imports PyTorch and runs int8-quantized model files
+- quantize_onnx_model: dynamic int8 quantization of an fp32 ONNX export
+- load_embedding_backend(name): factory used by DocumentValidator
+
+Every backend has a SentenceTransformer-style encode(texts, ...) that
+returns one L2-normalized float32 row per text, and truncates input to
+max_seq_length tokens.
+
+Environment:
+- EDUTRACK_EMBEDDING_BACKEND: sentence-transformers (default),
+  sentence-transformers-int8 or onnx
+- EDUTRACK_EMBEDDING_MAX_SEQ: tokens kept per document (default 256,
+  the model's own limit)
+- EDUTRACK_ONNX_MODEL_DIR / EDUTRACK_ONNX_MODEL_FILE: local model
+  directory (holding tokenizer.json) and model file inside it; without a
+  directory the files are fetched from the Hugging Face Hub
+"""
+
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+import logging
+import os
+import sys
+
+import numpy as np
+
+try:
+    from lazy_imports import optional_module
+except ImportError:
+    # Run as a script from doc_validator/: lazy_imports.py is in the project root.
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from lazy_imports import optional_module
+
+# Loaded when a backend is constructed: importing sentence_transformers pulls in torch.
+sentence_transformers = optional_module("sentence_transformers")
+ort = optional_module("onnxruntime")
+tokenizers = optional_module("tokenizers")
+
+
+logger = logging.getLogger("doc_validator")
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_BACKEND = os.getenv("EDUTRACK_EMBEDDING_BACKEND", "sentence-transformers")
+EMBEDDING_MAX_SEQ_LENGTH = int(os.getenv("EDUTRACK_EMBEDDING_MAX_SEQ", "256"))
+ONNX_MODEL_DIR = os.getenv("EDUTRACK_ONNX_MODEL_DIR")
+# The model repo ships ONNX exports; this one is int8 for AVX2 CPUs.
+ONNX_MODEL_FILE = os.getenv("EDUTRACK_ONNX_MODEL_FILE", "onnx/model_quint8_avx2.onnx")
+ENCODE_BATCH_SIZE = 32
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.maximum(norms, 1e-12)).astype(np.float32)
+
+
+class SentenceTransformerBackend:
+    """The PyTorch path. quantize=True swaps Linear layers for int8 dynamic-quantized ones."""
+
+    name = "sentence-transformers"
+
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_MODEL_NAME,
+        max_seq_length: int = EMBEDDING_MAX_SEQ_LENGTH,
+        quantize: bool = False,
+    ):
+        if sentence_transformers is None:
+            raise RuntimeError("sentence-transformers is not installed. Run: pip install sentence-transformers")
+        model = sentence_transformers.SentenceTransformer(model_name, device="cpu")
+        model.max_seq_length = max_seq_length
+        if quantize:
+            import torch
+
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            self.name = "sentence-transformers-int8"
+        self.max_seq_length = max_seq_length
+        self._model = model
+
+    def encode(self, texts: Union[str, Sequence[str]], convert_to_numpy: bool = True, **kwargs: Any) -> np.ndarray:
+        kwargs.setdefault("show_progress_bar", False)
+        kwargs.setdefault("batch_size", ENCODE_BATCH_SIZE)
+        return self._model.encode(texts, convert_to_numpy=True, normalize_embeddings=True, **kwargs)
+
+
+class OnnxEmbeddingBackend:
+    """
+    Mean-pooled transformer embeddings from an ONNX model on ONNX Runtime
+    (CPU). Matches sentence-transformers' pooling for MiniLM: token
+    vectors averaged over the attention mask, then L2-normalized.
+    """
+
+    name = "onnx"
+
+    def __init__(
+        self,
+        model_dir: Optional[str] = None,
+        model_file: str = ONNX_MODEL_FILE,
+        max_seq_length: int = EMBEDDING_MAX_SEQ_LENGTH,
+        model_name: str = EMBEDDING_MODEL_NAME,
+        threads: Optional[int] = None,
+    ):
+        if ort is None or tokenizers is None:
+            raise RuntimeError("onnxruntime and tokenizers are required. Run: pip install onnxruntime tokenizers")
+        model_dir = model_dir or ONNX_MODEL_DIR or _download_model(model_name, model_file)
+
+        tokenizer = tokenizers.Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        tokenizer.enable_truncation(max_length=max_seq_length)
+        pad_id = tokenizer.token_to_id("[PAD]")
+        tokenizer.enable_padding(pad_id=pad_id if pad_id is not None else 0, pad_token="[PAD]")
+        self._tokenizer = tokenizer
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self._session = ort.InferenceSession(
+            os.path.join(model_dir, model_file), options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self._session.get_inputs()}
+        outputs = [o.name for o in self._session.get_outputs()]
+        self._output = "last_hidden_state" if "last_hidden_state" in outputs else outputs[0]
+        self.max_seq_length = max_seq_length
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self._tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        hidden = self._session.run([self._output], feeds)[0]
+        if hidden.ndim == 2:  # model already pools
+            return _normalize(hidden)
+        mask = attention_mask[:, :, None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        return _normalize(pooled)
+
+    def encode(
+        self,
+        texts: Union[str, Sequence[str]],
+        convert_to_numpy: bool = True,
+        batch_size: int = ENCODE_BATCH_SIZE,
+        **_: Any,
+    ) -> np.ndarray:
+        single = isinstance(texts, str)
+        items = [texts] if single else list(texts)
+        if not items:
+            return np.empty((0, 0), dtype=np.float32)
+        vectors = np.vstack([self._encode_batch(items[i : i + batch_size]) for i in range(0, len(items), batch_size)])
+        return vectors[0] if single else vectors
+
+
+def _download_model(model_name: str, model_file: str) -> str:
+    try:
+        from huggingface_hub import snapshot_download  # type: ignore
+    except Exception as e:
+        raise RuntimeError("Set EDUTRACK_ONNX_MODEL_DIR or install huggingface_hub to fetch the ONNX model") from e
+    return snapshot_download(model_name, allow_patterns=["tokenizer.json", model_file])
+
+
+def quantize_onnx_model(src_path: str, dest_path: str) -> str:
+    """Writes an int8 (dynamic, weight-only) copy of an fp32 ONNX model."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic  # type: ignore
+
+    quantize_dynamic(src_path, dest_path, weight_type=QuantType.QInt8)
+    return dest_path
+
+
+EMBEDDING_BACKENDS: Dict[str, Callable[..., Any]] = {
+    "sentence-transformers": SentenceTransformerBackend,
+    "sentence-transformers-int8": partial(SentenceTransformerBackend, quantize=True),
+    "onnx": OnnxEmbeddingBackend,
+}
+
+
+def backend_available(name: Optional[str] = None) -> bool:
+    """Whether the packages `name` needs are importable (the model may still fail to load)."""
+    name = name or EMBEDDING_BACKEND
+    if name == "onnx":
+        return ort is not None and tokenizers is not None
+    return name in EMBEDDING_BACKENDS and sentence_transformers is not None
+
+
+def load_embedding_backend(
+    name: Optional[str] = None,
+    model_name: str = EMBEDDING_MODEL_NAME,
+    max_seq_length: Optional[int] = None,
+    **kwargs: Any,
+) -> Any:
+    name = name or EMBEDDING_BACKEND
+    if name not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend {name!r}; choose from {sorted(EMBEDDING_BACKENDS)}")
+    return EMBEDDING_BACKENDS[name](
+        model_name=model_name, max_seq_length=max_seq_length or EMBEDDING_MAX_SEQ_LENGTH, **kwargs
+    )
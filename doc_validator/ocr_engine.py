@@ -1,20 +1,36 @@
 import logging
 import os
+import sys
 from typing import Any, Dict, List, Union
 
-import pytesseract
-from pdf2image import convert_from_path
-from PIL import Image
+try:
+    from .results import OcrPage, OcrResult
+except ImportError:
+    from results import OcrPage, OcrResult
+
+try:
+    from lazy_imports import lazy_module
+except ImportError:
+    # Run as a script from doc_validator/: lazy_imports.py is in the project root.
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from lazy_imports import lazy_module
 
 
 logger = logging.getLogger("ocr_engine")
-logging.basicConfig(level=logging.INFO)
 
-# Point this to your local Tesseract install path.
-pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
+def _configure_tesseract(module: Any) -> None:
+    # Point this to your local Tesseract install path.
+    module.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+
+
+# Imported on the first OCR call; a missing package still fails this import.
+pytesseract = lazy_module("pytesseract", on_load=_configure_tesseract)
+pdf2image = lazy_module("pdf2image")
+Image = lazy_module("PIL.Image")
 
-def _process_single_image(image_obj: Union[str, Image.Image]) -> Dict[str, Any]:
+
+def _process_single_image(image_obj: Union[str, "Image.Image"]) -> Dict[str, Any]:
     """
     Run OCR on a single image (PIL Image or file path) using Tesseract.
     Approximates confidence using per-word confidences from TSV output.
@@ -48,11 +64,12 @@ def _process_single_image(image_obj: Union[str, Image.Image]) -> Dict[str, Any]:
     }
 
 
-def run_ocr(file_path: str, max_pages: int = 10) -> Dict[str, Any]:
+def run_ocr(file_path: str, max_pages: int = 10, as_result: bool = False) -> Union[Dict[str, Any], OcrResult]:
     """
     Main entry point.
     Handles .pdf, .jpg, .png, etc.
-    Returns the JSON format required by predictor.py.
+    Returns the JSON format required by predictor.py, or an OcrResult
+    (slotted, no per-page dicts) with as_result=True.
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
@@ -60,7 +77,7 @@ def run_ocr(file_path: str, max_pages: int = 10) -> Dict[str, Any]:
     filename = os.path.basename(file_path)
     ext = os.path.splitext(filename)[1].lower()
 
-    pages_payload: List[Dict[str, Any]] = []
+    pages_payload: List[OcrPage] = []
     full_text_parts: List[str] = []
 
     logger.info("Processing: %s", filename)
@@ -68,7 +85,7 @@ def run_ocr(file_path: str, max_pages: int = 10) -> Dict[str, Any]:
     try:
         if ext == ".pdf":
             logger.info("Converting PDF to images...")
-            images = convert_from_path(file_path, dpi=200)
+            images = pdf2image.convert_from_path(file_path, dpi=200)
 
             if len(images) > max_pages:
                 logger.warning(
@@ -82,53 +99,39 @@ def run_ocr(file_path: str, max_pages: int = 10) -> Dict[str, Any]:
             for page_no, img in enumerate(images, start=1):
                 logger.info("OCR Scanning Page %s/%s...", page_no, len(images))
                 p_data = _process_single_image(img)
-                pages_payload.append(
-                    {
-                        "page_no": page_no,
-                        "text": p_data["text"],
-                        "ocr_conf_mean": round(p_data["conf"], 3),
-                    }
-                )
+                pages_payload.append(OcrPage(page_no, p_data["text"], round(p_data["conf"], 3)))
                 full_text_parts.append(p_data["text"])
 
         elif ext in [".jpg", ".jpeg", ".png", ".bmp", ".tiff"]:
             logger.info("Scanning single image...")
             p_data = _process_single_image(file_path)
-            pages_payload.append(
-                {
-                    "page_no": 1,
-                    "text": p_data["text"],
-                    "ocr_conf_mean": round(p_data["conf"], 3),
-                }
-            )
+            pages_payload.append(OcrPage(1, p_data["text"], round(p_data["conf"], 3)))
             full_text_parts.append(p_data["text"])
 
         else:
             raise ValueError(f"Unsupported file format: {ext}")
 
-        all_confs = [p["ocr_conf_mean"] for p in pages_payload if p["ocr_conf_mean"] > 0]
+        all_confs = [p.ocr_conf_mean for p in pages_payload if p.ocr_conf_mean > 0]
         doc_avg_conf = sum(all_confs) / len(all_confs) if all_confs else 0.0
 
-        return {
-            "doc_id": filename,
-            "doc_type": "unknown",
-            "pages": pages_payload,
-            "full_text": "\n\n".join(full_text_parts),
-            "ocr_conf_mean": round(doc_avg_conf, 3),
-        }
+        result = OcrResult(
+            doc_id=filename,
+            doc_type="unknown",
+            pages=tuple(pages_payload),
+            full_text="\n\n".join(full_text_parts),
+            ocr_conf_mean=round(doc_avg_conf, 3),
+        )
     except Exception as e:
         logger.error("OCR Engine Failed: %s", e)
-        return {
-            "doc_id": filename,
-            "error": str(e),
-            "status": "failed",
-        }
+        result = OcrResult(doc_id=filename, error=str(e), status="failed")
+    return result if as_result else result.to_dict()
 
 
 if __name__ == "__main__":
     import json
     import sys
 
+    logging.basicConfig(level=logging.INFO)
     print("OCR engine script started...")
     input_file = sys.argv[1] if len(sys.argv) > 1 else "test_fire_cert.jpg"
     print(f"Input file: {input_file}")
@@ -0,0 +1,102 @@
+"""
+Cleaned-text → page offset mapping - offset_map.py
+
+Provides:
+- OffsetMap: maps offsets in the whitespace-collapsed full text that
+  DocumentValidator searches back to (page_no, offset in that page's
+  OCR text), by binary search
+
+The cleaned text is the pages' text with every whitespace run collapsed
+to one space and the ends stripped. Between two such runs the cleaned
+and raw text are identical, so the map stores one segment per stretch
+of text between irregular whitespace (anything other than a single
+space), not one entry per character or token.
+"""
+
+from bisect import bisect_right
+from typing import List, Optional, Sequence, Tuple
+import re
+
+# Whitespace the cleaning step rewrites: runs of 2+, or a lone tab/newline/etc.
+_IRREGULAR_SPACE = re.compile(r"\s{2,}|[^\S ]")
+_ASCII_SPACE_OTHER_THAN_BLANK = "\t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+
+def _is_regular(text: str) -> bool:
+    """True when `text` has no whitespace other than single spaces (cheap substring tests)."""
+    if "  " in text or not text.isascii():
+        return False
+    return not any(ch in text for ch in _ASCII_SPACE_OTHER_THAN_BLANK)
+
+
+class OffsetMap:
+    __slots__ = ("_clean_starts", "_pages", "_raw_starts", "_page_nos", "_texts")
+
+    def __init__(self) -> None:
+        self._clean_starts: List[int] = []
+        self._pages: List[int] = []  # index into _page_nos / _texts
+        self._raw_starts: List[int] = []
+        self._page_nos: List[int] = []
+        self._texts: List[str] = []
+
+    @classmethod
+    def build(cls, pages: Sequence[Tuple[int, str]], cleaned_text: str) -> Optional["OffsetMap"]:
+        """
+        Map for `pages` ((page_no, text) pairs). Returns None when
+        `cleaned_text` was not derived from these pages (e.g. an OCR
+        payload whose full_text disagrees with its pages), since offsets
+        would not line up.
+        """
+        offsets = cls()
+        clean_pos = 0
+        cleaned_pages: List[str] = []
+        for page_no, text in pages:
+            raw = (text or "").replace("\x00", " ")
+            stripped = raw.strip()
+            if not stripped:
+                continue
+            if cleaned_pages:
+                clean_pos += 1  # the space joining this page to the previous one
+            index = len(offsets._page_nos)
+            offsets._page_nos.append(page_no)
+            offsets._texts.append(text or "")
+
+            raw_pos = len(raw) - len(raw.lstrip())
+            raw_end = raw_pos + len(stripped)
+            if not _is_regular(stripped):
+                for gap in _IRREGULAR_SPACE.finditer(raw, raw_pos, raw_end):
+                    offsets._add(clean_pos, index, raw_pos)
+                    clean_pos += gap.start() - raw_pos + 1
+                    raw_pos = gap.end()
+                stripped = _IRREGULAR_SPACE.sub(" ", stripped)
+            offsets._add(clean_pos, index, raw_pos)
+            clean_pos += raw_end - raw_pos
+            cleaned_pages.append(stripped)
+
+        if clean_pos != len(cleaned_text) or " ".join(cleaned_pages) != cleaned_text:
+            return None
+        return offsets
+
+    def _add(self, clean_start: int, page_index: int, raw_start: int) -> None:
+        self._clean_starts.append(clean_start)
+        self._pages.append(page_index)
+        self._raw_starts.append(raw_start)
+
+    def resolve(self, clean_offset: int) -> Tuple[int, int]:
+        """(page index, raw offset) of a cleaned-text offset."""
+        segment = max(0, bisect_right(self._clean_starts, clean_offset) - 1)
+        return self._pages[segment], self._raw_starts[segment] + clean_offset - self._clean_starts[segment]
+
+    def locate(self, start: int, end: int) -> Optional[Tuple[int, int, int, str]]:
+        """
+        (page_no, page_start, page_end, page_text[page_start:page_end]) for
+        the cleaned-text span [start, end). A span running onto a later
+        page is clipped to the end of its first page.
+        """
+        if not self._clean_starts or end <= start:
+            return None
+        page, page_start = self.resolve(start)
+        end_page, page_end = self.resolve(end - 1)
+        text = self._texts[page]
+        page_end = page_end + 1 if end_page == page else len(text.rstrip())
+        return (self._page_nos[page], page_start, page_end, text[page_start:page_end])
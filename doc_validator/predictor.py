@@ -2,41 +2,50 @@
 Document Validator - predictor.py
 
 Provides:
-- DocumentValidator class
-- predict_from_ocr(input_data) helper
+- DocumentValidator class (validate() → ValidationResult, predict_from_dict() → dict,
+  validate_batch() / predict_batch() for several documents with one encode call)
+- predict_from_ocr(input_data) / predict_batch_from_ocr(inputs) helpers
+- summarize_profiles / write_profile_report for profile=True runs
 """
 
-from typing import Any, Dict, List, Optional, Tuple, Union
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import json
 import logging
 import os
 import re
+import threading
+import time
+import tracemalloc
 
 import numpy as np
 
 try:
-    from sentence_transformers import SentenceTransformer  # type: ignore
-except Exception:
-    SentenceTransformer = None
+    from .rule_engine import get_rules
+except ImportError:
+    from rule_engine import get_rules
 
+try:
+    from .offset_map import OffsetMap
+except ImportError:
+    from offset_map import OffsetMap
 
-logger = logging.getLogger("doc_validator")
-logging.basicConfig(level=logging.INFO)
+try:
+    from .results import FieldValue, LocatedField, NumericMention, OcrPage, OcrResult, TextSnippet, ValidationResult
+except ImportError:
+    from results import FieldValue, LocatedField, NumericMention, OcrPage, OcrResult, TextSnippet, ValidationResult
 
+try:
+    from .embeddings import EMBEDDING_MODEL_NAME, backend_available, load_embedding_backend
+except ImportError:
+    from embeddings import EMBEDDING_MODEL_NAME, backend_available, load_embedding_backend
 
-REQUIRED_KEYWORDS = {
-    "financial_statement": ["balance sheet", "income", "profit", "auditor", "revenue"],
-    "faculty_list": ["name", "designation", "qualification", "signature"],
-    "fire_safety_certificate": ["fire", "safety", "certificate", "valid", "authority", "issued"],
-    "affidavit": ["sworn", "affidavit", "deponent", "signed", "notary"],
-}
 
-BASE_DIR = os.path.dirname(__file__)
-TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
+logger = logging.getLogger("doc_validator")
 
-OCR_CONF_LOW_THRESHOLD = 0.6
-KEYWORD_COVERAGE_THRESHOLD = 0.3
-EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+BASE_DIR = os.path.dirname(__file__)
+TEMPLATES_DIR = os.getenv("EDUTRACK_TEMPLATES_DIR") or os.path.join(BASE_DIR, "templates")
 
 _DATE_PATTERNS = [
     r"\b(20\d{2})[-/](0[1-9]|1[0-2])[-/](0[1-9]|[12]\d|3[01])\b",
@@ -44,14 +53,126 @@ _DATE_PATTERNS = [
     r"\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*[ ,.-]*(20\d{2})\b",
 ]
 _NUMBER_PATTERN = re.compile(r"(?:(?:\d{1,3}(?:,\d{3})+)|\d+)(?:\.\d+)?")
-_SIGNATURE_KEYWORDS = [
-    "signature",
-    "signed",
-    "signatory",
-    "authorised signatory",
-    "authorised",
-    "autho",
-]
+
+
+_NO_STAGE = nullcontext()
+
+
+# tracemalloc is process-global: memory-profiled validations run one at a time.
+_TRACEMALLOC_LOCK = threading.Lock()
+
+
+class _StageProfiler:
+    """
+    Per-document stage timer. Stages must not nest.
+
+    By default it records wall time per stage and is safe to use from many
+    threads. With memory=True it records net and peak tracemalloc
+    allocation instead, and no stage times: tracing slows every allocation,
+    which would inflate and skew them. Memory-profiled validations hold
+    _TRACEMALLOC_LOCK, and allocations by other threads during a stage are
+    counted too, so run memory profiling single-threaded.
+    """
+
+    def __init__(self, memory: bool = False) -> None:
+        self.memory = memory
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self._started_tracing = False
+        self._start = 0.0
+
+    def __enter__(self) -> "_StageProfiler":
+        if self.memory:
+            _TRACEMALLOC_LOCK.acquire()
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.total_ms = (time.perf_counter() - self._start) * 1000.0
+        if self.memory:
+            if self._started_tracing:
+                tracemalloc.stop()
+            _TRACEMALLOC_LOCK.release()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if self.memory:
+            mem_before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            try:
+                yield
+            finally:
+                current, peak = tracemalloc.get_traced_memory()
+                self.stages[name] = {
+                    "alloc_kb": round((current - mem_before) / 1024.0, 3),
+                    "peak_kb": round(max(0, peak - mem_before) / 1024.0, 3),
+                }
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = {"wall_ms": round((time.perf_counter() - start) * 1000.0, 4)}
+
+    def report(self) -> Dict[str, Any]:
+        return {"total_ms": round(self.total_ms, 4), "stages": self.stages}
+
+
+def summarize_profiles(profiles: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Aggregate per-document `profile` blocks (or results carrying one) into
+    p50/p95/p99/max per stage and metric, slowest stage (by wall_ms p95,
+    or peak_kb p95 for memory profiles) first.
+    """
+    samples: Dict[str, Dict[str, List[float]]] = {}
+    totals: List[float] = []
+    for item in profiles:
+        profile = item.get("profile", item) if isinstance(item, dict) else None
+        if not profile or "stages" not in profile:
+            continue
+        totals.append(float(profile.get("total_ms", 0.0)))
+        for stage, values in profile["stages"].items():
+            bucket = samples.setdefault(stage, {})
+            for metric, value in values.items():
+                bucket.setdefault(metric, []).append(float(value))
+
+    def _describe(values: List[float]) -> Dict[str, float]:
+        arr = np.asarray(values, dtype=np.float64)
+        p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+        return {
+            "p50": round(float(p50), 4),
+            "p95": round(float(p95), 4),
+            "p99": round(float(p99), 4),
+            "max": round(float(arr.max()), 4),
+            "mean": round(float(arr.mean()), 4),
+        }
+
+    stages = {
+        stage: {metric: _describe(values) for metric, values in metrics.items()}
+        for stage, metrics in samples.items()
+    }
+    ordered = dict(
+        sorted(
+            stages.items(),
+            key=lambda kv: kv[1].get("wall_ms", kv[1].get("peak_kb", {})).get("p95", 0.0),
+            reverse=True,
+        )
+    )
+    return {
+        "documents": len(totals),
+        "total_ms": _describe(totals) if totals else {},
+        "stages": ordered,
+    }
+
+
+def write_profile_report(profiles: Iterable[Dict[str, Any]], path: str) -> Dict[str, Any]:
+    summary = summarize_profiles(profiles)
+    with open(path, "w", encoding="utf8") as f:
+        json.dump(summary, f, indent=2)
+    return summary
 
 
 class DocumentValidator:
@@ -61,20 +182,42 @@ class DocumentValidator:
         use_semantic: bool = True,
         embedding_model_name: str = EMBEDDING_MODEL_NAME,
         debug: bool = False,
+        profile: bool = False,
+        profile_memory: bool = False,
+        embedding_model: Optional[Any] = None,
+        lean: bool = False,
+        rules_dir: Optional[str] = None,
+        embedding_backend: Optional[str] = None,
+        max_seq_length: Optional[int] = None,
     ):
         self.templates_dir = templates_dir or TEMPLATES_DIR
-        self.use_semantic = use_semantic and (SentenceTransformer is not None)
+        self.use_semantic = use_semantic and (embedding_model is not None or backend_available(embedding_backend))
         self.embedding_model_name = embedding_model_name
         self.debug = debug
-        self._emb_model = None
-
-        if self.use_semantic:
+        # profile: per-stage wall time. profile_memory: per-stage allocations
+        # (tracemalloc) instead; slower, and serialized across threads.
+        self.profile = profile or profile_memory
+        self.profile_memory = profile_memory
+        # Lean: never attach raw OCR, and drop the input's full and per-page
+        # text once validated (OcrResult or dict; the caller's copy is emptied).
+        self.lean = lean
+        # Keywords, checks and scoring come from rule_engine (hot-reloaded JSON).
+        self.rules_dir = rules_dir
+        # Any object with a SentenceTransformer-style encode() can be injected.
+        # Otherwise embeddings.load_embedding_backend picks one (EDUTRACK_EMBEDDING_BACKEND).
+        self._emb_model = embedding_model if use_semantic else None
+        # doc_type -> ((mtime_ns, size), vector): templates are encoded once, not per document.
+        self._template_vectors: Dict[str, Tuple[Tuple[int, int], np.ndarray]] = {}
+
+        if self.use_semantic and self._emb_model is None:
             try:
                 logger.info("Loading embedding model: %s", self.embedding_model_name)
-                self._emb_model = SentenceTransformer(self.embedding_model_name)
+                self._emb_model = load_embedding_backend(
+                    embedding_backend, model_name=self.embedding_model_name, max_seq_length=max_seq_length
+                )
             except Exception as e:
                 logger.warning(
-                    "Failed to load SentenceTransformer; semantic features disabled. Error: %s",
+                    "Failed to load embedding backend; semantic features disabled. Error: %s",
                     e,
                 )
                 self._emb_model = None
@@ -90,16 +233,34 @@ class DocumentValidator:
         except Exception:
             return None
 
+    def _template_vector(self, doc_type: str) -> Optional[np.ndarray]:
+        """Embedding of the doc type's template, re-encoded only when the file changes."""
+        file_path = os.path.join(self.templates_dir, f"{doc_type}.txt")
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._template_vectors.get(doc_type)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        template = self._load_template_text(doc_type)
+        if not template:
+            return None
+        vector = self._emb_model.encode([template], convert_to_numpy=True, show_progress_bar=False)[0]
+        self._template_vectors[doc_type] = (version, vector)
+        return vector
+
     def _clean_text(self, text: Optional[str]) -> str:
         if not text:
             return ""
         text = text.replace("\x00", " ").strip()
         return re.sub(r"\s+", " ", text)
 
-    def _mean_ocr_confidence(self, pages: List[Dict[str, Any]]) -> Optional[float]:
+    def _mean_ocr_confidence(self, pages: Iterable[OcrPage]) -> Optional[float]:
         confs: List[float] = []
         for page in pages:
-            conf = page.get("ocr_conf_mean")
+            conf = page.ocr_conf_mean
             if conf is None:
                 continue
             try:
@@ -125,182 +286,233 @@ class DocumentValidator:
                 break
         return values
 
-    def _keyword_coverage(self, text: str, doc_type: str) -> float:
-        keywords = REQUIRED_KEYWORDS.get(doc_type, [])
-        if not keywords:
-            return 0.0
-        text_lc = text.lower()
-        found = sum(1 for kw in keywords if kw.lower() in text_lc)
-        return found / len(keywords)
-
-    def _has_signature(self, text: str) -> bool:
-        text_lc = text.lower()
-        return any(keyword in text_lc for keyword in _SIGNATURE_KEYWORDS)
-
     def _semantic_similarity(self, text: str, doc_type: str) -> Optional[float]:
+        return self._semantic_similarities([text], [doc_type])[0]
+
+    def _semantic_similarities(self, texts: List[str], doc_types: List[str]) -> List[Optional[float]]:
+        """Cosine similarity of each text to its doc type's template, with one encode() for all texts."""
+        scores: List[Optional[float]] = [None] * len(texts)
         if not self.use_semantic or self._emb_model is None:
-            return None
-        template = self._load_template_text(doc_type)
-        if not template:
-            return None
+            return scores
         try:
+            templates = {doc_type: self._template_vector(doc_type) for doc_type in set(doc_types)}
+            indices = [i for i, doc_type in enumerate(doc_types) if templates[doc_type] is not None]
+            if not indices:
+                return scores
             vectors = self._emb_model.encode(
-                [text, template],
-                convert_to_numpy=True,
-                show_progress_bar=False,
+                [texts[i] for i in indices], convert_to_numpy=True, show_progress_bar=False
             )
-            a = vectors[0]
-            b = vectors[1]
-            denom = np.linalg.norm(a) * np.linalg.norm(b)
-            if denom == 0:
-                return 0.0
-            return float(np.dot(a, b) / denom)
+            for i, a in zip(indices, vectors):
+                b = templates[doc_types[i]]
+                denom = np.linalg.norm(a) * np.linalg.norm(b)
+                scores[i] = 0.0 if denom == 0 else float(np.dot(a, b) / denom)
         except Exception as e:
             logger.warning("Semantic similarity failed: %s", e)
-            return None
+        return scores
 
     def _find_snippet_page(
-        self, pages: List[Dict[str, Any]], pattern: str
+        self, pages: Iterable[OcrPage], pattern: str
     ) -> Optional[Tuple[int, int, int, str]]:
         for page in pages:
-            text = page.get("text", "") or ""
+            text = page.text or ""
             match = re.search(pattern, text, flags=re.IGNORECASE)
             if match:
-                page_no = int(page.get("page_no", 1))
-                return (page_no, match.start(), match.end(), match.group(0))
+                return (page.page_no, match.start(), match.end(), match.group(0))
         return None
 
-    def predict_from_dict(self, ocr: Dict[str, Any]) -> Dict[str, Any]:
-        result: Dict[str, Any] = {}
+    def predict_from_dict(self, ocr: Union[Dict[str, Any], OcrResult]) -> Dict[str, Any]:
+        return self.validate(ocr).to_dict()
+
+    def predict_batch(self, ocrs: List[Union[Dict[str, Any], OcrResult]]) -> List[Dict[str, Any]]:
+        return [result.to_dict() for result in self.validate_batch(ocrs)]
+
+    def validate(
+        self,
+        ocr: Union[Dict[str, Any], OcrResult],
+        deferred: Optional[List[Tuple[Dict[str, Any], str, str]]] = None,
+    ) -> ValidationResult:
+        if not self.profile:
+            return self._predict(ocr, None, deferred)
+        with _StageProfiler(memory=self.profile_memory) as profiler:
+            result = self._predict(ocr, profiler, deferred)
+        result.profile = profiler.report()
+        return result
+
+    def validate_batch(self, ocrs: List[Union[Dict[str, Any], OcrResult]]) -> List[ValidationResult]:
+        """
+        validate() for several documents, embedding all of them in one
+        encode() call. Results match validating each document on its own.
+        When profiling, the batched call's cost is split evenly across the
+        documents it embedded as their "semantic_similarity" stage.
+        """
+        deferred: List[Tuple[Dict[str, Any], str, str]] = []
+        owners: List[int] = []  # result index for each deferred entry
+        results: List[ValidationResult] = []
+        for ocr in ocrs:
+            queued = len(deferred)
+            results.append(self.validate(ocr, deferred))
+            owners.extend([len(results) - 1] * (len(deferred) - queued))
+        if not deferred:
+            return results
+
+        profiler = _StageProfiler(memory=self.profile_memory) if self.profile else None
+        with profiler if profiler is not None else _NO_STAGE:
+            with profiler.stage("semantic_similarity") if profiler is not None else _NO_STAGE:
+                scores = self._semantic_similarities([text for _, text, _ in deferred], [t for _, _, t in deferred])
+        for (fields, _, _), semsim in zip(deferred, scores):
+            fields["semantic_similarity"] = FieldValue(semsim, 0.9 if semsim is not None else 0.0)
+
+        if profiler is not None:
+            share = {
+                metric: round(value / len(deferred), 4)
+                for metric, value in profiler.stages["semantic_similarity"].items()
+            }
+            for index in owners:
+                profile = results[index].profile
+                profile["stages"]["semantic_similarity"] = dict(share)
+                profile["total_ms"] = round(profile["total_ms"] + profiler.total_ms / len(deferred), 4)
+        return results
+
+    def _predict(
+        self,
+        ocr: Union[Dict[str, Any], OcrResult],
+        profiler: Optional[_StageProfiler],
+        deferred: Optional[List[Tuple[Dict[str, Any], str, str]]] = None,
+    ) -> ValidationResult:
+        stage = profiler.stage if profiler is not None else (lambda name: _NO_STAGE)
         try:
-            doc_id = ocr.get("doc_id") or ocr.get("id") or "unknown"
-            doc_type = (ocr.get("doc_type") or "unknown").lower()
-            pages = ocr.get("pages", []) or []
-            full_text = ocr.get("full_text", "") or ""
+            with stage("parse_ocr"):
+                doc = ocr if isinstance(ocr, OcrResult) else OcrResult.from_dict(ocr)
+            doc_id = doc.doc_id
+            doc_type = (doc.doc_type or "unknown").lower()
+            pages = doc.pages
+            full_text = doc.full_text or ""
+
+            with stage("clean_text"):
+                if not full_text:
+                    full_text = " ".join((p.text or "") for p in pages)
+                full_text = self._clean_text(full_text)
 
-            if not full_text:
-                full_text = " ".join((p.get("text", "") or "") for p in pages)
-            full_text = self._clean_text(full_text)
+            with stage("offset_map"):
+                offsets = OffsetMap.build([(p.page_no, p.text) for p in pages], full_text)
 
-            ocr_conf = self._mean_ocr_confidence(pages)
+            rules = get_rules(self.rules_dir).for_doc_type(doc_type)
+
+            with stage("ocr_confidence"):
+                ocr_conf = self._mean_ocr_confidence(pages)
             status = "parsed"
-            if ocr_conf is not None and ocr_conf < OCR_CONF_LOW_THRESHOLD:
+            if ocr_conf is not None and ocr_conf < rules.ocr_confidence_flag_below:
                 status = "low_confidence"
 
             fields: Dict[str, Any] = {}
-            text_snippets: List[Dict[str, Any]] = []
+            text_snippets: List[TextSnippet] = []
             dss_flags: List[str] = []
 
-            date_match = self._find_date(full_text)
+            with stage("find_date"):
+                date_match = self._find_date(full_text)
             if date_match:
                 date_value, start, end = date_match
-                page_info = self._find_snippet_page(pages, re.escape(date_value))
+                with stage("snippet_search"):
+                    page_info = offsets.locate(start, end) if offsets is not None else None
+                    if page_info is None:
+                        # full_text was not built from these pages; fall back to searching them.
+                        page_info = self._find_snippet_page(pages, re.escape(date_value))
                 if page_info:
                     page_no, page_start, page_end, snippet_text = page_info
                     snippet_start = page_start
                     snippet_end = page_end
                     snippet_value = snippet_text
                 else:
-                    page_no = int(pages[0].get("page_no", 1)) if pages else 1
+                    page_no = pages[0].page_no if pages else 1
                     snippet_start = start
                     snippet_end = end
                     snippet_value = date_value
 
-                fields["document_date"] = {
-                    "value": date_value,
-                    "conf": 0.9 if ocr_conf is None or ocr_conf > 0.8 else 0.75,
-                    "page": page_no,
-                    "bbox": None,
-                }
-                text_snippets.append(
-                    {
-                        "page": page_no,
-                        "start": snippet_start,
-                        "end": snippet_end,
-                        "text": snippet_value,
-                    }
+                fields["document_date"] = LocatedField(
+                    date_value, 0.9 if ocr_conf is None or ocr_conf > 0.8 else 0.75, page=page_no
                 )
+                text_snippets.append(TextSnippet(page_no, snippet_start, snippet_end, snippet_value))
             else:
-                fields["document_date"] = {"value": None, "conf": 0.0, "page": None, "bbox": None}
+                fields["document_date"] = LocatedField(None, 0.0)
                 dss_flags.append("missing_date")
 
-            numbers = self._find_numbers(full_text, top_n=5)
+            with stage("numeric_mentions"):
+                numbers = self._find_numbers(full_text, top_n=5)
             fields["numeric_mentions"] = [
-                {"value": value, "start": start, "end": end}
+                NumericMention(value, start, end, page=offsets.locate(start, end)[0] if offsets is not None else None)
                 for (value, start, end) in numbers
             ]
 
-            coverage = self._keyword_coverage(full_text, doc_type)
-            fields["keyword_coverage"] = {"value": coverage, "conf": 0.9}
-            if coverage < KEYWORD_COVERAGE_THRESHOLD:
+            with stage("rules"):
+                rule_match = rules.evaluate(full_text)
+            coverage = rule_match.coverage
+            fields["keyword_coverage"] = FieldValue(coverage, 0.9)
+            if coverage < rules.keyword_coverage_flag_below:
                 dss_flags.append("low_keyword_coverage")
 
-            has_signature = self._has_signature(full_text)
-            fields["has_signature"] = {"value": has_signature, "conf": 0.95 if has_signature else 0.1}
+            has_signature = rule_match.has_signature
+            fields["has_signature"] = FieldValue(has_signature, 0.95 if has_signature else 0.1)
             if not has_signature:
                 dss_flags.append("missing_signature")
 
-            semsim = self._semantic_similarity(full_text, doc_type) if self.use_semantic else None
-            fields["semantic_similarity"] = {"value": semsim, "conf": 0.9 if semsim is not None else 0.0}
-
-            if doc_type == "fire_safety_certificate":
-                if re.search(
-                    r"\b(fire department|municipal|authority|fire\s+brigade)\b",
-                    full_text,
-                    flags=re.IGNORECASE,
-                ):
-                    fields["issuing_authority"] = {"value": "present", "conf": 0.85}
+            semsim = None
+            if deferred is not None and self.use_semantic:
+                deferred.append((fields, full_text, doc_type))  # filled in by validate_batch
+            elif self.use_semantic:
+                with stage("semantic_similarity"):
+                    semsim = self._semantic_similarity(full_text, doc_type)
+            fields["semantic_similarity"] = FieldValue(semsim, 0.9 if semsim is not None else 0.0)
+
+            for check in rules.checks:
+                if rule_match.checks[check.field]:
+                    fields[check.field] = FieldValue(check.value, check.conf)
                 else:
-                    fields["issuing_authority"] = {"value": None, "conf": 0.0}
-                    dss_flags.append("no_issuing_authority_found")
+                    fields[check.field] = FieldValue(None, 0.0)
+                    if check.flag:
+                        dss_flags.append(check.flag)
 
             if ocr_conf is None and len(full_text.split()) < 20:
                 status = "low_confidence"
 
-            dss_score = 100
-            if ocr_conf is not None:
-                if ocr_conf < 0.5:
-                    dss_score -= 30
-                elif ocr_conf < 0.7:
-                    dss_score -= 20
-                elif ocr_conf < 0.85:
-                    dss_score -= 10
-
-            if coverage < 0.2:
-                dss_score -= 30
-            elif coverage < 0.4:
-                dss_score -= 15
-
-            if not has_signature:
-                dss_score -= 25
-            if "missing_date" in dss_flags:
-                dss_score -= 10
-
-            dss_score = max(0, min(100, int(round(dss_score))))
-
-            result["doc_id"] = doc_id
-            result["status"] = status
-            result["fields"] = fields
-            result["text_snippets"] = text_snippets
-            result["ocr_confidence"] = ocr_conf
-            result["dss_flags"] = sorted(set(dss_flags))
-            result["dss_score"] = dss_score
-
-            if self.debug:
-                result["raw"] = ocr
+            with stage("scoring"):
+                dss_score = rules.score(ocr_conf, coverage, has_signature, "missing_date" in dss_flags)
+
+            result = ValidationResult(
+                doc_id=doc_id,
+                status=status,
+                fields=fields,
+                text_snippets=text_snippets,
+                ocr_confidence=ocr_conf,
+                dss_flags=sorted(set(dss_flags)),
+                dss_score=dss_score,
+                raw=ocr if self.debug and not self.lean else None,
+            )
+            if self.lean:
+                self._release_text(ocr)
             return result
         except Exception as e:
             logger.exception("DocumentValidator failed: %s", e)
-            return {
-                "doc_id": ocr.get("doc_id", "unknown") if isinstance(ocr, dict) else "unknown",
-                "status": "failed",
-                "fields": {},
-                "text_snippets": [],
-                "ocr_confidence": None,
-                "dss_flags": ["exception"],
-                "error": str(e),
-                "raw": (ocr if self.debug else None),
-            }
+            if isinstance(ocr, OcrResult):
+                doc_id = ocr.doc_id
+            else:
+                doc_id = ocr.get("doc_id", "unknown") if isinstance(ocr, dict) else "unknown"
+            return ValidationResult(
+                doc_id=doc_id,
+                status="failed",
+                dss_flags=["exception"],
+                error=str(e),
+                raw=ocr if self.debug and not self.lean else None,
+            )
+
+    @staticmethod
+    def _release_text(ocr: Union[Dict[str, Any], OcrResult]) -> None:
+        if isinstance(ocr, OcrResult):
+            ocr.release_text()
+            return
+        ocr.pop("full_text", None)
+        for page in ocr.get("pages") or []:
+            if isinstance(page, dict):
+                page.pop("text", None)
 
     def predict_from_path(self, json_path: str) -> Dict[str, Any]:
         if not os.path.exists(json_path):
@@ -314,19 +526,26 @@ _default_validator: Optional[DocumentValidator] = None
 
 
 def get_default_validator(debug: bool = False) -> DocumentValidator:
+    # Lean unless debugging: nothing keeps the OCR text once it has been scored.
     global _default_validator
     if _default_validator is None:
-        _default_validator = DocumentValidator(debug=debug)
+        _default_validator = DocumentValidator(debug=debug, lean=not debug)
     return _default_validator
 
 
-def predict_from_ocr(input_data: Union[str, Dict[str, Any]], debug: bool = False) -> Dict[str, Any]:
+def predict_batch_from_ocr(
+    inputs: List[Union[Dict[str, Any], OcrResult]], debug: bool = False
+) -> List[Dict[str, Any]]:
+    return get_default_validator(debug=debug).predict_batch(inputs)
+
+
+def predict_from_ocr(input_data: Union[str, Dict[str, Any], OcrResult], debug: bool = False) -> Dict[str, Any]:
     validator = get_default_validator(debug=debug)
     if isinstance(input_data, str):
         return validator.predict_from_path(input_data)
-    if isinstance(input_data, dict):
+    if isinstance(input_data, (dict, OcrResult)):
         return validator.predict_from_dict(input_data)
-    raise ValueError("input_data must be file path or dict")
+    raise ValueError("input_data must be file path, dict or OcrResult")
 
 
 if __name__ == "__main__":
@@ -334,10 +553,28 @@ if __name__ == "__main__":
     import pprint
 
     parser = argparse.ArgumentParser()
-    parser.add_argument("--ocr", required=True, help="Path to OCR json file")
+    parser.add_argument("--ocr", required=True, nargs="+", help="Path(s) to OCR json file(s)")
     parser.add_argument("--debug", action="store_true", help="Include raw OCR in output")
+    parser.add_argument("--profile", action="store_true", help="Record per-stage wall time")
+    parser.add_argument(
+        "--profile-memory", action="store_true", help="Record per-stage allocations instead (tracemalloc)"
+    )
+    parser.add_argument("--profile-report", help="Write aggregated stage percentiles to this JSON file")
     args = parser.parse_args()
 
-    validator = DocumentValidator(debug=args.debug)
-    output = validator.predict_from_path(args.ocr)
-    pprint.pprint(output)
+    logging.basicConfig(level=logging.INFO)
+    validator = DocumentValidator(
+        debug=args.debug,
+        profile=args.profile or bool(args.profile_report),
+        profile_memory=args.profile_memory,
+    )
+    outputs = [validator.predict_from_path(path) for path in args.ocr]
+    for output in outputs:
+        pprint.pprint(output)
+
+    if validator.profile:
+        summary = summarize_profiles(outputs)
+        if args.profile_report:
+            write_profile_report(outputs, args.profile_report)
+            print(f"Profile report written to {args.profile_report}")
+        pprint.pprint(summary)
@@ -0,0 +1,198 @@
+"""
+Typed result objects for OCR and document validation.
+
+Provides:
+- OcrPage / OcrResult: run_ocr output (OcrResult.from_dict accepts the JSON form)
+- FieldValue / LocatedField / NumericMention / TextSnippet: extracted fields
+- ValidationResult: DocumentValidator output
+
+All classes use __slots__, so a result costs a few fixed-size objects
+instead of one dict per page, field and snippet. to_dict() returns the
+JSON shape the API and predict_from_dict have always produced.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+class OcrPage:
+    __slots__ = ("page_no", "text", "ocr_conf_mean")
+
+    def __init__(self, page_no: int, text: Optional[str], ocr_conf_mean: Optional[float] = None):
+        self.page_no = page_no
+        self.text = text
+        self.ocr_conf_mean = ocr_conf_mean
+
+    @classmethod
+    def from_dict(cls, page: Dict[str, Any]) -> "OcrPage":
+        return cls(int(page.get("page_no", 1)), page.get("text", "") or "", page.get("ocr_conf_mean"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"page_no": self.page_no, "text": self.text, "ocr_conf_mean": self.ocr_conf_mean}
+
+
+class OcrResult:
+    __slots__ = ("doc_id", "doc_type", "pages", "full_text", "ocr_conf_mean", "error", "status")
+
+    def __init__(
+        self,
+        doc_id: str,
+        doc_type: str = "unknown",
+        pages: Tuple[OcrPage, ...] = (),
+        full_text: Optional[str] = "",
+        ocr_conf_mean: Optional[float] = None,
+        error: Optional[str] = None,
+        status: Optional[str] = None,
+    ):
+        self.doc_id = doc_id
+        self.doc_type = doc_type
+        self.pages = tuple(pages)
+        self.full_text = full_text
+        self.ocr_conf_mean = ocr_conf_mean
+        self.error = error
+        self.status = status
+
+    @classmethod
+    def from_dict(cls, ocr: Dict[str, Any]) -> "OcrResult":
+        return cls(
+            doc_id=ocr.get("doc_id") or ocr.get("id") or "unknown",
+            doc_type=ocr.get("doc_type") or "unknown",
+            pages=tuple(OcrPage.from_dict(p) for p in (ocr.get("pages") or [])),
+            full_text=ocr.get("full_text", "") or "",
+            ocr_conf_mean=ocr.get("ocr_conf_mean"),
+            error=ocr.get("error"),
+            status=ocr.get("status"),
+        )
+
+    def release_text(self) -> None:
+        """Drops full and per-page text once validation has consumed it."""
+        self.full_text = None
+        for page in self.pages:
+            page.text = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.error is not None:
+            return {"doc_id": self.doc_id, "error": self.error, "status": self.status or "failed"}
+        return {
+            "doc_id": self.doc_id,
+            "doc_type": self.doc_type,
+            "pages": [page.to_dict() for page in self.pages],
+            "full_text": self.full_text,
+            "ocr_conf_mean": self.ocr_conf_mean,
+        }
+
+
+class FieldValue:
+    __slots__ = ("value", "conf")
+
+    def __init__(self, value: Any, conf: float):
+        self.value = value
+        self.conf = conf
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"value": self.value, "conf": self.conf}
+
+
+class LocatedField(FieldValue):
+    """A field with the page (and bounding box, when known) it was read from."""
+
+    __slots__ = ("page", "bbox")
+
+    def __init__(self, value: Any, conf: float, page: Optional[int] = None, bbox: Optional[Tuple[float, ...]] = None):
+        super().__init__(value, conf)
+        self.page = page
+        self.bbox = bbox
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"value": self.value, "conf": self.conf, "page": self.page, "bbox": self.bbox}
+
+
+class NumericMention:
+    """A number at [start, end) of the cleaned text, and the page it is on."""
+
+    __slots__ = ("value", "start", "end", "page")
+
+    def __init__(self, value: str, start: int, end: int, page: Optional[int] = None):
+        self.value = value
+        self.start = start
+        self.end = end
+        self.page = page
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"value": self.value, "start": self.start, "end": self.end, "page": self.page}
+
+
+class TextSnippet:
+    __slots__ = ("page", "start", "end", "text")
+
+    def __init__(self, page: int, start: int, end: int, text: str):
+        self.page = page
+        self.start = start
+        self.end = end
+        self.text = text
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"page": self.page, "start": self.start, "end": self.end, "text": self.text}
+
+
+FieldEntry = Union[FieldValue, List[NumericMention]]
+
+
+class ValidationResult:
+    __slots__ = (
+        "doc_id",
+        "status",
+        "fields",
+        "text_snippets",
+        "ocr_confidence",
+        "dss_flags",
+        "dss_score",
+        "error",
+        "raw",
+        "profile",
+    )
+
+    def __init__(
+        self,
+        doc_id: str,
+        status: str,
+        fields: Optional[Dict[str, FieldEntry]] = None,
+        text_snippets: Optional[List[TextSnippet]] = None,
+        ocr_confidence: Optional[float] = None,
+        dss_flags: Optional[List[str]] = None,
+        dss_score: Optional[int] = None,
+        error: Optional[str] = None,
+        raw: Any = None,
+        profile: Optional[Dict[str, Any]] = None,
+    ):
+        self.doc_id = doc_id
+        self.status = status
+        self.fields = fields or {}
+        self.text_snippets = text_snippets or []
+        self.ocr_confidence = ocr_confidence
+        self.dss_flags = dss_flags or []
+        self.dss_score = dss_score
+        self.error = error
+        self.raw = raw
+        self.profile = profile
+
+    def to_dict(self) -> Dict[str, Any]:
+        fields: Dict[str, Any] = {}
+        for name, entry in self.fields.items():
+            fields[name] = [m.to_dict() for m in entry] if isinstance(entry, list) else entry.to_dict()
+        result: Dict[str, Any] = {
+            "doc_id": self.doc_id,
+            "status": self.status,
+            "fields": fields,
+            "text_snippets": [s.to_dict() for s in self.text_snippets],
+            "ocr_confidence": self.ocr_confidence,
+            "dss_flags": list(self.dss_flags),
+        }
+        if self.error is not None:
+            result["error"] = self.error
+        else:
+            result["dss_score"] = self.dss_score
+        if self.raw is not None or self.error is not None:
+            result["raw"] = self.raw.to_dict() if isinstance(self.raw, OcrResult) else self.raw
+        if self.profile is not None:
+            result["profile"] = self.profile
+        return result
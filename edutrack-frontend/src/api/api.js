@@ -52,6 +52,48 @@ async function request(path, options = {}) {
   return { data, status: res.status };
 }
 
+// EventSource cannot send headers, so the URL carries a short-lived stream
+// token from /events/token rather than the session token. When a reconnect
+// is rejected (token expired) the stream reopens with a fresh token from
+// the last event seen. Returns a function that closes the stream.
+export function openEventStream(path, listeners) {
+  let source = null;
+  let closed = false;
+  let lastEventId = null;
+
+  async function connect() {
+    let streamToken = null;
+    try {
+      const { data } = await request("/events/token", { method: "POST" });
+      streamToken = data?.token || null;
+    } catch {
+      // Not signed in; the stream request below fails and is retried.
+    }
+    if (closed) return;
+
+    const url = new URL(`${API_BASE_URL}${path}`);
+    if (streamToken) url.searchParams.set("token", streamToken);
+    if (lastEventId) url.searchParams.set("since", lastEventId);
+    source = new EventSource(url.toString());
+    Object.entries(listeners).forEach(([type, handler]) => {
+      source.addEventListener(type, (event) => {
+        if (event.lastEventId) lastEventId = event.lastEventId;
+        handler(event);
+      });
+    });
+    source.onerror = () => {
+      // The browser retries on its own; it gives up (CLOSED) when the server rejects the retry.
+      if (source.readyState === EventSource.CLOSED && !closed) setTimeout(connect, 3000);
+    };
+  }
+
+  connect();
+  return () => {
+    closed = true;
+    if (source) source.close();
+  };
+}
+
 const client = {
   get: (path) => request(path, { method: "GET" }),
   post: (path, body, headers = {}) => request(path, { method: "POST", body, headers }),
@@ -7,3 +7,7 @@ export async function loginRequest(payload) {
 export async function meRequest() {
   return client.get("/auth/me");
 }
+
+export async function logoutRequest() {
+  return client.post("/auth/logout");
+}
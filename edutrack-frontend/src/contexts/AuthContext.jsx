@@ -1,4 +1,5 @@
 import React, { createContext, useContext, useMemo, useState } from "react";
+import { logoutRequest } from "../api/authClient";
 
 const AuthContext = createContext(null);
 
@@ -20,6 +21,9 @@ export function AuthProvider({ children }) {
   };
 
   const logout = () => {
+    if (localStorage.getItem("edutrack_token")) {
+      logoutRequest().catch(() => {});
+    }
     setUser(null);
     localStorage.removeItem(STORAGE_KEY);
     localStorage.removeItem("edutrack_token");
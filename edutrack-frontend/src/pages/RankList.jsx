@@ -1,6 +1,9 @@
 import React, { useEffect, useMemo, useState } from "react";
 import client from "../api/api";
 
+const SEARCH_LIMIT = 25;
+const SEARCH_DEBOUNCE_MS = 200;
+
 const FALLBACK_ROWS = [
   {
     rank: 1,
@@ -34,6 +37,16 @@ function scoreTone(score) {
   return "text-rose-300";
 }
 
+function formatDrivers(drivers) {
+  if (!drivers.length) return "-";
+  return drivers
+    .map((d) => {
+      const label = String(d.feature).replace(/_/g, " ");
+      return d.share == null ? label : `${label} ${Math.round(Number(d.share) * 100)}%`;
+    })
+    .join(", ");
+}
+
 function normalizeRow(item) {
   return {
     rank: Number(item.rank ?? item.Rank ?? 0),
@@ -42,6 +55,7 @@ function normalizeRow(item) {
     risk_score: Number(item.risk_score ?? item.Risk_Score ?? 0),
     rank_score: Number(item.rank_score ?? item.Rank_Score ?? 0),
     submission_count: item.submission_count ?? null,
+    risk_drivers: Array.isArray(item.risk_drivers) ? item.risk_drivers : [],
   };
 }
 
@@ -50,6 +64,8 @@ export default function RankList() {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
   const [source, setSource] = useState("-");
+  const [query, setQuery] = useState("");
+  const [searchRows, setSearchRows] = useState(null);
 
   useEffect(() => {
     let mounted = true;
@@ -82,6 +98,36 @@ export default function RankList() {
     };
   }, []);
 
+  useEffect(() => {
+    const q = query.trim();
+    if (!q) {
+      setSearchRows(null);
+      return undefined;
+    }
+
+    let active = true;
+    const timer = setTimeout(async () => {
+      try {
+        const params = new URLSearchParams({ q, limit: String(SEARCH_LIMIT) });
+        const resp = await client.get(`/institutions/search?${params.toString()}`);
+        if (!active) return;
+        const rawItems = Array.isArray(resp?.data?.items) ? resp.data.items : [];
+        setSearchRows(rawItems.map(normalizeRow).filter((r) => r.institution));
+      } catch {
+        if (!active) return;
+        const needle = q.toLowerCase();
+        setSearchRows(rows.filter((r) => r.institution.toLowerCase().includes(needle)).slice(0, SEARCH_LIMIT));
+      }
+    }, SEARCH_DEBOUNCE_MS);
+
+    return () => {
+      active = false;
+      clearTimeout(timer);
+    };
+  }, [query, rows]);
+
+  const visibleRows = searchRows ?? rows;
+
   const summary = useMemo(() => {
     if (!rows.length) return { total: 0, topScore: 0, avgScore: 0 };
     const total = rows.length;
@@ -112,6 +158,15 @@ export default function RankList() {
 
       {error && <div className="mt-4 panel-soft px-4 py-3 text-sm text-amber-200">{error}</div>}
 
+      <div className="mt-4">
+        <input
+          value={query}
+          onChange={(e) => setQuery(e.target.value)}
+          placeholder="Search institutions (typos are fine)"
+          className="w-full md:w-[28rem] rounded-lg bg-black/20 border border-slate-700 px-3 py-2 text-sm"
+        />
+      </div>
+
       <section className="mt-4 panel-soft overflow-hidden">
         {loading ? (
           <div className="p-8 text-center text-slate-300">Loading rank list...</div>
@@ -124,17 +179,19 @@ export default function RankList() {
                   <th className="px-4 py-3">Institution</th>
                   <th className="px-4 py-3">Avg DSS</th>
                   <th className="px-4 py-3">Risk Score</th>
+                  <th className="px-4 py-3">Risk Drivers</th>
                   <th className="px-4 py-3">Rank Score</th>
                   <th className="px-4 py-3">Submissions</th>
                 </tr>
               </thead>
               <tbody>
-                {rows.map((r) => (
+                {visibleRows.map((r) => (
                   <tr key={`${r.institution}-${r.rank}`} className="border-b border-slate-800/60 hover:bg-slate-800/25">
                     <td className="px-4 py-3 font-semibold">#{r.rank}</td>
                     <td className="px-4 py-3">{r.institution}</td>
                     <td className="px-4 py-3">{r.avg_dss_score}</td>
                     <td className="px-4 py-3">{r.risk_score}</td>
+                    <td className="px-4 py-3 text-xs text-slate-300">{formatDrivers(r.risk_drivers)}</td>
                     <td className={`px-4 py-3 font-semibold ${scoreTone(Number(r.rank_score || 0))}`}>{r.rank_score}</td>
                     <td className="px-4 py-3">{r.submission_count ?? "-"}</td>
                   </tr>
@@ -1,5 +1,5 @@
 import React, { useEffect, useMemo, useState } from "react";
-import client from "../api/api";
+import client, { openEventStream } from "../api/api";
 
 const FALLBACK_SUBMISSIONS = [
   {
@@ -90,15 +90,37 @@ function safeDate(dateValue) {
   return d.toLocaleDateString();
 }
 
+const QUEUE_PAGE_SIZE = 50;
+
+function summarize(rows) {
+  const total = rows.length;
+  const pending = rows.filter((r) => r.status === "needs_manual_review").length;
+  const low = rows.filter((r) => r.status === "low_confidence").length;
+  const avg = total ? Math.round(rows.reduce((acc, cur) => acc + Number(cur.dss || 0), 0) / total) : 0;
+  return { total, pending, low, avg };
+}
+
 export default function ReviewerQueue() {
   const [loading, setLoading] = useState(true);
   const [rows, setRows] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [summary, setSummary] = useState(null);
   const [selected, setSelected] = useState(null);
   const [actionLoading, setActionLoading] = useState(false);
   const [note, setNote] = useState("");
 
   const [search, setSearch] = useState("");
   const [statusFilter, setStatusFilter] = useState("all");
+  const [reloadKey, setReloadKey] = useState(0);
+
+  async function fetchPage(cursor) {
+    const params = new URLSearchParams({ limit: String(QUEUE_PAGE_SIZE) });
+    if (statusFilter !== "all") params.set("status", statusFilter);
+    if (cursor) params.set("cursor", cursor);
+    const resp = await client.get(`/reviewer/queue?${params.toString()}`);
+    return resp.data;
+  }
 
   useEffect(() => {
     let mounted = true;
@@ -106,12 +128,18 @@ export default function ReviewerQueue() {
     async function loadQueue() {
       setLoading(true);
       try {
-        const resp = await client.get("/reviewer/queue");
+        const page = await fetchPage(null);
         if (!mounted) return;
-        const payload = Array.isArray(resp.data) ? resp.data : FALLBACK_SUBMISSIONS;
-        setRows(payload.length ? payload : FALLBACK_SUBMISSIONS);
+        if (!Array.isArray(page?.items)) throw new Error("Unexpected queue payload");
+        setRows(page.items);
+        setNextCursor(page.next_cursor || null);
+        setSummary(page);
       } catch {
-        if (mounted) setRows(FALLBACK_SUBMISSIONS);
+        if (mounted) {
+          setRows(FALLBACK_SUBMISSIONS);
+          setNextCursor(null);
+          setSummary(null);
+        }
       } finally {
         if (mounted) setLoading(false);
       }
@@ -121,8 +149,44 @@ export default function ReviewerQueue() {
     return () => {
       mounted = false;
     };
+  }, [statusFilter, reloadKey]);
+
+  useEffect(() => {
+    if (typeof EventSource === "undefined") return undefined;
+
+    function upsert(event, prepend) {
+      const item = JSON.parse(event.data);
+      setRows((cur) => {
+        const idx = cur.findIndex((row) => row.id === item.id);
+        if (idx === -1) return prepend ? [item, ...cur] : cur;
+        const next = cur.slice();
+        next[idx] = item;
+        return next;
+      });
+    }
+
+    return openEventStream("/events/submissions", {
+      "submission.created": (e) => upsert(e, true),
+      "submission.updated": (e) => upsert(e, false),
+      // The server could not replay the events we missed; start over from page one.
+      reset: () => setReloadKey((k) => k + 1),
+    });
   }, []);
 
+  async function loadMore() {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(nextCursor);
+      setRows((cur) => [...cur, ...(page.items || [])]);
+      setNextCursor(page.next_cursor || null);
+    } catch {
+      setNextCursor(null);
+    } finally {
+      setLoadingMore(false);
+    }
+  }
+
   const filteredRows = useMemo(() => {
     const q = search.trim().toLowerCase();
 
@@ -135,18 +199,19 @@ export default function ReviewerQueue() {
           String(item.institution || "").toLowerCase().includes(q) ||
           String(item.doc_type || "").toLowerCase().includes(q)
         );
-      })
-      .sort((a, b) => new Date(b.uploaded_at) - new Date(a.uploaded_at));
+      });
   }, [rows, search, statusFilter]);
 
   const metrics = useMemo(() => {
-    const total = rows.length;
-    const pending = rows.filter((r) => r.status === "needs_manual_review").length;
-    const low = rows.filter((r) => r.status === "low_confidence").length;
-    const avg = total ? Math.round(rows.reduce((acc, cur) => acc + Number(cur.dss || 0), 0) / total) : 0;
-
-    return { total, pending, low, avg };
-  }, [rows]);
+    if (!summary) return summarize(rows);
+    const counts = summary.status_counts || {};
+    return {
+      total: summary.total ?? rows.length,
+      pending: counts.needs_manual_review || 0,
+      low: counts.low_confidence || 0,
+      avg: Math.round(Number(summary.avg_dss || 0)),
+    };
+  }, [rows, summary]);
 
   async function applyAction(submissionId, action) {
     setActionLoading(true);
@@ -242,6 +307,13 @@ export default function ReviewerQueue() {
             </tbody>
           </table>
         )}
+        {!loading && nextCursor && (
+          <div className="p-4 text-center">
+            <button onClick={loadMore} disabled={loadingMore} className="px-3 py-2 rounded bg-slate-700 text-sm disabled:opacity-50">
+              {loadingMore ? "Loading..." : "Load more"}
+            </button>
+          </div>
+        )}
       </div>
 
       {selected && (
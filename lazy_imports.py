@@ -0,0 +1,76 @@
+"""
+Deferred imports for heavy dependencies - lazy_imports.py
+
+Provides:
+- lazy_module(name): a stand-in for module `name` that imports it on first
+  attribute access; raises ModuleNotFoundError right away if it is not
+  installed, like a plain import would
+- optional_module(name): the same, or None when it is not installed
+- is_loaded(name): whether the real module has been imported yet
+
+Whether a package is installed is answered by importlib.util.find_spec on
+its top-level name, which reads no package code. Anything that is imported
+only to be available later (pandas, scikit-learn, Tesseract bindings,
+embedding runtimes) is loaded by the first request that needs it, not by
+every worker at start-up.
+"""
+
+from typing import Any, Callable, Optional
+import importlib
+import importlib.util
+import sys
+import threading
+
+
+class LazyModule:
+    __slots__ = ("_lazy_name", "_lazy_module", "_lazy_on_load", "_lazy_lock")
+
+    def __init__(self, name: str, on_load: Optional[Callable[[Any], None]] = None):
+        self._lazy_name = name
+        self._lazy_module = None
+        self._lazy_on_load = on_load
+        self._lazy_lock = threading.Lock()
+
+    def _load(self) -> Any:
+        module = self._lazy_module
+        if module is None:
+            with self._lazy_lock:
+                module = self._lazy_module
+                if module is None:
+                    module = importlib.import_module(self._lazy_name)
+                    if self._lazy_on_load is not None:
+                        self._lazy_on_load(module)
+                    self._lazy_module = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._lazy_module is not None else "not loaded"
+        return f"<lazy module {self._lazy_name!r} ({state})>"
+
+
+def _installed(name: str) -> bool:
+    top = name.partition(".")[0]
+    if top in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(top) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def lazy_module(name: str, on_load: Optional[Callable[[Any], None]] = None) -> LazyModule:
+    """`on_load(module)` runs once, right after the real import (e.g. to configure it)."""
+    if not _installed(name):
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    return LazyModule(name, on_load)
+
+
+def optional_module(name: str, on_load: Optional[Callable[[Any], None]] = None) -> Optional[LazyModule]:
+    return LazyModule(name, on_load) if _installed(name) else None
+
+
+def is_loaded(name: str) -> bool:
+    return name in sys.modules
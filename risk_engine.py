@@ -1,65 +1,193 @@
 # risk_engine.py
 
-import pandas as pd
+import os
+import csv
+import heapq
+import struct
+import tempfile
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+
 import numpy as np
-import joblib
-from sklearn.ensemble import IsolationForest
-from sklearn.preprocessing import StandardScaler
+
+import columnar_store
+from lazy_imports import lazy_module
+
+# Scoring reads the compact .npz with numpy alone; pandas and scikit-learn are
+# loaded by the first training / CSV call (and joblib by the pickle fallback).
+pd = lazy_module("pandas")
+joblib = lazy_module("joblib")
+sklearn_ensemble = lazy_module("sklearn.ensemble")
+sklearn_preprocessing = lazy_module("sklearn.preprocessing")
 
 MODEL_PATH = "risk_model.pkl"
 SCALER_PATH = "scaler.pkl"
+COMPACT_MODEL_PATH = "risk_model.npz"
+COMPACT_FORMAT_VERSION = 2
+PREDICTION_CACHE_SIZE = int(os.getenv("EDUTRACK_RISK_CACHE_SIZE", "4096"))
+PREDICTION_CACHE_DECIMALS = 6
+ATTRIBUTION_CHUNK_ROWS = 1024
+CSV_CHUNK_ROWS = 100_000
+TRAIN_SAMPLE_ROWS = 200_000
+
+FEATURES = [
+    "Placement_Rate",
+    "Fund_Utilization",
+    "Student_Faculty_Ratio",
+    "Infra_Per_Student",
+    "Avg_Doc_DSS",
+    "Missing_Doc_Count"
+]
+
+# Only these CSV columns are read; everything else in college_data.csv is skipped.
+RAW_COLUMNS = [
+    "Total_Students",
+    "Total_Faculty",
+    "Infrastructure_Area",
+    "Placement_Rate",
+    "Fund_Utilization",
+    "Avg_Doc_DSS",
+    "Missing_Doc_Count"
+]
+CSV_DTYPES = {col: "float32" for col in RAW_COLUMNS}
 
 # -------------------------------
 # TRAINING
 # -------------------------------
 
-def train_model(csv_path="college_data.csv"):
-    """
-    Trains an Isolation Forest model to detect risky / anomalous colleges.
-    Uses ONLY college-level aggregated metrics.
-    """
-
-    print("📥 Loading college dataset...")
-    df = pd.read_csv(csv_path)
-
-    # -------------------------------
-    # Feature Engineering
-    # -------------------------------
-
+def _derive_features(df: "pd.DataFrame") -> "pd.DataFrame":
     df["Student_Faculty_Ratio"] = df["Total_Students"] / df["Total_Faculty"].replace(0, np.nan)
     df["Infra_Per_Student"] = df["Infrastructure_Area"] / df["Total_Students"].replace(0, np.nan)
+    return df[FEATURES].fillna(0).astype(np.float32)
 
-    df.fillna(0, inplace=True)
 
-    FEATURES = [
-        "Placement_Rate",
-        "Fund_Utilization",
-        "Student_Faculty_Ratio",
-        "Infra_Per_Student",
-        "Avg_Doc_DSS",
-        "Missing_Doc_Count"
-    ]
+def load_training_features(csv_path="college_data.csv") -> "pd.DataFrame":
+    """
+    Reads only the columns the model needs, as float32, and returns the
+    engineered FEATURES frame.
+    """
+    df = pd.read_csv(csv_path, usecols=RAW_COLUMNS, dtype=CSV_DTYPES)
+    return _derive_features(df)
 
-    X = df[FEATURES]
 
-    # -------------------------------
-    # Scaling
-    # -------------------------------
+def iter_feature_chunks(csv_path="college_data.csv", chunksize=CSV_CHUNK_ROWS, extra_columns=()):
+    """
+    Streams the dataset (CSV, or Parquet / Arrow IPC by extension) in typed
+    chunks of `chunksize` rows, reading only the needed columns. Yields
+    (features, extra) per chunk: the float32 FEATURES frame and a frame of
+    `extra_columns` (ids, names) as strings, or None if none asked for.
+    """
+    extra_columns = list(extra_columns)
+    dtypes = dict(CSV_DTYPES)
+    dtypes.update({col: str for col in extra_columns})
+    usecols = RAW_COLUMNS + [c for c in extra_columns if c not in RAW_COLUMNS]
+    for chunk in columnar_store.iter_frames(csv_path, usecols, chunksize, dtypes):
+        extra = chunk[extra_columns].reset_index(drop=True) if extra_columns else None
+        yield _derive_features(chunk).reset_index(drop=True), extra
+
+
+class _Reservoir:
+    """Uniform sample of at most `capacity` rows from a stream (Algorithm R, per chunk)."""
+
+    def __init__(self, capacity, n_features, seed=42):
+        self.rows = np.empty((capacity, n_features), dtype=np.float32)
+        self.capacity = capacity
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+
+    def add(self, block):
+        n = len(block)
+        fill = min(n, max(0, self.capacity - self.seen))
+        if fill:
+            self.rows[self.seen:self.seen + fill] = block[:fill]
+        rest = block[fill:]
+        if len(rest):
+            # Row i (0-based in the stream) replaces a random slot with probability k / (i + 1).
+            positions = np.arange(self.seen + fill, self.seen + n)
+            slots = self._rng.integers(0, positions + 1)
+            keep = slots < self.capacity
+            self.rows[slots[keep]] = rest[keep]
+        self.seen += n
+
+    def sample(self):
+        return self.rows[:min(self.seen, self.capacity)]
+
+
+def train_model(
+    csv_path="college_data.csv",
+    n_estimators=200,
+    max_samples="auto",
+    n_jobs=-1,
+    warm_start=False,
+    extra_estimators=50,
+    chunksize=CSV_CHUNK_ROWS,
+    sample_rows=TRAIN_SAMPLE_ROWS,
+):
+    """
+    Trains an Isolation Forest model to detect risky / anomalous colleges.
+    Uses ONLY college-level aggregated metrics.
 
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
+    The CSV is streamed in `chunksize`-row chunks: the scaler is fitted
+    incrementally (partial_fit) over every row, while the forest is fitted
+    on a uniform reservoir of at most `sample_rows` rows (each tree only
+    draws max_samples rows anyway). Files up to `sample_rows` rows are used
+    whole, so memory stays flat as the history grows.
+
+    max_samples: rows drawn per tree ("auto" = min(256, n_rows)); smaller
+    values train faster and often isolate anomalies just as well.
+    warm_start: keep the existing trees and scaler from MODEL_PATH /
+    SCALER_PATH and grow `extra_estimators` new trees on this CSV (e.g. a
+    new year of data) instead of retraining from scratch. `max_samples`
+    applies to the new trees; as in sklearn, the whole forest's path
+    lengths are then normalized by it. The report's "warm_start" says
+    whether existing trees were actually reused.
+
+    Returns a report with timings and artifact sizes.
+    """
+
+    print("📥 Loading college dataset...")
+    t0 = time.perf_counter()
+    reuse = warm_start and os.path.exists(MODEL_PATH) and os.path.exists(SCALER_PATH)
+    if warm_start and not reuse:
+        print("⚠️ No existing model to warm start from; training from scratch")
+
+    # Existing trees were grown in the saved scaler's space, so keep it fixed.
+    scaler = joblib.load(SCALER_PATH) if reuse else sklearn_preprocessing.StandardScaler()
+    reservoir = _Reservoir(int(sample_rows), len(FEATURES))
+    for features, _ in iter_feature_chunks(csv_path, chunksize):
+        if not reuse:
+            scaler.partial_fit(features)
+        reservoir.add(features.to_numpy())
+    X = pd.DataFrame(reservoir.sample(), columns=FEATURES)
+    load_seconds = time.perf_counter() - t0
 
     # -------------------------------
-    # Model Training
+    # Scaling + Model Training
     # -------------------------------
 
-    model = IsolationForest(
-        n_estimators=200,
-        contamination=0.08,   # expected risky institutions
-        random_state=42
-    )
+    t0 = time.perf_counter()
+    X_scaled = scaler.transform(X)
+    if reuse:
+        model = joblib.load(MODEL_PATH)
+        model.set_params(
+            warm_start=True,
+            n_estimators=len(model.estimators_) + int(extra_estimators),
+            max_samples=max_samples,
+            n_jobs=n_jobs,
+        )
+    else:
+        model = sklearn_ensemble.IsolationForest(
+            n_estimators=n_estimators,
+            max_samples=max_samples,
+            contamination=0.08,   # expected risky institutions
+            n_jobs=n_jobs,
+            random_state=42
+        )
 
     model.fit(X_scaled)
+    fit_seconds = time.perf_counter() - t0
 
     # -------------------------------
     # Save artifacts
@@ -67,115 +195,656 @@ def train_model(csv_path="college_data.csv"):
 
     joblib.dump(model, MODEL_PATH)
     joblib.dump(scaler, SCALER_PATH)
+    export_compact_model(model, scaler)
+
+    report = {
+        "rows": int(reservoir.seen),
+        "sampled_rows": int(len(X)),
+        "n_estimators": len(model.estimators_),
+        "max_samples": int(model.max_samples_),
+        "warm_start": bool(reuse),
+        "load_seconds": round(load_seconds, 4),
+        "fit_seconds": round(fit_seconds, 4),
+        "model_bytes": os.path.getsize(MODEL_PATH),
+        "scaler_bytes": os.path.getsize(SCALER_PATH),
+        "compact_bytes": os.path.getsize(COMPACT_MODEL_PATH),
+    }
 
     print("✅ Risk model trained successfully")
-    print("💾 Saved: risk_model.pkl, scaler.pkl")
+    print(
+        f"💾 Saved: {MODEL_PATH} ({report['model_bytes'] / 1024:.1f} KiB), {SCALER_PATH}, "
+        f"{COMPACT_MODEL_PATH} ({report['compact_bytes'] / 1024:.1f} KiB)"
+    )
+    print(
+        f"⏱️ {report['rows']} rows ({report['sampled_rows']} sampled), {report['n_estimators']} trees: "
+        f"load {report['load_seconds']}s, fit {report['fit_seconds']}s"
+    )
+    return report
 
 
 # -------------------------------
-# PREDICTION
+# COMPACT MODEL ARTIFACT
 # -------------------------------
 
-def predict_risk(metrics_json: dict):
-    """
-    Predicts institutional risk.
+def _average_path_length(n_samples):
+    """c(n): expected path length of an unsuccessful BST search (same as sklearn)."""
+    n = np.asarray(n_samples, dtype=np.float64)
+    out = np.zeros_like(n)
+    out[n == 2] = 1.0
+    big = n > 2
+    out[big] = 2.0 * (np.log(n[big] - 1.0) + np.euler_gamma) - 2.0 * (n[big] - 1.0) / n[big]
+    return out
 
-    Input (example):
-    {
-        "Total_Students": 1200,
-        "Total_Faculty": 40,
-        "Placement_Rate": 55,
-        "Fund_Utilization": 78,
-        "Infrastructure_Area": 3500,
-        "Avg_Doc_DSS": 62,
-        "Missing_Doc_Count": 2
+
+def _flatten_forest(model, scaler):
+    """
+    Flattens a fitted forest and scaler into the compact array layout:
+
+    - left / right / feature (int32), threshold (float64): all trees'
+      nodes concatenated, child indices global, left == -1 marks a leaf
+    - leaf_value (float64): depth + c(n_node_samples) - 1 per leaf, i.e.
+      the path length a sample reaching that leaf contributes
+    - roots (int32): node index of each tree's root
+    - log_samples (float64): log(n_node_samples), for feature attribution
+    - scaler_mean / scaler_scale, offset, denominator: scoring constants
+    """
+    n_features = int(model.n_features_in_)
+    subsample = int(model._max_features) != n_features
+
+    lefts, rights, features, thresholds, leaf_values, log_samples, roots = [], [], [], [], [], [], []
+    base = 0
+    for tree, tree_features in zip(model.estimators_, model.estimators_features_):
+        t = tree.tree_
+        left = t.children_left.astype(np.int64)
+        right = t.children_right.astype(np.int64)
+        is_leaf = left == -1
+
+        depth = np.zeros(t.node_count, dtype=np.float64)
+        depth[0] = 1.0  # sklearn counts the root as depth 1
+        for node in range(t.node_count):  # children always follow their parent
+            if not is_leaf[node]:
+                depth[left[node]] = depth[node] + 1.0
+                depth[right[node]] = depth[node] + 1.0
+
+        feature = np.where(is_leaf, 0, t.feature).astype(np.int64)
+        if subsample:
+            feature = np.asarray(tree_features, dtype=np.int64)[feature]
+
+        lefts.append(np.where(is_leaf, -1, left + base))
+        rights.append(np.where(is_leaf, -1, right + base))
+        features.append(feature)
+        thresholds.append(np.where(is_leaf, 0.0, t.threshold))
+        leaf_values.append(np.where(is_leaf, depth + _average_path_length(t.n_node_samples) - 1.0, 0.0))
+        log_samples.append(np.log(t.n_node_samples.astype(np.float64)))
+        roots.append(base)
+        base += t.node_count
+
+    max_samples = getattr(model, "_max_samples", model.max_samples_)
+    denominator = len(model.estimators_) * float(_average_path_length([max_samples])[0])
+
+    return {
+        "format_version": np.array([COMPACT_FORMAT_VERSION], dtype=np.int32),
+        "features": np.array(FEATURES),
+        "left": np.concatenate(lefts).astype(np.int32),
+        "right": np.concatenate(rights).astype(np.int32),
+        "feature": np.concatenate(features).astype(np.int32),
+        "threshold": np.concatenate(thresholds).astype(np.float64),
+        "leaf_value": np.concatenate(leaf_values).astype(np.float64),
+        "roots": np.array(roots, dtype=np.int32),
+        "log_samples": np.concatenate(log_samples),
+        "scaler_mean": np.asarray(scaler.mean_, dtype=np.float64),
+        "scaler_scale": np.asarray(scaler.scale_, dtype=np.float64),
+        "offset": np.array([model.offset_], dtype=np.float64),
+        "denominator": np.array([denominator], dtype=np.float64),
     }
+
+
+def export_compact_model(model=None, scaler=None, path=None):
     """
+    Writes _flatten_forest's arrays to one .npz. Members are stored
+    uncompressed so load_compact_model can mmap them.
+    """
+    model = model if model is not None else joblib.load(MODEL_PATH)
+    scaler = scaler if scaler is not None else joblib.load(SCALER_PATH)
+    path = path or COMPACT_MODEL_PATH
+    np.savez(path, **_flatten_forest(model, scaler))
+    return path
+
 
+def _mmap_npz(path):
+    """
+    Memory-maps each member of an uncompressed .npz in place. np.load
+    ignores mmap_mode for .npz archives, so the member offsets are read
+    from the zip local headers and handed to np.memmap directly.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as f:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path}: member {info.filename} is compressed; cannot mmap")
+            f.seek(info.header_offset)
+            local_header = f.read(30)
+            name_len, extra_len = struct.unpack("<HH", local_header[26:30])
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            arrays[info.filename[:-4]] = np.memmap(
+                path,
+                dtype=dtype,
+                mode="r",
+                shape=shape,
+                offset=f.tell(),
+                order="F" if fortran_order else "C",
+            )
+    return arrays
+
+
+class CompactRiskModel:
+    """
+    Pure-NumPy isolation-forest scorer over the arrays written by
+    export_compact_model. Matches IsolationForest.score_samples /
+    decision_function / predict for the same scaler and forest.
+    """
+
+    def __init__(self, arrays, version=None):
+        fmt = int(np.asarray(arrays["format_version"])[0])
+        if fmt != COMPACT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact model format {fmt}")
+        self.version = version
+        self.feature_names = [str(f) for f in arrays["features"]]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.leaf_value = arrays["leaf_value"]
+        self.roots = np.asarray(arrays["roots"], dtype=np.int64)
+        self.log_samples = arrays["log_samples"]
+        self.scaler_mean = np.asarray(arrays["scaler_mean"])
+        self.scaler_scale = np.asarray(arrays["scaler_scale"])
+        self.offset = float(np.asarray(arrays["offset"])[0])
+        self.denominator = float(np.asarray(arrays["denominator"])[0])
+
+    @classmethod
+    def load(cls, path=None, mmap=True):
+        path = path or COMPACT_MODEL_PATH
+        stat = os.stat(path)
+        version = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        if mmap:
+            return cls(_mmap_npz(path), version=version)
+        with np.load(path) as data:
+            return cls({k: data[k] for k in data.files}, version=version)
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def transform(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        # IsolationForest validates its input as float32 before walking trees.
+        return ((X - self.scaler_mean) / self.scaler_scale).astype(np.float32)
+
+    def path_lengths(self, X_scaled):
+        return self._traverse(X_scaled, explain=False)[0]
+
+    def _traverse(self, X_scaled, explain):
+        """
+        Summed path length per row over all trees. Every (row, tree) pair
+        advances one level per iteration; pairs that reach a leaf drop out
+        of the active set, so each level costs one gather over what is left.
+
+        With explain=True, also returns per-row feature contributions: each
+        split on a pair's path credits its feature with
+        log(n_samples(node) / n_samples(child taken)), i.e. how much of the
+        training sample that split cut away from the row. Per tree these sum
+        to log(n_root / n_leaf); rows are normalized to sum to 1.
+        """
+        n_rows, n_trees = X_scaled.shape[0], self.n_trees
+        node = np.tile(self.roots, n_rows)
+        row = np.repeat(np.arange(n_rows), n_trees)
+        active = np.arange(node.size)
+        visited_pairs, visited_features, visited_weights = [], [], []
+        while active.size:
+            cur = node[active]
+            left = self.left[cur]
+            inner = left != -1
+            if not inner.all():
+                active, cur, left = active[inner], cur[inner], left[inner]
+                if not active.size:
+                    break
+            feature = self.feature[cur]
+            go_left = X_scaled[row[active], feature] <= self.threshold[cur]
+            nxt = np.where(go_left, left, self.right[cur])
+            if explain:
+                visited_pairs.append(active)
+                visited_features.append(feature)
+                visited_weights.append(self.log_samples[cur] - self.log_samples[nxt])
+            node[active] = nxt
+
+        depths = self.leaf_value[node].reshape(n_rows, n_trees).sum(axis=1)
+        if not explain:
+            return depths, None
+
+        n_features = len(self.feature_names)
+        contributions = np.zeros((n_rows, n_features), dtype=np.float64)
+        if visited_pairs:
+            pairs = np.concatenate(visited_pairs)
+            features = np.concatenate(visited_features)
+            contributions = np.bincount(
+                row[pairs] * n_features + features,
+                weights=np.concatenate(visited_weights),
+                minlength=n_rows * n_features,
+            ).reshape(n_rows, n_features)
+            totals = contributions.sum(axis=1, keepdims=True)
+            np.divide(contributions, totals, out=contributions, where=totals > 0)
+        return depths, contributions
+
+    def score(self, X, explain=False):
+        """
+        (decision_function, predict) for X in a single traversal, plus the
+        (n_rows, n_features) contribution matrix when explain=True.
+        """
+        X_scaled = self.transform(X)
+        if explain:
+            # Bound the visited-split buffers on large batches.
+            parts = [
+                self._traverse(X_scaled[start:start + ATTRIBUTION_CHUNK_ROWS], explain=True)
+                for start in range(0, X_scaled.shape[0], ATTRIBUTION_CHUNK_ROWS)
+            ]
+            depths = np.concatenate([p[0] for p in parts]) if parts else np.zeros(0)
+            contributions = (
+                np.concatenate([p[1] for p in parts])
+                if parts
+                else np.zeros((0, len(self.feature_names)))
+            )
+        else:
+            depths, contributions = self._traverse(X_scaled, explain=False)
+
+        if self.denominator == 0:
+            scores = -np.ones_like(depths)
+        else:
+            scores = -(2.0 ** (-depths / self.denominator))
+        decision = scores - self.offset
+        labels = np.where(decision < 0, -1, 1)
+        if explain:
+            return decision, labels, contributions
+        return decision, labels
+
+    def score_samples(self, X):
+        return self.decision_function(X) + self.offset
+
+    def decision_function(self, X):
+        return self.score(X)[0]
+
+    def predict(self, X):
+        return self.score(X)[1]
+
+
+_compact_lock = threading.Lock()
+_compact_model = None
+
+
+def load_compact_model(path=None):
+    """
+    Returns the mmapped compact model, reloading only when the file's
+    mtime/size changes. None if no compact artifact exists.
+    """
+    global _compact_model
+    path = path or COMPACT_MODEL_PATH
     try:
-        model = joblib.load(MODEL_PATH)
-        scaler = joblib.load(SCALER_PATH)
+        stat = os.stat(path)
     except FileNotFoundError:
-        return {"error": "Risk model not trained. Run train_model() first."}
+        return None
+    version = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    cached = _compact_model
+    if cached is not None and cached.version == version:
+        return cached
+    with _compact_lock:
+        if _compact_model is None or _compact_model.version != version:
+            _compact_model = CompactRiskModel.load(path)
+        return _compact_model
+
 
+# -------------------------------
+# PREDICTION CACHE
+# -------------------------------
+
+class PredictionCache:
+    """
+    Size-bounded LRU of model outputs keyed on the quantized feature row.
+    Entries belong to one model version; the first lookup under a new
+    version (retrained or reloaded artifact) drops everything.
+    """
+
+    def __init__(self, maxsize=PREDICTION_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, version, key):
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._version = version
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, version, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if version != self._version:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+
+_prediction_cache = PredictionCache()
+
+
+def prediction_cache_stats():
+    return _prediction_cache.stats()
+
+
+def clear_prediction_cache():
+    _prediction_cache.clear()
+
+
+_pickle_scorer = None
+
+
+def _load_scorer():
+    """
+    The CompactRiskModel predict_risk uses: the mmapped .npz if present,
+    else the pickles flattened in memory (rebuilt when they change).
+    None when no model has been trained. Its .version keys the cache.
+    """
+    global _pickle_scorer
+    compact = load_compact_model()
+    if compact is not None:
+        return compact
     try:
-        # -------------------------------
-        # Input parsing
-        # -------------------------------
-
-        students = float(metrics_json["Total_Students"])
-        faculty = float(metrics_json["Total_Faculty"])
-        placement = float(metrics_json["Placement_Rate"])
-        funds = float(metrics_json["Fund_Utilization"])
-        infra = float(metrics_json["Infrastructure_Area"])
-        avg_dss = float(metrics_json["Avg_Doc_DSS"])
-        missing_docs = int(metrics_json["Missing_Doc_Count"])
-
-        sf_ratio = students / faculty if faculty > 0 else 999
-        infra_per_student = infra / students if students > 0 else 0
-
-        feature_names = [
-            "Placement_Rate",
-            "Fund_Utilization",
-            "Student_Faculty_Ratio",
-            "Infra_Per_Student",
-            "Avg_Doc_DSS",
-            "Missing_Doc_Count"
-        ]
-
-        input_df = pd.DataFrame(
-            [[placement, funds, sf_ratio, infra_per_student, avg_dss, missing_docs]],
-            columns=feature_names
-        )
+        model_stat = os.stat(MODEL_PATH)
+        scaler_stat = os.stat(SCALER_PATH)
+    except FileNotFoundError:
+        return None
+    version = (
+        os.path.abspath(MODEL_PATH),
+        model_stat.st_mtime_ns,
+        model_stat.st_size,
+        scaler_stat.st_mtime_ns,
+    )
+    cached = _pickle_scorer
+    if cached is not None and cached.version == version:
+        return cached
+    with _compact_lock:
+        if _pickle_scorer is None or _pickle_scorer.version != version:
+            arrays = _flatten_forest(joblib.load(MODEL_PATH), joblib.load(SCALER_PATH))
+            _pickle_scorer = CompactRiskModel(arrays, version=version)
+        return _pickle_scorer
+
+
+# -------------------------------
+# PREDICTION
+# -------------------------------
+
+def _parse_metrics(metrics_json: dict):
+    students = float(metrics_json["Total_Students"])
+    faculty = float(metrics_json["Total_Faculty"])
+    placement = float(metrics_json["Placement_Rate"])
+    funds = float(metrics_json["Fund_Utilization"])
+    infra = float(metrics_json["Infrastructure_Area"])
+    avg_dss = float(metrics_json["Avg_Doc_DSS"])
+    missing_docs = int(metrics_json["Missing_Doc_Count"])
 
-        input_scaled = scaler.transform(input_df)
+    sf_ratio = students / faculty if faculty > 0 else 999
+    infra_per_student = infra / students if students > 0 else 0
 
-        # -------------------------------
-        # Model Prediction
-        # -------------------------------
+    return [placement, funds, sf_ratio, infra_per_student, avg_dss, missing_docs]
 
-        prediction = model.predict(input_scaled)[0]     # -1 = anomaly
-        anomaly_score = model.decision_function(input_scaled)[0]
 
-        # -------------------------------
-        # Risk Score Mapping (0–100)
-        # -------------------------------
+def _build_result(features, anomaly_score, prediction, contributions):
+    placement, _, sf_ratio, _, avg_dss, missing_docs = features
+
+    # -------------------------------
+    # Risk Score Mapping (0–100)
+    # -------------------------------
 
-        # Lower decision_function → more risky
-        normalized = np.clip((anomaly_score + 0.25) / 0.5, 0, 1)
-        risk_score = round(100 * (1 - normalized), 2)
+    # Lower decision_function → more risky
+    normalized = np.clip((anomaly_score + 0.25) / 0.5, 0, 1)
+    risk_score = round(100 * (1 - normalized), 2)
 
-        # -------------------------------
-        # Explainable Flags
-        # -------------------------------
+    # -------------------------------
+    # Explainable Flags
+    # -------------------------------
 
-        flags = []
+    flags = []
 
-        if sf_ratio > 40:
-            flags.append(f"Critical student–faculty ratio ({sf_ratio:.1f}:1)")
+    if sf_ratio > 40:
+        flags.append(f"Critical student–faculty ratio ({sf_ratio:.1f}:1)")
 
-        if placement < 35:
-            flags.append(f"Low placement rate ({placement}%)")
+    if placement < 35:
+        flags.append(f"Low placement rate ({placement}%)")
 
-        if avg_dss < 60:
-            flags.append("Poor average document compliance score")
+    if avg_dss < 60:
+        flags.append("Poor average document compliance score")
 
-        if missing_docs >= 2:
-            flags.append(f"{missing_docs} mandatory documents missing")
+    if missing_docs >= 2:
+        flags.append(f"{missing_docs} mandatory documents missing")
 
-        if prediction == -1:
-            flags.append("AI detected anomalous institutional patterns")
+    if prediction == -1:
+        flags.append("AI detected anomalous institutional patterns")
 
-        status = "High Risk" if prediction == -1 or risk_score > 70 else "Normal"
+    status = "High Risk" if prediction == -1 or risk_score > 70 else "Normal"
 
-        return {
-            "risk_score": risk_score,
-            "status": status,
-            "flags": flags
-        }
+    return {
+        "risk_score": risk_score,
+        "status": status,
+        "flags": flags,
+        "feature_contributions": dict(contributions),
+    }
 
+
+def predict_risk_batch(metrics_list):
+    """
+    predict_risk for many institutions. Cache misses are scored (with
+    feature attribution) in one traversal; each result's
+    feature_contributions maps feature name → share of the isolation
+    (sums to 1, largest first). Invalid items yield {"error": ...}.
+    """
+    scorer = _load_scorer()
+    if scorer is None:
+        return [{"error": "Risk model not trained. Run train_model() first."} for _ in metrics_list]
+
+    results = [None] * len(metrics_list)
+    parsed = {}
+    for i, metrics_json in enumerate(metrics_list):
+        try:
+            parsed[i] = _parse_metrics(metrics_json)
+        except Exception as e:
+            results[i] = {"error": str(e)}
+
+    indices = list(parsed)
+    try:
+        # Quantizing makes the model output a pure function of the cache key.
+        rows = np.round(np.array([parsed[i] for i in indices], dtype=np.float64), PREDICTION_CACHE_DECIMALS)
+        keys = [tuple(r) for r in rows.tolist()]
+
+        outputs = {}
+        missing = []
+        for key in keys:
+            if key in outputs:
+                continue
+            cached = _prediction_cache.get(scorer.version, key)
+            if cached is None:
+                missing.append(key)
+                outputs[key] = None
+            else:
+                outputs[key] = cached
+
+        if missing:
+            decision, labels, contributions = scorer.score(np.array(missing, dtype=np.float64), explain=True)
+            for k, key in enumerate(missing):
+                ranked = sorted(
+                    zip(scorer.feature_names, np.round(contributions[k], 4).tolist()),
+                    key=lambda item: item[1],
+                    reverse=True,
+                )
+                value = (float(decision[k]), int(labels[k]), tuple(ranked))
+                outputs[key] = value
+                _prediction_cache.put(scorer.version, key, value)
+
+        for i, key in zip(indices, keys):
+            anomaly_score, prediction, contributions = outputs[key]
+            results[i] = _build_result(parsed[i], anomaly_score, prediction, contributions)
     except Exception as e:
-        return {"error": str(e)}
+        for i in indices:
+            if results[i] is None:
+                results[i] = {"error": str(e)}
+
+    return results
+
+
+def predict_risk(metrics_json: dict):
+    """
+    Predicts institutional risk.
+
+    Input (example):
+    {
+        "Total_Students": 1200,
+        "Total_Faculty": 40,
+        "Placement_Rate": 55,
+        "Fund_Utilization": 78,
+        "Infrastructure_Area": 3500,
+        "Avg_Doc_DSS": 62,
+        "Missing_Doc_Count": 2
+    }
+    """
+    return predict_risk_batch([metrics_json])[0]
+
+
+# -------------------------------
+# CHUNKED SCORING / RANK LIST
+# -------------------------------
+
+ID_COLUMNS = ["College_ID", "College Name"]
+SCORE_COLUMNS = ["Avg_Doc_DSS", "Risk_Score", "Status", "Top_Risk_Driver", "Top_Risk_Share", "Rank_Score"]
+
+
+def score_csv(csv_path="college_data.csv", output_path="college_risk_scores.csv", chunksize=CSV_CHUNK_ROWS):
+    """
+    Scores every row of a college dataset (CSV / Parquet / Arrow) and
+    appends the results to the `output_path` CSV one chunk at a time
+    (unsorted). Returns the row count.
+    Rank_Score follows the backend rank list: (Avg_Doc_DSS + Risk_Score) / 2.
+    """
+    scorer = _load_scorer()
+    if scorer is None:
+        raise FileNotFoundError("Risk model not trained. Run train_model() first.")
+
+    header = columnar_store.read_header(csv_path)
+    id_columns = [c for c in ID_COLUMNS if c in header]
+    dss_idx = FEATURES.index("Avg_Doc_DSS")
+    names = np.array(scorer.feature_names)
+
+    total = 0
+    with open(output_path, "w", encoding="utf-8", newline="") as out:
+        for features, ids in iter_feature_chunks(csv_path, chunksize, extra_columns=id_columns):
+            decision, labels, contributions = scorer.score(features.to_numpy(dtype=np.float64), explain=True)
+            # Same mapping as predict_risk, vectorized.
+            risk = np.round(100 * (1 - np.clip((decision + 0.25) / 0.5, 0, 1)), 2)
+            dss = np.round(features.to_numpy()[:, dss_idx].astype(np.float64), 2)
+            frame = ids if ids is not None else pd.DataFrame(index=features.index)
+            frame = frame.assign(
+                Avg_Doc_DSS=dss,
+                Risk_Score=risk,
+                Status=np.where((labels == -1) | (risk > 70), "High Risk", "Normal"),
+                Top_Risk_Driver=names[contributions.argmax(axis=1)],
+                Top_Risk_Share=np.round(contributions.max(axis=1), 4),
+                Rank_Score=np.round((dss + risk) / 2, 2),
+            )
+            frame.to_csv(out, header=total == 0, index=False)
+            total += len(frame)
+    return total
+
+
+def build_rank_list(
+    scores_path="college_risk_scores.csv",
+    output_path="college_rank_list.csv",
+    chunksize=CSV_CHUNK_ROWS,
+    columnar_path=None,
+):
+    """
+    Sorts score_csv output by Rank_Score (descending) into the rank list
+    the backend serves, with an external merge sort: each chunk is sorted
+    into a temporary run, then the runs are merged line by line. Returns
+    the row count.
+
+    columnar_path: also convert the CSV to this .arrow / .parquet file,
+    which the backend memory-maps in preference to the CSV.
+    """
+    with tempfile.TemporaryDirectory(prefix="rank-runs-") as tmp:
+        runs = []
+        columns = None
+        with pd.read_csv(scores_path, chunksize=chunksize, dtype=str, keep_default_na=False) as reader:
+            for chunk in reader:
+                columns = list(chunk.columns)
+                order = np.argsort(-chunk["Rank_Score"].astype(np.float64).to_numpy(), kind="stable")
+                run_path = os.path.join(tmp, f"run_{len(runs)}.csv")
+                chunk.iloc[order].to_csv(run_path, header=False, index=False)
+                runs.append(run_path)
+        if columns is None:
+            return 0
+
+        key_idx = columns.index("Rank_Score")
+        files = [open(path, encoding="utf-8", newline="") for path in runs]
+        try:
+            merged = heapq.merge(*(csv.reader(f) for f in files), key=lambda row: -float(row[key_idx]))
+            total = 0
+            with open(output_path, "w", encoding="utf-8", newline="") as out:
+                writer = csv.writer(out)
+                writer.writerow(["Rank"] + columns)
+                for total, row in enumerate(merged, start=1):
+                    writer.writerow([total] + row)
+        finally:
+            for f in files:
+                f.close()
+
+    if columnar_path:
+        columnar_store.convert(output_path, columnar_path, types=columnar_store.RANK_LIST_TYPES)
+    return total
 
 
 # -------------------------------
@@ -183,7 +852,45 @@ def predict_risk(metrics_json: dict):
 # -------------------------------
 
 if __name__ == "__main__":
-    train_model()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train the risk model and run sample predictions.")
+    parser.add_argument("--csv", default="college_data.csv")
+    parser.add_argument("--n-estimators", type=int, default=200)
+    parser.add_argument("--max-samples", default="auto", help='"auto", an int row count, or a float fraction')
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--warm-start", action="store_true", help="Grow the existing forest on new data")
+    parser.add_argument("--extra-estimators", type=int, default=50)
+    parser.add_argument("--chunksize", type=int, default=CSV_CHUNK_ROWS, help="Rows per CSV chunk")
+    parser.add_argument("--sample-rows", type=int, default=TRAIN_SAMPLE_ROWS, help="Reservoir size for the forest")
+    parser.add_argument(
+        "--rank-list",
+        metavar="PATH",
+        help="Also score --csv chunk by chunk and write a rank list; a .arrow/.parquet PATH also gets a .csv export",
+    )
+    args = parser.parse_args()
+
+    max_samples = args.max_samples
+    if max_samples != "auto":
+        max_samples = float(max_samples) if "." in max_samples else int(max_samples)
+
+    train_model(
+        args.csv,
+        n_estimators=args.n_estimators,
+        max_samples=max_samples,
+        n_jobs=args.n_jobs,
+        warm_start=args.warm_start,
+        extra_estimators=args.extra_estimators,
+        chunksize=args.chunksize,
+        sample_rows=args.sample_rows,
+    )
+
+    if args.rank_list:
+        stem = os.path.splitext(args.rank_list)[0]
+        columnar_path = None if columnar_store.storage_format(args.rank_list) == "csv" else args.rank_list
+        n_scored = score_csv(args.csv, stem + "_scores.csv", chunksize=args.chunksize)
+        build_rank_list(stem + "_scores.csv", stem + ".csv", chunksize=args.chunksize, columnar_path=columnar_path)
+        print(f"🏁 Ranked {n_scored} colleges → {args.rank_list}")
 
     print("\n🟢 NORMAL COLLEGE")
     good_college = {
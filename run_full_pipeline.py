@@ -13,13 +13,23 @@ This script assumes:
 - doc_validator/ exists
 - college_aggregator.py exists
 - risk_engine.py exists
+
+Set EDUTRACK_PROFILE_REPORT=<path.json> to profile each validation stage
+and write aggregated percentiles to that file. With EDUTRACK_PROFILE_MEMORY=1
+the report holds per-stage allocations instead of wall times.
 """
 
+import logging
+import os
+
 from doc_validator.ocr_engine import run_ocr
-from doc_validator.predictor import predict_from_ocr
+from doc_validator.predictor import DocumentValidator, predict_from_ocr, write_profile_report
 from college_aggregator import aggregate_college
 from risk_engine import predict_risk
 
+# Library modules no longer configure logging on import; the script does.
+logging.basicConfig(level=logging.INFO)
+
 # ----------------------------------
 # STEP 0: INPUTS (simulate one college)
 # ----------------------------------
@@ -39,6 +49,13 @@ DOCUMENT_FILES = {
     "affiliation_letter": "sample_docs/affiliation_letter.pdf"
 }
 
+PROFILE_REPORT = os.getenv("EDUTRACK_PROFILE_REPORT")
+profiling_validator = (
+    DocumentValidator(profile=True, profile_memory=os.getenv("EDUTRACK_PROFILE_MEMORY") == "1")
+    if PROFILE_REPORT
+    else None
+)
+
 # ----------------------------------
 # STEP 1: OCR + DOCUMENT VALIDATION
 # ----------------------------------
@@ -55,13 +72,20 @@ for doc_type, file_path in DOCUMENT_FILES.items():
     ocr_output["doc_type"] = doc_type
 
     # Document DSS
-    doc_result = predict_from_ocr(ocr_output)
+    if profiling_validator is not None:
+        doc_result = profiling_validator.predict_from_dict(ocr_output)
+    else:
+        doc_result = predict_from_ocr(ocr_output)
 
     document_outputs[doc_type] = doc_result
 
     print(f"  DSS Score: {doc_result['dss_score']}")
     print(f"  Flags   : {doc_result['flags']}\n")
 
+if PROFILE_REPORT:
+    profile_summary = write_profile_report(document_outputs.values(), PROFILE_REPORT)
+    print(f"Validation profile ({profile_summary['documents']} docs) written to {PROFILE_REPORT}")
+
 # ----------------------------------
 # STEP 2: COLLEGE COMPLIANCE AGGREGATION
 # ----------------------------------